@@ -0,0 +1,71 @@
+"""
+bench_async_fetch.py
+
+Compares the request throughput of the synchronous and asyncio GitHub clients against a local stub server.
+
+Usage:
+    python -m benchmarks.bench_async_fetch --repos 200 --latency 0.05 --concurrency 100
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubGitHubServer
+from controllers.async_github_event_analyzer import AsyncGitHubEventsAnalyzer
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+
+def run_sync(base_url, repositories):
+    """
+    Fetches and analyzes every repository one request at a time.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    analyzer = GitHubEventsAnalyzer(base_url=base_url)
+    started = time.perf_counter()
+    for owner, name in repositories:
+        events = analyzer.fetch_events(owner, name)
+        analyzer.calculate_event_statistics(events)
+    elapsed = time.perf_counter() - started
+    analyzer.close()
+    return elapsed
+
+
+def run_async(base_url, repositories, concurrency):
+    """
+    Fetches and analyzes every repository concurrently on one event loop.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    async def run():
+        async with AsyncGitHubEventsAnalyzer(base_url=base_url, max_concurrency=concurrency) as analyzer:
+            started = time.perf_counter()
+            await analyzer.analyze_repositories(repositories)
+            return time.perf_counter() - started
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs asyncio fetch throughput")
+    parser.add_argument("--repos", type=int, default=200, help="Number of repositories to fetch")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub server latency per response in seconds")
+    parser.add_argument("--concurrency", type=int, default=100, help="Maximum requests in flight for asyncio")
+    args = parser.parse_args()
+
+    repositories = [("bench", f"repo{index}") for index in range(args.repos)]
+    with StubGitHubServer(latency=args.latency) as server:
+        sync_elapsed = run_sync(server.base_url, repositories)
+        async_elapsed = run_async(server.base_url, repositories, args.concurrency)
+
+    print(f"sync:  {args.repos / sync_elapsed:10.1f} req/s ({sync_elapsed:.2f}s)")
+    print(f"async: {args.repos / async_elapsed:10.1f} req/s ({async_elapsed:.2f}s)")
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
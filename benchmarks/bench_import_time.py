@@ -0,0 +1,176 @@
+"""
+bench_import_time.py
+
+Measures the cold-start cost of the CLI with `python -X importtime` and checks it against a target.
+
+Each run starts a fresh interpreter, so the numbers include every module the entry point loads. The benchmark reports
+the median cumulative import time of `main`, the median wall-clock time of `python main.py --help`, of an invocation
+rejected by argument validation and of an offline GH Archive ingestion of a tiny file, and the slowest modules. It
+exits with status 1 if the import time exceeds the target or a module that should only load on a network fetch or a
+NumPy or SQLite backed command (`requests`, `numpy`, `sqlite3` and their dependencies) is imported at startup or on
+either of the two paths.
+
+Usage:
+    python -m benchmarks.bench_import_time --runs 10 --target-ms 50
+
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_server import synthetic_event
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGET_MS = 50.0
+DEFERRED_MODULES = ("requests", "urllib3", "charset_normalizer", "numpy", "sqlite3", "http.client")
+
+
+def parse_importtime(output):
+    """
+    Parses the report `-X importtime` writes to standard error.
+
+    Args:
+        output (str): The standard error of the interpreter.
+
+    Returns:
+        dict: The (self, cumulative) import times in microseconds keyed by module name.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        if self_time.isdigit():
+            modules[name] = (int(self_time), int(cumulative))
+    return modules
+
+
+def measure_import(module="main", runs=5):
+    """
+    Imports a module in fresh interpreters and returns its import times.
+
+    Args:
+        module (str, optional): The module to import. Defaults to "main".
+        runs (int, optional): The number of interpreters started. Defaults to 5.
+
+    Returns:
+        tuple: The cumulative import time of the module in milliseconds per run, and the module times of the last run.
+    """
+    timings, modules = [], {}
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                                   capture_output=True, text=True, check=True)
+        modules = parse_importtime(completed.stderr)
+        timings.append(modules[module][1] / 1000)
+    return timings, modules
+
+
+def measure_command(arguments, runs=5):
+    """
+    Runs an interpreter in fresh processes and returns its wall-clock times.
+
+    Args:
+        arguments (list): The interpreter arguments, e.g. ["main.py", "--help"] or ["-c", "pass"] for the floor of
+            any invocation.
+        runs (int, optional): The number of runs. Defaults to 5.
+
+    Returns:
+        list: The elapsed time of every run in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, capture_output=True, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def measure_path(arguments, runs=5):
+    """
+    Runs a CLI invocation under `-X importtime` in fresh processes and returns its wall-clock times and the modules
+    it loaded.
+
+    Args:
+        arguments (list): The interpreter arguments, e.g. ["main.py", "--source", "gharchive"].
+        runs (int, optional): The number of runs. Defaults to 5.
+
+    Returns:
+        tuple: The elapsed time of every run in milliseconds, including the small `-X importtime` overhead, and the
+            module times of the last run.
+    """
+    timings, modules = [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=ROOT, capture_output=True,
+                                   text=True, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+        modules = parse_importtime(completed.stderr)
+    return timings, modules
+
+
+def startup_paths(directory):
+    """
+    Returns the CLI invocations whose startup is measured besides `--help`, writing the files they read.
+
+    Args:
+        directory (str): A directory for the GH Archive file of the offline path.
+
+    Returns:
+        dict: The interpreter arguments keyed by path name: a command rejected by argument validation, and an offline
+            ingestion of a GH Archive file of ten events on one worker.
+    """
+    path = os.path.join(directory, "2023-06-14-15.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as archive_file:
+        archive_file.writelines(json.dumps(synthetic_event("octo/repo", index)) + "\n" for index in range(10))
+    return {
+        "validation error": ["main.py", "--source", "gharchive"],
+        "offline gharchive": ["main.py", "--source", "gharchive", "--files", path, "--workers", "1"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold-start import time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters per measurement")
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="Maximum median import time of main in milliseconds")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    import_times, modules = measure_import("main", args.runs)
+    median_import = statistics.median(import_times)
+    print(f"import main:      {median_import:8.1f} ms (median of {args.runs}, target {args.target_ms:.0f} ms)")
+    help_times = measure_command(["main.py", "--help"], args.runs)
+    baseline_times = measure_command(["-c", "pass"], args.runs)
+    print(f"main.py --help:   {statistics.median(help_times):8.1f} ms wall clock")
+    loaded_by_path = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, arguments in startup_paths(directory).items():
+            path_times, path_modules = measure_path(arguments, args.runs)
+            loaded_by_path[name] = [module for module in DEFERRED_MODULES if module in path_modules]
+            print(f"{name + ':':<18}{statistics.median(path_times):8.1f} ms wall clock")
+    print(f"bare interpreter: {statistics.median(baseline_times):8.1f} ms wall clock")
+    print("Slowest modules (self time):")
+    for name, (self_time, cumulative) in sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {name:<40} {self_time / 1000:7.2f} ms self {cumulative / 1000:8.2f} ms cumulative")
+
+    loaded = [name for name in DEFERRED_MODULES if name in modules]
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(loaded)}")
+    for name, path_loaded in loaded_by_path.items():
+        if path_loaded:
+            print(f"FAIL: imported on the {name} path: {', '.join(path_loaded)}")
+    if median_import > args.target_ms:
+        print(f"FAIL: import main takes {median_import:.1f} ms, over the {args.target_ms:.0f} ms target")
+    failed = loaded or any(loaded_by_path.values()) or median_import > args.target_ms
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
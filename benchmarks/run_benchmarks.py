@@ -0,0 +1,322 @@
+"""
+run_benchmarks.py
+
+Runs the benchmark suite against a local stub server and synthetic events, and writes machine-readable results that
+can be compared across commits.
+
+The HTTP benchmarks time `GitHubAPI.fetch` and `GitHubEventsAnalyzer.fetch_events` against `StubGitHubServer`: plain
+pages, pages decoded into projected events, conditional requests answered with `304 Not Modified`, and pages with
+injected server errors that are retried.
+The decode benchmarks time the CPU cost and measure the peak memory of decoding an events page in full with
+`json.loads`, as without a decoder, and with `ProjectingEventDecoder` in its default and streaming modes.
+The analysis benchmarks time every `GitHubEventsAnalyzer` analysis method at each requested scale. Up to
+`MAX_LIST_EVENTS` events the methods get a list, as the CLI passes them; beyond that events are streamed from a
+generator so that 10M-event runs fit in memory.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --scales 1000 100000 10000000 --output results.json
+    python -m benchmarks.run_benchmarks --compare baseline.json results.json --threshold 0.1
+
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import cycle, islice
+
+from benchmarks.stub_server import StubGitHubServer, synthetic_event
+from controllers.base.github_api import GitHubAPI
+from controllers.base.response_cache import ResponseCache
+from controllers.base.transport import Transport
+from controllers.event_decoder import ProjectingEventDecoder
+from controllers.event_pipeline import project_stage
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+DEFAULT_SCALES = (1000, 100000)
+MAX_LIST_EVENTS = 1000000
+TEMPLATE_EVENTS = 10000
+PER_PAGE = 100
+
+
+def best_time(function, repeat, clock=time.perf_counter):
+    """
+    Runs a function several times and returns the fastest duration.
+
+    Args:
+        function (callable): The function to time.
+        repeat (int): The number of runs.
+        clock (callable, optional): The clock to time with, e.g. `time.process_time` for CPU time. Defaults to
+            wall-clock time.
+
+    Returns:
+        float: The shortest duration in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = clock()
+        function()
+        timings.append(clock() - started)
+    return min(timings)
+
+
+def result(count, seconds, unit):
+    """
+    Builds one benchmark result entry.
+
+    Args:
+        count (int): The number of operations timed.
+        seconds (float): The duration of the operations.
+        unit (str): What an operation is, e.g. "requests" or "events".
+
+    Returns:
+        dict: The entry.
+    """
+    return {"count": count, "seconds": seconds, "unit": unit, "per_second": count / seconds if seconds else None}
+
+
+def http_benchmarks(requests, latency=0.0, repeat=3):
+    """
+    Times `GitHubAPI.fetch` and `fetch_events` against the stub server.
+
+    Args:
+        requests (int): The number of requests per run.
+        latency (float, optional): The stub server latency per response in seconds. Defaults to 0.
+        repeat (int, optional): The number of runs; the fastest is kept. Defaults to 3.
+
+    Returns:
+        dict: The results keyed by benchmark name.
+    """
+    results = {}
+    endpoint = f"repos/bench/repo/events?page=1&per_page={PER_PAGE}"
+
+    with StubGitHubServer(events_per_repo=PER_PAGE, latency=latency) as server:
+        api = GitHubAPI(base_url=server.base_url)
+        seconds = best_time(lambda: [api.fetch(endpoint) for _ in range(requests)], repeat)
+        results["fetch"] = result(requests, seconds, "requests")
+        api.close()
+
+        analyzer = GitHubEventsAnalyzer(base_url=server.base_url)
+        seconds = best_time(lambda: [analyzer.fetch_events("bench", "repo", 1, PER_PAGE) for _ in range(requests)],
+                            repeat)
+        results["fetch_events"] = result(requests, seconds, "requests")
+        analyzer.close()
+
+        analyzer = GitHubEventsAnalyzer(base_url=server.base_url)
+        analyzer.event_decoder = ProjectingEventDecoder()
+        seconds = best_time(lambda: [analyzer.fetch_events("bench", "repo", 1, PER_PAGE) for _ in range(requests)],
+                            repeat)
+        results["fetch_events_projected"] = result(requests, seconds, "requests")
+        analyzer.close()
+
+        analyzer = GitHubEventsAnalyzer(base_url=server.base_url, cache=ResponseCache())
+        analyzer.fetch_events("bench", "repo", 1, PER_PAGE)
+        seconds = best_time(lambda: [analyzer.fetch_events("bench", "repo", 1, PER_PAGE) for _ in range(requests)],
+                            repeat)
+        results["fetch_events_not_modified"] = result(requests, seconds, "requests")
+        analyzer.close()
+
+    with StubGitHubServer(events_per_repo=PER_PAGE, latency=latency, error_rate=0.1) as server:
+        transport = Transport(backoff_factor=0, max_retries=10)
+        analyzer = GitHubEventsAnalyzer(base_url=server.base_url, transport=transport)
+        seconds = best_time(lambda: [analyzer.fetch_events("bench", "repo", 1, PER_PAGE) for _ in range(requests)],
+                            repeat)
+        results["fetch_events_with_errors"] = result(requests, seconds, "requests")
+        analyzer.close()
+
+    return results
+
+
+def peak_memory(function):
+    """
+    Runs a function once under `tracemalloc` and returns the peak memory it allocated.
+
+    Args:
+        function (callable): The function to measure.
+
+    Returns:
+        int: The peak traced memory in bytes.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def decode_benchmarks(pages=200, repeat=3):
+    """
+    Times the decoding of a synthetic events page on CPU, in full and with each `ProjectingEventDecoder` mode, and
+    measures the peak memory of decoding one page in a separate, untimed run.
+
+    Args:
+        pages (int, optional): The number of pages decoded per run. Defaults to 200.
+        repeat (int, optional): The number of runs; the fastest is kept. Defaults to 3.
+
+    Returns:
+        dict: The results keyed by benchmark name: "decode_page" for `json.loads`, "decode_page_projected" for the
+            default decoder the CLI uses, and "decode_page_streaming" for the streaming mode.
+    """
+    content = json.dumps([synthetic_event("bench/repo", index) for index in range(PER_PAGE)]).encode()
+    decoders = {
+        "decode_page": json.loads,
+        "decode_page_projected": ProjectingEventDecoder().decode,
+        "decode_page_streaming": ProjectingEventDecoder(streaming=True).decode,
+    }
+    results = {}
+    for name, decode in decoders.items():
+        seconds = best_time(lambda: [decode(content) for _ in range(pages)], repeat, time.process_time)
+        results[name] = result(pages, seconds, "pages")
+        results[name]["clock"] = "cpu"
+        results[name]["peak_bytes"] = peak_memory(lambda: decode(content))
+    return results
+
+
+def analysis_benchmarks(scales, repeat=3):
+    """
+    Times every `GitHubEventsAnalyzer` analysis method on projected synthetic events.
+
+    Args:
+        scales (iterable): The event counts to benchmark.
+        repeat (int, optional): The number of runs; the fastest is kept. Defaults to 3.
+
+    Returns:
+        dict: The results keyed by "<method>@<scale>".
+    """
+    templates = list(project_stage(synthetic_event("bench/repo", index) for index in range(TEMPLATE_EVENTS)))
+    analyzer = GitHubEventsAnalyzer()
+    results = {}
+
+    for scale in scales:
+        if scale <= MAX_LIST_EVENTS:
+            event_list = list(islice(cycle(templates), scale))
+
+            def events():
+                return event_list
+        else:
+            event_list = None
+
+            def events():
+                return islice(cycle(templates), scale)
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            methods = {
+                "display_events": lambda: analyzer.display_events(events()),
+                "filter_events": lambda: analyzer.filter_events(events(), "PushEvent"),
+                "calculate_event_statistics": lambda: analyzer.calculate_event_statistics(events()),
+                "identify_most_active_user": lambda: analyzer.identify_most_active_user(events()),
+                "calculate_event_timeline": lambda: analyzer.calculate_event_timeline(events(), "1h"),
+            }
+            for name, method in methods.items():
+                entry = result(scale, best_time(method, repeat), "events")
+                entry["input"] = "list" if event_list is not None else "stream"
+                results[f"{name}@{scale}"] = entry
+        del event_list
+
+    return results
+
+
+def environment():
+    """
+    Describes the machine and revision the benchmarks ran on.
+
+    Returns:
+        dict: The Python version, platform, CPU count, git commit and time.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def run(scales=DEFAULT_SCALES, requests=200, latency=0.0, repeat=3):
+    """
+    Runs the whole suite.
+
+    Args:
+        scales (iterable, optional): The event counts of the analysis benchmarks. Defaults to 1k and 100k.
+        requests (int, optional): The number of requests per HTTP benchmark run. Defaults to 200.
+        latency (float, optional): The stub server latency per response in seconds. Defaults to 0.
+        repeat (int, optional): The number of runs per benchmark; the fastest is kept. Defaults to 3.
+
+    Returns:
+        dict: The "environment" and the "benchmarks" results keyed by name.
+    """
+    benchmarks = http_benchmarks(requests, latency, repeat)
+    benchmarks.update(decode_benchmarks(repeat=repeat))
+    benchmarks.update(analysis_benchmarks(scales, repeat))
+    return {"environment": environment(), "benchmarks": benchmarks}
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares two result sets benchmark by benchmark, on the time per operation so that runs with different request
+    counts remain comparable.
+
+    Args:
+        baseline (dict): The reference results, as written by `run`.
+        current (dict): The results to check.
+        threshold (float, optional): The relative slowdown reported as a regression. Defaults to 0.1 (10%).
+
+    Returns:
+        list: (name, baseline seconds per operation, current seconds per operation, relative change, regressed)
+            tuples for the benchmarks present in both result sets.
+    """
+    rows = []
+    for name, entry in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None or not reference["seconds"]:
+            continue
+        before = reference["seconds"] / reference["count"]
+        after = entry["seconds"] / entry["count"]
+        change = after / before - 1
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub events analyzer benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Event counts for the analysis benchmarks, e.g. 1000 100000 10000000")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per HTTP benchmark run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server latency per response in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the fastest is kept")
+    parser.add_argument("--output", default=None, help="File to write the JSON results to (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), default=None,
+                        help="Compare two result files instead of running the suite")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as baseline_file, open(args.compare[1]) as current_file:
+            rows = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+        for name, before, after, change, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:45} {before * 1e6:12.3f}us {after * 1e6:12.3f}us {change:+8.1%} {flag}")
+        sys.exit(1 if any(row[4] for row in rows) else 0)
+
+    results = run(args.scales, args.requests, args.latency, args.repeat)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
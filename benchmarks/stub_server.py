@@ -0,0 +1,292 @@
+"""
+stub_server.py
+
+A local stand-in for the GitHub events API used by the benchmarks.
+
+This module contains the `StubGitHubServer` class, a threaded HTTP/1.1 server that serves deterministic synthetic
+event pages for `repos/<owner>/<repo>/events` and `events`. Pages carry `Link` pagination headers and an `ETag`, and
+a request repeating the ETag in `If-None-Match` gets `304 Not Modified`. Latency, an `X-Poll-Interval` header,
+randomly injected server errors and gzip compression of bodies can be configured. With a rate limit configured it also
+emulates GitHub's primary rate limit per `Authorization` header, sending the `X-RateLimit-*` headers and rejecting
+requests over the limit with `403 Forbidden`.
+
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EVENT_TYPES = ["PushEvent", "PullRequestEvent", "IssuesEvent", "IssueCommentEvent", "WatchEvent", "CreateEvent"]
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def synthetic_event(repo_name, index, actors=50):
+    """
+    Builds a deterministic synthetic event in the GitHub events API schema.
+
+    Args:
+        repo_name (str): The "owner/name" of the repository.
+        index (int): The position of the event, 0 being the most recent.
+        actors (int): The number of distinct actors to cycle through.
+
+    Returns:
+        dict: The synthetic event.
+    """
+    login = f"user{index % actors}"
+    seconds = 86400 * 7 - index * 37
+    return {
+        "id": str(10 ** 10 - index),
+        "type": EVENT_TYPES[index % len(EVENT_TYPES)],
+        "actor": {
+            "id": index % actors,
+            "login": login,
+            "display_login": login,
+            "url": f"https://api.github.com/users/{login}",
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{index % actors}?",
+        },
+        "repo": {"id": 1, "name": repo_name, "url": f"https://api.github.com/repos/{repo_name}"},
+        "payload": {"ref": "refs/heads/main", "size": 1, "commits": [{"message": "x" * 200}]},
+        "public": True,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1686700000 + seconds)),
+    }
+
+
+class StubGitHubServer:
+    """
+    A threaded local server emulating the GitHub events API.
+
+    Attributes:
+        events_per_repo (int): The number of events available for every repository.
+        latency (float): Artificial delay in seconds added to every response.
+        rate_limit (int): The requests allowed per token and window, or None for no rate limit.
+        rate_limit_window (float): The length of a rate limit window in seconds.
+        error_rate (float): The fraction of requests answered with `error_status`.
+        error_status (int): The status code of injected errors.
+        poll_interval (int): The `X-Poll-Interval` sent with every page, or None.
+        compress (bool): Whether bodies are gzip-compressed for requests accepting gzip.
+        request_count (int): The number of requests received.
+        rate_limited_count (int): The number of requests rejected by the rate limit.
+        error_count (int): The number of injected errors.
+        not_modified_count (int): The number of `304 Not Modified` responses.
+        base_url (str): The base URL to pass to the API clients once the server is started.
+
+    Methods:
+        start():
+            Starts serving on a background thread.
+
+        stop():
+            Stops the server and joins the thread.
+
+        render_page(repo_name, page, per_page):
+            Renders (and memoizes) one page of synthetic events.
+
+        inject_error():
+            Draws whether the current request is answered with an injected error.
+
+        consume_rate_limit(token):
+            Counts a request against the rate limit window of a token.
+
+    Example Usage:
+        with StubGitHubServer(latency=0.01) as server:
+            events = GitHubEventsAnalyzer(base_url=server.base_url).fetch_events("octo", "repo")
+
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, events_per_repo=300, latency=0.0, rate_limit=None,
+                 rate_limit_window=3600.0, error_rate=0.0, error_status=502, poll_interval=None, seed=0,
+                 compress=False):
+        """
+        Initializes a new instance of the StubGitHubServer class.
+
+        Args:
+            host (str, optional): The interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind; 0 picks a free port. Defaults to 0.
+            events_per_repo (int, optional): The number of events per repository. Defaults to 300.
+            latency (float, optional): Artificial delay in seconds per response. Defaults to 0.
+            rate_limit (int, optional): The requests allowed per token and window. Defaults to no rate limit.
+            rate_limit_window (float, optional): The rate limit window in seconds. Defaults to one hour.
+            error_rate (float, optional): The fraction of requests answered with an error. Defaults to 0.
+            error_status (int, optional): The status code of injected errors. Defaults to 502.
+            poll_interval (int, optional): The `X-Poll-Interval` to send. Defaults to none.
+            seed (int, optional): The seed of the error injection, so runs are reproducible. Defaults to 0.
+            compress (bool, optional): Whether to gzip bodies for requests accepting gzip. Defaults to False.
+        """
+        self.events_per_repo = events_per_repo
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.poll_interval = poll_interval
+        self.compress = compress
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.error_count = 0
+        self.not_modified_count = 0
+        self._random = random.Random(seed)
+        self._rate_windows = {}
+        self._lock = threading.Lock()
+        self._page_cache = {}
+        self._server = _StubHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts serving on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the server and joins the thread.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def render_page(self, repo_name, page, per_page):
+        """
+        Renders (and memoizes) one page of synthetic events.
+
+        Args:
+            repo_name (str): The "owner/name" of the repository.
+            page (int): The one-based page number.
+            per_page (int): The page size.
+
+        Returns:
+            tuple: The encoded JSON body, the number of the last page and the ETag of the body.
+        """
+        key = (repo_name, page, per_page)
+        if key not in self._page_cache:
+            start = (page - 1) * per_page
+            stop = min(start + per_page, self.events_per_repo)
+            events = [synthetic_event(repo_name, index) for index in range(start, stop)]
+            last_page = max(1, -(-self.events_per_repo // per_page))
+            body = json.dumps(events).encode()
+            self._page_cache[key] = (body, last_page, f'"{hashlib.sha1(body).hexdigest()}"')
+        return self._page_cache[key]
+
+    def inject_error(self):
+        """
+        Draws whether the current request is answered with an injected error.
+
+        Returns:
+            bool: True if the request should fail.
+        """
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return failed
+
+    def consume_rate_limit(self, token):
+        """
+        Counts a request against the rate limit window of a token.
+
+        Args:
+            token (str): The `Authorization` header of the request, or None.
+
+        Returns:
+            tuple: The `X-RateLimit-*` headers to send and whether the request is over the limit.
+        """
+        with self._lock:
+            now = time.time()
+            used, reset = self._rate_windows.get(token, (0, 0))
+            if now >= reset:
+                used, reset = 0, math.ceil(now + self.rate_limit_window)
+            limited = used >= self.rate_limit
+            if limited:
+                self.rate_limited_count += 1
+            else:
+                used += 1
+            self._rate_windows[token] = (used, reset)
+        headers = {"X-RateLimit-Limit": self.rate_limit, "X-RateLimit-Remaining": self.rate_limit - used,
+                   "X-RateLimit-Reset": reset, "X-RateLimit-Used": used, "X-RateLimit-Resource": "core"}
+        return headers, limited
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                rate_headers = {}
+                if server.rate_limit is not None:
+                    rate_headers, limited = server.consume_rate_limit(self.headers.get("Authorization"))
+                    if limited:
+                        self.send_json(403, b'{"message": "API rate limit exceeded"}', rate_headers)
+                        return
+
+                if server.inject_error():
+                    self.send_json(server.error_status, b'{"message": "Injected error"}', rate_headers)
+                    return
+
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                page = int(query.get("page", ["1"])[0])
+                per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+                parts = parsed.path.strip("/").split("/")
+                repo_name = "/".join(parts[1:3]) if parts[0] == "repos" and len(parts) >= 4 else "public/events"
+
+                body, last_page, etag = server.render_page(repo_name, page, per_page)
+                headers = dict(rate_headers)
+                headers["ETag"] = etag
+                headers["Link"] = f'<{server.base_url}{parsed.path}?page={last_page}&per_page={per_page}>; rel="last"'
+                if server.poll_interval is not None:
+                    headers["X-Poll-Interval"] = server.poll_interval
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified_count += 1
+                    self.send_json(304, b"", headers)
+                else:
+                    self.send_json(200, body, headers)
+
+            def send_json(self, status_code, body, headers):
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                if server.compress and body and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
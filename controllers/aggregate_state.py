@@ -0,0 +1,345 @@
+"""
+aggregate_state.py
+
+A Python module providing mergeable, checkpointable snapshots of aggregated event statistics.
+
+Statistics computed by an `EventAggregator` used to live only as long as the process, so a long backfill restarted
+from nothing after a crash. This module contains the `AggregateState` class, which pairs the aggregator with a resume
+cursor recording how far each source (e.g. each GH Archive file, by line offset) has been processed, and saves both in
+a compact binary format: per-field keys and counts are stored as packed arrays rather than one object per value, and
+the whole snapshot is zlib-compressed. The `Checkpointer` class saves a state periodically and atomically, so a run
+that is interrupted resumes from its last checkpoint and a run over a longer range only processes the new data.
+
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from itertools import accumulate
+
+from controllers.event_aggregator import EventAggregator, SketchedFieldCounts
+from utils.custom_exception import InvalidInputException
+
+MAGIC = b"GHAS"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+BLOB_SIZE = struct.Struct("<Q")
+COUNTED_FIELDS = ("event_types", "actors", "repos")
+SKETCHED_FIELDS = ("actors", "repos")
+
+
+def _pack_array(values):
+    if sys.byteorder == "big":  # pragma: no cover - snapshots are always little-endian
+        values = array(values.typecode, values)
+        values.byteswap()
+    return _pack_blob(values.tobytes())
+
+
+def _pack_blob(data):
+    return BLOB_SIZE.pack(len(data)) + data
+
+
+def _pack_counts(counts):
+    keys = [str(key).encode() for key in counts]
+    return (_pack_array(array("I", map(len, keys))) + _pack_blob(b"".join(keys))
+            + _pack_array(array("q", counts.values())))
+
+
+class _SnapshotReader:
+    """
+    Reads the sections of a decompressed snapshot in order.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def blob(self):
+        (size,) = BLOB_SIZE.unpack_from(self.data, self.offset)
+        start = self.offset + BLOB_SIZE.size
+        self.offset = start + size
+        if self.offset > len(self.data):
+            raise ValueError("truncated snapshot")
+        return self.data[start:self.offset]
+
+    def array(self, typecode):
+        values = array(typecode)
+        values.frombytes(self.blob())
+        if sys.byteorder == "big":  # pragma: no cover - snapshots are always little-endian
+            values.byteswap()
+        return values
+
+    def counts(self):
+        lengths = self.array("I")
+        keys = self.blob()
+        values = self.array("q")
+        ends = list(accumulate(lengths))
+        return {keys[end - length:end].decode(): count for end, length, count in zip(ends, lengths, values)}
+
+
+class AggregateState:
+    """
+    Aggregated event statistics together with a resume cursor, which can be merged, saved and loaded.
+
+    The state holds the `EventAggregator` built by `EventAggregator.default`: type counts, actor counts, repository
+    counts and time bounds, exact or sketched with `approximate`, in which case the sketch settings are saved too. The
+    cursor maps each source that contributed events to its position, e.g. a GH Archive file to the number of lines
+    processed and whether it is complete, so a resumed run skips what the state already covers. The scope records the
+    filters the events were selected with; states are only merged or resumed under the same scope.
+
+    Attributes:
+        aggregator (EventAggregator): The aggregated statistics.
+        cursor (dict): The position reached in every source, as JSON-serializable values keyed by source.
+        scope (dict): The filters the events were selected with, e.g. {"repo": ..., "event_type": ...}.
+
+    Methods:
+        merge(other):
+            Folds a state built over other sources into this one.
+
+        to_bytes() / from_bytes(data):
+            Encodes the state in the binary snapshot format, and decodes it.
+
+        save(path) / load(path):
+            Writes the state to a file atomically, and reads it back.
+
+    Example Usage:
+        state = AggregateState.load("backfill.state") if os.path.exists("backfill.state") else AggregateState()
+        state.aggregator.add(new_events)
+        state.cursor["2023-06-14-15.json.gz"] = {"offset": 180412, "done": True}
+        state.save("backfill.state")
+
+    """
+
+    def __init__(self, aggregator=None, cursor=None, scope=None):
+        """
+        Initializes a new instance of the AggregateState class.
+
+        Args:
+            aggregator (EventAggregator, optional): The statistics, built by `EventAggregator.default`. Defaults to an
+                empty exact aggregator.
+            cursor (dict, optional): The position reached in every source. Defaults to no sources.
+            scope (dict, optional): The filters the events were selected with. Defaults to no filters.
+        """
+        self.aggregator = aggregator if aggregator is not None else EventAggregator.default()
+        self.cursor = cursor if cursor is not None else {}
+        self.scope = scope if scope is not None else {}
+
+    @property
+    def top_k(self):
+        return self.aggregator.metric("top_actors").k
+
+    @property
+    def approximate(self):
+        return isinstance(self.aggregator.metric("actors"), SketchedFieldCounts)
+
+    @property
+    def sketch_settings(self):
+        """
+        The (sketch_error, sketch_confidence, distinct_error) the sketches were configured with, or None if the
+        statistics are exact.
+        """
+        if not self.approximate:
+            return None
+        actors = self.aggregator.metric("actors")
+        return actors.error, actors.confidence, actors.distinct_error
+
+    def merge(self, other):
+        """
+        Folds a state built over other sources into this one, e.g. the partial state of another worker or shard.
+
+        Args:
+            other (AggregateState): The state to merge.
+
+        Returns:
+            AggregateState: The state, for chaining.
+
+        Raises:
+            ValueError: If the scopes differ or both states cover the same source, which would count it twice.
+        """
+        if other.scope != self.scope:
+            raise ValueError(f"Cannot merge states of different scopes: {self.scope} and {other.scope}")
+        overlap = self.cursor.keys() & other.cursor.keys()
+        if overlap:
+            raise ValueError(f"Cannot merge states that both cover {', '.join(sorted(overlap))}")
+        self.aggregator.merge(other.aggregator)
+        self.cursor.update(other.cursor)
+        return self
+
+    def to_bytes(self):
+        """
+        Encodes the state in the binary snapshot format.
+
+        Returns:
+            bytes: The snapshot.
+        """
+        aggregator = self.aggregator
+        first, last = aggregator.metric("time_bounds").result()
+        metadata = {"cursor": self.cursor, "scope": self.scope, "time_bounds": [first, last]}
+        if self.approximate:
+            metadata["sketch_settings"] = list(self.sketch_settings)
+        sections = [_pack_blob(json.dumps(metadata, separators=(",", ":")).encode())]
+        sections.extend(_pack_counts(aggregator.metric(name).counts) for name in COUNTED_FIELDS)
+        if self.approximate:
+            for name in SKETCHED_FIELDS:
+                metric = aggregator.metric(name)
+                sections.append(_pack_array(array("q", [metric.sketch.total])))
+                sections.append(_pack_array(metric.sketch.counters))
+                sections.append(_pack_blob(bytes(metric.distinct.registers)))
+        header = HEADER.pack(MAGIC, VERSION, int(self.approximate), self.top_k)
+        return header + zlib.compress(b"".join(sections), 6)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Decodes a snapshot written by `to_bytes`.
+
+        Args:
+            data (bytes): The snapshot.
+
+        Returns:
+            AggregateState: The state.
+
+        Raises:
+            InvalidInputException: If the data is not a snapshot of a supported version, or is corrupt.
+        """
+        if len(data) < HEADER.size:
+            raise InvalidInputException("Not an aggregate state snapshot: the data is too short!")
+        magic, version, approximate, top_k = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise InvalidInputException("Not an aggregate state snapshot!")
+        if version != VERSION:
+            raise InvalidInputException(f"Unsupported aggregate state snapshot version {version}!")
+
+        try:
+            reader = _SnapshotReader(zlib.decompress(data[HEADER.size:]))
+            metadata = json.loads(bytes(reader.blob()))
+            aggregator = EventAggregator.default(top_k, bool(approximate), *metadata.get("sketch_settings", ()))
+            counts = {name: reader.counts() for name in COUNTED_FIELDS}
+            if approximate:
+                for name in SKETCHED_FIELDS:
+                    metric = aggregator.metric(name)
+                    (metric.sketch.total,) = reader.array("q")
+                    counters = reader.array("q")
+                    registers = bytearray(reader.blob())
+                    if len(counters) != len(metric.sketch.counters) or len(registers) != len(metric.distinct.registers):
+                        raise ValueError("sketch dimensions differ")
+                    metric.sketch.counters = counters
+                    metric.distinct.registers = registers
+        except (ValueError, struct.error, zlib.error) as error:
+            raise InvalidInputException(f"Corrupt aggregate state snapshot: {error}") from error
+
+        for name in COUNTED_FIELDS:
+            metric = aggregator.metric(name)
+            if isinstance(metric, SketchedFieldCounts):
+                metric.load_counts(counts[name])
+            else:
+                metric.counts = counts[name]
+        time_bounds = aggregator.metric("time_bounds")
+        time_bounds.first, time_bounds.last = metadata["time_bounds"]
+        return cls(aggregator, metadata["cursor"], metadata["scope"])
+
+    def save(self, path):
+        """
+        Writes the state to a file atomically: a crash while saving leaves the previous snapshot intact.
+
+        Args:
+            path (str): The path of the snapshot file.
+        """
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(self.to_bytes())
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a state saved with `save`.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Returns:
+            AggregateState: The state.
+
+        Raises:
+            InvalidInputException: If the file is not a valid snapshot.
+        """
+        with open(path, "rb") as snapshot_file:
+            return cls.from_bytes(snapshot_file.read())
+
+
+class Checkpointer:
+    """
+    Saves an `AggregateState` to a file at most once per interval.
+
+    Attributes:
+        path (str): The path of the snapshot file.
+        interval (float): The minimum number of seconds between periodic saves.
+        saves (int): The number of snapshots written.
+
+    Methods:
+        due():
+            Returns whether the interval has elapsed since the last save.
+
+        save(state):
+            Saves the state now.
+
+        maybe_save(state):
+            Saves the state if the interval has elapsed.
+    """
+
+    def __init__(self, path, interval=30.0, clock=time.monotonic):
+        """
+        Initializes a new instance of the Checkpointer class.
+
+        Args:
+            path (str): The path of the snapshot file.
+            interval (float, optional): The minimum number of seconds between periodic saves. Defaults to 30.
+            clock (callable, optional): Returns the current monotonic time. Defaults to `time.monotonic`.
+        """
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self._clock = clock
+        self._saved_at = clock()
+
+    def due(self):
+        """
+        Returns whether the interval has elapsed since the last save.
+
+        Returns:
+            bool: True if a periodic save is due.
+        """
+        return self._clock() - self._saved_at >= self.interval
+
+    def save(self, state):
+        """
+        Saves the state now.
+
+        Args:
+            state (AggregateState): The state to save.
+        """
+        state.save(self.path)
+        self.saves += 1
+        self._saved_at = self._clock()
+
+    def maybe_save(self, state):
+        """
+        Saves the state if the interval has elapsed since the last save.
+
+        Args:
+            state (AggregateState): The state to save.
+
+        Returns:
+            bool: True if the state was saved.
+        """
+        if not self.due():
+            return False
+        self.save(state)
+        return True
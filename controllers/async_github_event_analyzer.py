@@ -0,0 +1,132 @@
+"""
+async_github_event_analyzer.py
+
+A Python module providing the AsyncGitHubEventsAnalyzer class.
+
+This module contains the `AsyncGitHubEventsAnalyzer` class, which fetches GitHub events with `AsyncGitHubAPI` and
+analyzes them with the same `GitHubEventsAnalysis` methods as the synchronous `GitHubEventsAnalyzer`. It is meant for
+fanning out over many repositories on a single event loop.
+
+"""
+
+import asyncio
+
+from controllers.base.async_github_api import AsyncGitHubAPI
+from controllers.github_event_analyzer import GitHubEventsAnalysis
+
+
+class AsyncGitHubEventsAnalyzer(AsyncGitHubAPI, GitHubEventsAnalysis):
+    """
+    An asyncio class for fetching GitHub events and performing event analysis.
+
+    This class inherits from AsyncGitHubAPI and GitHubEventsAnalysis, so results are identical to the synchronous
+    analyzer while hundreds of requests can be in flight at once.
+
+    Methods:
+        fetch_events(repo_owner, repo_name, page=1, per_page=None):
+            Fetches GitHub events for the specified repository.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                page (int): The page number of the events to fetch.
+                per_page (int): The page size (optional, API default when omitted).
+            Returns:
+                list: The list of fetched events.
+
+        fetch_all_events(repo_owner, repo_name, max_pages=10):
+            Fetches every available page of GitHub events, fetching pages after the first concurrently.
+            Returns:
+                list: The list of fetched events, deduplicated by id, in API order.
+
+        analyze_repositories(repositories, event_type=None, all_pages=False, max_pages=10):
+            Fetches and analyzes the events of many repositories concurrently.
+            Args:
+                repositories (list): (owner, name) tuples of the repositories to analyze.
+                event_type (str): The type of events to filter (optional).
+                all_pages (bool): Whether to fetch every available page instead of the first one.
+                max_pages (int): The maximum number of pages per repository when all_pages is set.
+            Returns:
+                dict: The analysis result, or the raised exception, keyed by "owner/name".
+
+    Example Usage:
+        async def run():
+            async with AsyncGitHubEventsAnalyzer(max_concurrency=200) as analyzer:
+                return await analyzer.analyze_repositories([("python", "cpython"), ("psf", "requests")])
+
+        results = asyncio.run(run())
+
+    """
+
+    async def fetch_events(self, repo_owner, repo_name, page=1, per_page=None):
+        """
+        Fetches GitHub events for the specified repository.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            page (int): The page number of the events to fetch.
+            per_page (int): The page size (optional, API default when omitted).
+
+        Returns:
+            list: The list of fetched events.
+
+        Raises:
+            InvalidInputException: If both repo_owner and repo_name are not provided.
+        """
+        return await self.fetch(self.events_endpoint(repo_owner, repo_name, page, per_page))
+
+    async def fetch_all_events(self, repo_owner, repo_name, max_pages=10):
+        """
+        Fetches every available page of GitHub events.
+
+        The first page determines the page count through its `Link` header; the remaining pages are fetched
+        concurrently, bounded by the shared concurrency semaphore.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            max_pages (int): The maximum number of pages to fetch.
+
+        Returns:
+            list: The list of fetched events, deduplicated by id, in API order.
+        """
+        first_page, headers = await self.fetch_with_headers(
+            self.events_endpoint(repo_owner, repo_name, 1, self.MAX_PER_PAGE))
+        last_page = min(self.last_page_number(headers), max_pages)
+
+        remaining_pages = await asyncio.gather(*(
+            self.fetch_events(repo_owner, repo_name, page, self.MAX_PER_PAGE) for page in range(2, last_page + 1)))
+        return self.deduplicate_events([first_page, *remaining_pages])
+
+    async def analyze_repositories(self, repositories, event_type=None, all_pages=False, max_pages=10):
+        """
+        Fetches and analyzes the events of many repositories concurrently.
+
+        A failing repository does not cancel the others; its exception is returned in place of the result.
+
+        Args:
+            repositories (list): (owner, name) tuples of the repositories to analyze.
+            event_type (str): The type of events to filter (optional).
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages per repository when all_pages is set.
+
+        Returns:
+            dict: A dictionary with "events", "statistics" and "most_active_user" entries, or the raised exception,
+                keyed by "owner/name".
+        """
+        async def analyze(repo_owner, repo_name):
+            if all_pages:
+                events = await self.fetch_all_events(repo_owner, repo_name, max_pages)
+            else:
+                events = await self.fetch_events(repo_owner, repo_name)
+            if event_type:
+                events = self.filter_events(events, event_type)
+            return {
+                "events": events,
+                "statistics": self.calculate_event_statistics(events),
+                "most_active_user": self.identify_most_active_user(events),
+            }
+
+        results = await asyncio.gather(*(analyze(owner, name) for owner, name in repositories),
+                                       return_exceptions=True)
+        return {f"{owner}/{name}": result for (owner, name), result in zip(repositories, results)}
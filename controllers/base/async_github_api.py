@@ -0,0 +1,178 @@
+"""
+async_github_api.py
+
+A Python module providing an asyncio wrapper for the GitHub API.
+
+This module contains the `AsyncGitHubAPI` class, the asyncio counterpart of `GitHubAPI`. It keeps many requests in
+flight on a single event loop over a shared `aiohttp` connection pool, bounded by a concurrency semaphore.
+
+"""
+
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from controllers.base.transport import DEFAULT_HEADERS, Transport, full_jitter_backoff
+from utils.custom_exception import GitHubAPIException
+
+
+class AsyncGitHubAPI:
+    """
+    An asyncio wrapper for the GitHub API.
+
+    Every request acquires a slot of the concurrency semaphore, is sent over a shared keep-alive connection pool and is
+    cancelled when it exceeds the timeout. Server and connection errors are retried with the same jittered
+    exponential backoff as the synchronous transport.
+
+    Attributes:
+        base_url (str): The base URL of the GitHub API.
+        max_concurrency (int): The maximum number of requests in flight.
+        timeout (float): The per-request timeout in seconds.
+        max_retries (int): The number of retries after the first attempt.
+
+    Methods:
+        fetch(endpoint):
+            Fetches data from the specified API endpoint.
+            Args:
+                endpoint (str): The API endpoint to fetch data from.
+            Returns:
+                dict: The JSON response received from the API endpoint.
+            Raises:
+                GitHubAPIException: If the API request fails or returns a non-200 status code.
+
+        fetch_with_headers(endpoint):
+            Fetches data from the specified API endpoint along with the response headers.
+
+        close():
+            Closes the shared connection pool.
+
+    Example Usage:
+        async with AsyncGitHubAPI(max_concurrency=200) as api:
+            pages = await asyncio.gather(*(api.fetch(f"repos/{name}/events") for name in repositories))
+
+    """
+
+    def __init__(self, base_url="https://api.github.com", max_concurrency=100, timeout=10.0, max_retries=3,
+                 backoff_factor=0.5, max_backoff=30.0, pool_limit=None):
+        """
+        Initializes a new instance of the AsyncGitHubAPI class.
+
+        Args:
+            base_url (str, optional): The base URL of the GitHub API. Defaults to "https://api.github.com".
+            max_concurrency (int, optional): The maximum number of requests in flight. Defaults to 100.
+            timeout (float, optional): The per-request timeout in seconds. Defaults to 10.
+            max_retries (int, optional): Retries for server and connection errors. Defaults to 3.
+            backoff_factor (float, optional): The base backoff delay in seconds. Defaults to 0.5.
+            max_backoff (float, optional): The maximum single backoff delay in seconds. Defaults to 30.
+            pool_limit (int, optional): The connection pool size. Defaults to max_concurrency.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncGitHubAPI requires aiohttp. Install it with `pip install aiohttp`.")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.pool_limit = pool_limit or max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self):
+        """
+        Returns the shared client session, creating it on first use inside the running event loop.
+
+        Returns:
+            aiohttp.ClientSession: The shared session.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_limit, keepalive_timeout=30)
+            headers = {name: value for name, value in DEFAULT_HEADERS.items() if name != "Connection"}
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers)
+        return self._session
+
+    async def fetch(self, endpoint):
+        """
+        Fetches data from the specified API endpoint.
+
+        Args:
+            endpoint (str): The API endpoint to fetch data from.
+
+        Returns:
+            dict: The JSON response received from the API endpoint.
+
+        Raises:
+            GitHubAPIException: If the API request fails or returns a non-200 status code.
+        """
+        data, _ = await self.fetch_with_headers(endpoint)
+        return data
+
+    async def fetch_with_headers(self, endpoint):
+        """
+        Fetches data from the specified API endpoint along with the response headers.
+
+        Args:
+            endpoint (str): The API endpoint to fetch data from.
+
+        Returns:
+            tuple: The decoded JSON response and the response headers.
+
+        Raises:
+            GitHubAPIException: If the API request fails, times out or returns a non-200 status code.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                try:
+                    status, headers, content = await asyncio.wait_for(self._get(url), self.timeout)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt >= self.max_retries:
+                        raise GitHubAPIException(f"Failed to fetch data from {url}. Error: {e!r}") from e
+                else:
+                    if status not in Transport.RETRY_STATUS_CODES or attempt >= self.max_retries:
+                        break
+
+                await asyncio.sleep(full_jitter_backoff(attempt, self.backoff_factor, self.max_backoff))
+                attempt += 1
+
+        if status == 200:
+            return json.loads(content), headers
+        else:
+            error = content.decode("utf-8", errors="replace")
+            raise GitHubAPIException(f"Failed to fetch data from {url}. Error: {error}", status)
+
+    async def _get(self, url):
+        """
+        Sends a single GET request and reads the full body.
+
+        Args:
+            url (str): The absolute URL to request.
+
+        Returns:
+            tuple: The status code, response headers and body.
+        """
+        async with self._get_session().get(url) as response:
+            return response.status, response.headers, await response.read()
+
+    async def close(self):
+        """
+        Closes the shared connection pool.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
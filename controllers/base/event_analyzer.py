@@ -39,6 +39,13 @@ class EventAnalyzer:
             Args:
                 events (list): The list of events to be analyzed.
 
+        calculate_event_timeline(events, bucket='1h', by='type'):
+            Counts the events per time bucket and event type or actor.
+            Args:
+                events (list): The list of events to be binned.
+                bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+                by (str): What events are counted by: 'type' or 'actor'.
+
     """
 
     def display_events(self, events):
@@ -97,3 +104,19 @@ class EventAnalyzer:
             NotImplementedError: If the method is not implemented in the child class.
         """
         raise NotImplementedError("identify_most_active_user() method must be implemented in child class")
+
+    def calculate_event_timeline(self, events, bucket='1h', by='type'):
+        """
+        Counts the events per time bucket and event type or actor.
+
+        This method should be implemented in the child class.
+
+        Args:
+            events (list): The list of events to be binned.
+            bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+            by (str): What events are counted by: 'type' or 'actor'.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        raise NotImplementedError("calculate_event_timeline() method must be implemented in child class")
@@ -9,7 +9,14 @@ Author: Takrim Rahman Albi
 
 """
 
-import requests
+import json
+import re
+import time
+
+from controllers.base.transport import Transport
+from utils.custom_exception import GitHubAPIException
+
+LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
 
 
 class GitHubAPI:
@@ -20,21 +27,59 @@ class GitHubAPI:
 
     Attributes:
         base_url (str): The base URL of the GitHub API.
+        transport (Transport): The pooled, retrying transport used for every request.
+        cache (ResponseCache): The conditional request cache, or None when caching is disabled.
+        rate_limiter (RateLimitScheduler): The token and rate limit scheduler, or None to send unauthenticated,
+            unscheduled requests.
+        hooks (list): The `Hook` objects notified of every request, cache hit and decode.
 
     Methods:
-        __init__(base_url="https://api.github.com"):
+        __init__(base_url="https://api.github.com", transport=None, backend=None, timeout=10.0, max_retries=3,
+                 pool_maxsize=10, cache=None, rate_limiter=None, hooks=None):
             Initializes a new instance of the GitHubAPI class.
             Args:
                 base_url (str, optional): The base URL of the GitHub API. Defaults to "https://api.github.com".
-
-        fetch(endpoint):
+                transport (Transport, optional): A preconfigured transport. Overrides the remaining arguments.
+                backend (HTTPBackend or str, optional): The HTTP backend, or its name ("requests" or "http.client").
+                    Defaults to a pooled requests session, created on the first request.
+                timeout (float, optional): The per-request timeout in seconds. Defaults to 10.
+                max_retries (int, optional): Retries for server and connection errors. Defaults to 3.
+                pool_maxsize (int, optional): The number of keep-alive connections. Defaults to 10.
+                cache (ResponseCache, optional): A cache enabling conditional requests. Defaults to no caching.
+                rate_limiter (RateLimitScheduler, optional): Schedules requests across tokens within the rate
+                    limits. Defaults to no scheduling.
+                hooks (list, optional): `Hook` objects notified of requests, cache hits and decodes.
+
+        add_hook(hook):
+            Registers a hook notified of every request, cache hit and decode.
+
+        fetch(endpoint, decoder=None):
             Fetches data from the specified API endpoint.
             Args:
                 endpoint (str): The API endpoint to fetch data from.
+                decoder (ProjectingEventDecoder, optional): Decodes the response body instead of `json.loads`.
             Returns:
                 dict: The JSON response received from the API endpoint.
             Raises:
-                Exception: If the API request fails or returns a non-200 status code.
+                GitHubAPIException: If the API request fails or returns a non-200 status code.
+
+        fetch_with_headers(endpoint, decoder=None):
+            Fetches data from the specified API endpoint along with the response headers.
+            Args:
+                endpoint (str): The API endpoint to fetch data from.
+                decoder (ProjectingEventDecoder, optional): Decodes the response body instead of `json.loads`.
+            Returns:
+                tuple: The decoded JSON response and the response headers.
+
+        parse_link_header(link_header):
+            Parses an RFC 5988 `Link` header into a mapping of relation to URL.
+            Args:
+                link_header (str): The raw header value.
+            Returns:
+                dict: The URLs keyed by their `rel` value.
+
+        close():
+            Closes the transport and its pooled connections.
 
     Example Usage:
         # Create an instance of GitHubAPI
@@ -50,32 +95,160 @@ class GitHubAPI:
 
     """
 
-    def __init__(self, base_url="https://api.github.com"):
+    def __init__(self, base_url="https://api.github.com", transport=None, backend=None, timeout=10.0, max_retries=3,
+                 pool_maxsize=10, cache=None, rate_limiter=None, hooks=None):
         """
         Initializes a new instance of the GitHubAPI class.
 
         Args:
             base_url (str, optional): The base URL of the GitHub API. Defaults to "https://api.github.com".
+            transport (Transport, optional): A preconfigured transport. Overrides the remaining arguments.
+            backend (HTTPBackend or str, optional): The HTTP backend, or its name ("requests" or "http.client").
+                Defaults to a pooled requests session, created on the first request.
+            timeout (float, optional): The per-request timeout in seconds. Defaults to 10.
+            max_retries (int, optional): Retries for server and connection errors. Defaults to 3.
+            pool_maxsize (int, optional): The number of keep-alive connections. Defaults to 10.
+            cache (ResponseCache, optional): A cache enabling conditional requests. Defaults to no caching.
+            rate_limiter (RateLimitScheduler, optional): Schedules requests across tokens within the rate limits.
+                Defaults to no scheduling.
+            hooks (list, optional): `Hook` objects notified of requests, cache hits and decodes. Defaults to none.
         """
         self.base_url = base_url
+        if transport is None:
+            transport = Transport(backend=backend, timeout=timeout, max_retries=max_retries, pool_maxsize=pool_maxsize)
+        self.transport = transport
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or ())
+
+    def add_hook(self, hook):
+        """
+        Registers a hook notified of every request, cache hit and decode.
 
-    def fetch(self, endpoint):
+        Args:
+            hook (Hook): The hook.
+        """
+        self.hooks.append(hook)
+
+    def fetch(self, endpoint, decoder=None):
         """
         Fetches data from the specified API endpoint.
 
         Args:
             endpoint (str): The API endpoint to fetch data from.
+            decoder (ProjectingEventDecoder, optional): Decodes the response body instead of `json.loads`.
 
         Returns:
             dict: The JSON response received from the API endpoint.
 
         Raises:
-            Exception: If the API request fails or returns a non-200 status code.
+            GitHubAPIException: If the API request fails or returns a non-200 status code.
         """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url)
+        data, _ = self.fetch_with_headers(endpoint, decoder)
+        return data
+
+    def fetch_with_headers(self, endpoint, decoder=None):
+        """
+        Fetches data from the specified API endpoint along with the response headers.
 
-        if response.status_code == 200:
-            return response.json()
+        With a cache configured, a cached response is returned without contacting the server until the
+        `X-Poll-Interval` it advertised has elapsed. After that the request carries `If-None-Match` /
+        `If-Modified-Since` validators and a `304 Not Modified` answer is served from the cache.
+
+        With a rate limiter configured, the request waits for a token with budget left and is sent again, rather than
+        failing, if it is rate limited anyway.
+
+        A decoder, such as a `ProjectingEventDecoder`, replaces `json.loads`. Responses it decodes are cached apart
+        from those decoded in full, under the URL suffixed with the decoder's `cache_key`.
+
+        Args:
+            endpoint (str): The API endpoint to fetch data from.
+            decoder (ProjectingEventDecoder, optional): Decodes the response body. Defaults to `json.loads`.
+
+        Returns:
+            tuple: The decoded JSON response and the response headers.
+
+        Raises:
+            GitHubAPIException: If the API request fails or returns a non-200 status code.
+            RateLimitException: If every token stays rate limited for longer than the rate limiter may wait.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        cache_key = url if decoder is None else f"{url}#{decoder.cache_key}"
+        entry = self.cache.get(cache_key) if self.cache is not None else None
+        hooks = self.hooks
+        if entry is not None and entry.is_fresh():
+            for hook in hooks:
+                hook.on_cache_hit(url, False)
+            return entry.body, entry.headers
+
+        headers = entry.conditional_headers() if entry is not None else {}
+        started = time.perf_counter()
+        response = self._request(url, headers)
+        if hooks:
+            elapsed = time.perf_counter() - started
+            size = int(response.headers.get("Content-Length") or len(response.content))
+            for hook in hooks:
+                hook.on_request(url, response.status_code, size, elapsed)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidate(entry, response.headers)
+            for hook in hooks:
+                hook.on_cache_hit(url, True)
+            return entry.body, entry.headers
+        elif response.status_code == 200:
+            started = time.perf_counter()
+            data = json.loads(response.content) if decoder is None else decoder.decode(response.content)
+            if hooks:
+                elapsed = time.perf_counter() - started
+                for hook in hooks:
+                    hook.on_decode(len(response.content), elapsed)
+            if self.cache is not None:
+                self.cache.store(cache_key, data, response.headers)
+            return data, response.headers
         else:
-            raise Exception(f"Failed to fetch data from {url}. Error: {response.text}")
+            raise GitHubAPIException(f"Failed to fetch data from {url}. Error: {response.text}", response.status_code)
+
+    def _request(self, url, headers):
+        """
+        Sends a GET request, scheduled by the rate limiter when one is configured.
+
+        Args:
+            url (str): The absolute URL to request.
+            headers (dict): Extra request headers.
+
+        Returns:
+            HTTPResponse: The response.
+        """
+        if self.rate_limiter is None:
+            return self.transport.request("GET", url, headers)
+        while True:
+            budget = self.rate_limiter.acquire()
+            try:
+                response = self.transport.request("GET", url, {**headers, **budget.headers})
+            except Exception:
+                self.rate_limiter.cancel(budget)
+                raise
+            if not self.rate_limiter.release(budget, response):
+                return response
+
+    @staticmethod
+    def parse_link_header(link_header):
+        """
+        Parses an RFC 5988 `Link` header into a mapping of relation to URL.
+
+        Args:
+            link_header (str): The raw header value, e.g. `<https://...&page=2>; rel="next", <...>; rel="last"`.
+
+        Returns:
+            dict: The URLs keyed by their `rel` value. Empty if the header is missing.
+        """
+        links = {}
+        for url, rel in LINK_PATTERN.findall(link_header or ""):
+            links[rel] = url
+        return links
+
+    def close(self):
+        """
+        Closes the transport and its pooled connections.
+        """
+        self.transport.close()
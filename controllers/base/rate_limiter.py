@@ -0,0 +1,308 @@
+"""
+rate_limiter.py
+
+A Python module providing client-side scheduling of GitHub API requests within the API rate limits.
+
+This module contains the `TokenBudget` class, which tracks the primary rate limit of one token from the
+`X-RateLimit-*` response headers, the `TokenBucket` class, which paces requests to stay clear of the secondary rate
+limits, and the `RateLimitScheduler` class, which hands every request the token with the most budget left and makes
+callers wait, rather than fail, while every token is exhausted.
+
+"""
+
+import os
+import re
+import threading
+import time
+
+from utils.custom_exception import RateLimitException
+
+RATE_LIMITED_STATUS_CODES = frozenset({403, 429})
+
+# GitHub asks clients hitting a secondary rate limit without a Retry-After header to wait at least a minute.
+SECONDARY_RATE_LIMIT_DELAY = 60.0
+
+
+class TokenBudget:
+    """
+    The primary rate limit budget of one token.
+
+    Attributes:
+        token (str): The token, or None for unauthenticated requests.
+        limit (int): The number of requests per window, from `X-RateLimit-Limit`.
+        remaining (int): The requests left in the current window, less the requests in flight.
+        reset (float): The epoch time at which the window resets, from `X-RateLimit-Reset`.
+        blocked_until (float): The epoch time before which the token must not be used after a secondary rate limit.
+        in_flight (int): The number of requests sent with the token and not answered yet.
+    """
+
+    def __init__(self, token=None, limit=None):
+        """
+        Initializes a new instance of the TokenBudget class.
+
+        Args:
+            token (str, optional): The token. Defaults to unauthenticated requests.
+            limit (int, optional): The assumed limit until a response reports it. Defaults to GitHub's 5000 requests
+                per hour with a token and 60 without.
+        """
+        self.token = token
+        self.limit = limit if limit is not None else (5000 if token else 60)
+        self.remaining = self.limit
+        self.reset = 0.0
+        self.blocked_until = 0.0
+        self.in_flight = 0
+
+    @property
+    def headers(self):
+        """
+        Returns the request headers authenticating with the token.
+
+        Returns:
+            dict: The `Authorization` header, or no header for unauthenticated requests.
+        """
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def available_at(self, now):
+        """
+        Returns the earliest epoch time at which the token may be used.
+
+        Args:
+            now (float): The current epoch time.
+
+        Returns:
+            float: The time, `now` or earlier if the token is usable right away.
+        """
+        if self.remaining > 0:
+            return self.blocked_until
+        return max(self.reset, self.blocked_until)
+
+    def reserve(self, now):
+        """
+        Takes one request from the budget, starting a new window if the previous one has reset.
+
+        Args:
+            now (float): The current epoch time.
+        """
+        if self.remaining <= 0 and now >= self.reset:
+            self.remaining = self.limit
+        self.remaining -= 1
+        self.in_flight += 1
+
+    def cancel(self):
+        """
+        Gives back the request taken by `reserve` when it could not be sent.
+        """
+        self.remaining += 1
+        self.in_flight -= 1
+
+    def record(self, response, now):
+        """
+        Updates the budget from a response to a request sent with the token.
+
+        Args:
+            response (HTTPResponse): The response.
+            now (float): The current epoch time.
+
+        Returns:
+            bool: True if the request was rejected by a rate limit and should be sent again.
+        """
+        self.in_flight -= 1
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.limit = int(headers.get("X-RateLimit-Limit", self.limit))
+            self.reset = float(headers.get("X-RateLimit-Reset", self.reset))
+            self.remaining = int(remaining) - self.in_flight
+
+        if response.status_code not in RATE_LIMITED_STATUS_CODES:
+            return False
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            self.blocked_until = now + float(retry_after)
+            return True
+        if remaining is not None and int(remaining) == 0:
+            return True
+        if re.search(r"rate limit", response.text, re.IGNORECASE):
+            self.blocked_until = now + SECONDARY_RATE_LIMIT_DELAY
+            return True
+        return False
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket pacing requests to a steady rate with bounded bursts.
+
+    Callers reserve a slot and sleep until it comes up, so concurrent callers are served in arrival order.
+
+    Attributes:
+        rate (float): The sustained number of requests per second.
+        capacity (float): The largest burst of requests sent without pacing.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initializes a new instance of the TokenBucket class.
+
+        Args:
+            rate (float): The sustained number of requests per second.
+            capacity (float, optional): The burst size. Defaults to one second's worth of requests.
+            clock (callable, optional): Returns the current time in seconds. Defaults to `time.monotonic`.
+            sleep (callable, optional): Sleeps for a number of seconds. Defaults to `time.sleep`.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Waits until a request may be sent.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+class RateLimitScheduler:
+    """
+    Schedules GitHub API requests across a pool of tokens within the primary and secondary rate limits.
+
+    Every request takes the usable token with the most budget left, so load spreads across tokens and a token is
+    never used past its limit. Requests are paced by a token bucket to avoid secondary rate limits. When every token
+    is exhausted, callers wait for the earliest reset instead of failing, and a request that is rate limited anyway is
+    sent again once its token recovers.
+
+    Attributes:
+        budgets (list): The `TokenBudget` of every token.
+        bucket (TokenBucket): The pacing bucket, or None when pacing is disabled.
+        max_wait (float): The longest a single request waits for a token before `RateLimitException` is raised, or
+            None to wait as long as needed.
+        on_wait (callable): Called with the delay in seconds and the epoch time waited for before every wait for a
+            token, or None.
+
+    Methods:
+        from_environment(environ=None, **kwargs):
+            Creates a scheduler for the tokens in `GITHUB_TOKENS` (comma separated) or `GITHUB_TOKEN`.
+
+        acquire():
+            Waits for a request slot and returns the token budget to send it with.
+
+        release(budget, response):
+            Records the response to a request and tells whether it must be sent again.
+
+        cancel(budget):
+            Gives back the slot of a request that could not be sent.
+
+    Example Usage:
+        scheduler = RateLimitScheduler(["token-a", "token-b"], rate=10)
+        analyzer = GitHubEventsAnalyzer(rate_limiter=scheduler)
+
+    """
+
+    def __init__(self, tokens=None, rate=10.0, burst=None, max_wait=None, on_wait=None, clock=time.time,
+                 sleep=time.sleep):
+        """
+        Initializes a new instance of the RateLimitScheduler class.
+
+        Args:
+            tokens (list, optional): The tokens to rotate through. Defaults to unauthenticated requests.
+            rate (float, optional): The sustained requests per second per token; 0 disables pacing. Defaults to 10.
+            burst (float, optional): The burst size of the pacing bucket. Defaults to one second's worth of requests.
+            max_wait (float, optional): The longest a request waits for a token. Defaults to no limit.
+            on_wait (callable, optional): Called with the delay and the epoch time waited for before every wait for a
+                token, e.g. to report it. Defaults to waiting silently.
+            clock (callable, optional): Returns the current epoch time. Defaults to `time.time`.
+            sleep (callable, optional): Sleeps for a number of seconds. Defaults to `time.sleep`.
+        """
+        self.budgets = [TokenBudget(token) for token in tokens] if tokens else [TokenBudget()]
+        self.bucket = TokenBucket(rate * len(self.budgets), burst, clock, sleep) if rate else None
+        self.max_wait = max_wait
+        self.on_wait = on_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, environ=None, **kwargs):
+        """
+        Creates a scheduler for the tokens in `GITHUB_TOKENS` (comma separated) or `GITHUB_TOKEN`.
+
+        Args:
+            environ (dict, optional): The environment to read. Defaults to `os.environ`.
+            **kwargs: Further `RateLimitScheduler` arguments.
+
+        Returns:
+            RateLimitScheduler: The scheduler, sending unauthenticated requests if neither variable is set.
+        """
+        environ = os.environ if environ is None else environ
+        tokens = [token.strip() for token in environ.get("GITHUB_TOKENS", "").split(",") if token.strip()]
+        if not tokens and environ.get("GITHUB_TOKEN"):
+            tokens = [environ["GITHUB_TOKEN"]]
+        return cls(tokens, **kwargs)
+
+    def acquire(self):
+        """
+        Waits for a request slot and returns the token budget to send it with.
+
+        Returns:
+            TokenBudget: The budget of the token to use. Pass it to `release` with the response.
+
+        Raises:
+            RateLimitException: If every token stays rate limited for longer than `max_wait`.
+        """
+        if self.bucket is not None:
+            self.bucket.acquire()
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                ready_at = min(budget.available_at(now) for budget in self.budgets)
+                if ready_at <= now:
+                    budget = max((budget for budget in self.budgets if budget.available_at(now) <= now),
+                                 key=lambda budget: budget.remaining)
+                    budget.reserve(now)
+                    return budget
+
+            delay = ready_at - now
+            if self.max_wait is not None and waited + delay > self.max_wait:
+                raise RateLimitException(f"Every token is rate limited for another {delay:.0f}s!", retry_at=ready_at)
+            if self.on_wait is not None:
+                self.on_wait(delay, ready_at)
+            self._sleep(delay)
+            waited += delay
+
+    def release(self, budget, response):
+        """
+        Records the response to a request and tells whether it must be sent again.
+
+        Args:
+            budget (TokenBudget): The budget returned by `acquire` for the request.
+            response (HTTPResponse): The response.
+
+        Returns:
+            bool: True if the request was rejected by a rate limit and should be sent again.
+        """
+        with self._lock:
+            return budget.record(response, self._clock())
+
+    def cancel(self, budget):
+        """
+        Gives back the slot of a request that could not be sent.
+
+        Args:
+            budget (TokenBudget): The budget returned by `acquire` for the request.
+        """
+        with self._lock:
+            budget.cancel()
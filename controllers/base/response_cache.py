@@ -0,0 +1,245 @@
+"""
+response_cache.py
+
+A Python module providing a conditional request cache for the GitHub API wrapper.
+
+This module contains the `CacheEntry` class, which stores the validators and decoded body of a response, and the
+`ResponseCache` class, an LRU cache of entries keyed by URL that can optionally persist entries on disk.
+GitHub does not count `304 Not Modified` responses against the rate limit, so revalidating cached pages is free.
+
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    A cached API response.
+
+    Attributes:
+        url (str): The requested URL.
+        body (object): The decoded JSON body.
+        headers (dict): The response headers worth replaying (`Link`, `ETag`, `Last-Modified`, `X-Poll-Interval`).
+        fetched_at (float): The epoch time the response was last fetched or revalidated.
+    """
+
+    REPLAYED_HEADERS = ("Link", "ETag", "Last-Modified", "X-Poll-Interval")
+
+    def __init__(self, url, body, headers, fetched_at=None):
+        self.url = url
+        self.body = body
+        self.headers = {name: headers[name] for name in self.REPLAYED_HEADERS if headers.get(name)}
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    @property
+    def poll_interval(self):
+        """
+        Returns the number of seconds the server asked clients to wait between polls.
+
+        Returns:
+            int: The `X-Poll-Interval` value, or 0 if the server did not send one.
+        """
+        return int(self.headers.get("X-Poll-Interval", 0))
+
+    def is_fresh(self, now=None):
+        """
+        Checks whether the server-advised poll interval has not elapsed yet.
+
+        Args:
+            now (float, optional): The current epoch time. Defaults to `time.time()`.
+
+        Returns:
+            bool: True if the entry can be served without contacting the server.
+        """
+        now = time.time() if now is None else now
+        return now < self.fetched_at + self.poll_interval
+
+    def conditional_headers(self):
+        """
+        Returns the validators to send with a conditional request.
+
+        Returns:
+            dict: `If-None-Match` and/or `If-Modified-Since` headers.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self, headers):
+        """
+        Records a `304 Not Modified` response, refreshing the fetch time and any updated validators.
+
+        Args:
+            headers (dict): The headers of the 304 response.
+        """
+        self.fetched_at = time.time()
+        for name in self.REPLAYED_HEADERS:
+            if headers.get(name):
+                self.headers[name] = headers[name]
+
+    def to_dict(self):
+        return {"url": self.url, "body": self.body, "headers": self.headers, "fetched_at": self.fetched_at}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["url"], data["body"], data["headers"], data["fetched_at"])
+
+
+class ResponseCache:
+    """
+    An LRU cache of API responses keyed by URL, optionally persisted on disk.
+
+    The in-memory layer holds at most `max_entries` entries and evicts the least recently used one. When a cache
+    directory is configured, every stored entry is also written there as JSON so later runs can revalidate instead of
+    re-downloading. The cache is safe to share between threads.
+
+    Attributes:
+        max_entries (int): The maximum number of entries kept in memory.
+        cache_dir (str): The directory used for persistence, or None for a memory-only cache.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that found nothing.
+
+    Methods:
+        get(url):
+            Returns the cached entry for a URL.
+
+        store(url, body, headers):
+            Stores a fresh 200 response.
+
+        revalidate(entry, headers):
+            Records a 304 response for a cached entry.
+
+        clear():
+            Removes every entry from memory and disk.
+    """
+
+    def __init__(self, max_entries=256, cache_dir=None):
+        """
+        Initializes a new instance of the ResponseCache class.
+
+        Args:
+            max_entries (int, optional): The maximum number of entries kept in memory. Defaults to 256.
+            cache_dir (str, optional): The directory used for persistence. Defaults to memory only.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, url):
+        """
+        Returns the cached entry for a URL, loading it from disk if it is not in memory.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            CacheEntry: The cached entry, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return entry
+
+        entry = self._load(url)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(entry)
+        return entry
+
+    def store(self, url, body, headers):
+        """
+        Stores a fresh 200 response.
+
+        Args:
+            url (str): The requested URL.
+            body (object): The decoded JSON body.
+            headers (dict): The response headers.
+
+        Returns:
+            CacheEntry: The stored entry.
+        """
+        entry = CacheEntry(url, body, headers)
+        with self._lock:
+            self._remember(entry)
+        self._save(entry)
+        return entry
+
+    def revalidate(self, entry, headers):
+        """
+        Records a `304 Not Modified` response for a cached entry.
+
+        Args:
+            entry (CacheEntry): The entry that was revalidated.
+            headers (dict): The headers of the 304 response.
+        """
+        with self._lock:
+            entry.revalidated(headers)
+        self._save(entry)
+
+    def clear(self):
+        """
+        Removes every entry from memory and disk.
+        """
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, entry):
+        self._entries[entry.url] = entry
+        self._entries.move_to_end(entry.url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as cache_file:
+                entry = CacheEntry.from_dict(json.load(cache_file))
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry if entry.url == url else None
+
+    def _save(self, entry):
+        if not self.cache_dir:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+            json.dump(entry.to_dict(), cache_file, separators=(",", ":"))
+        os.replace(temp_path, self._path(entry.url))
@@ -0,0 +1,420 @@
+"""
+transport.py
+
+A Python module providing the HTTP transport layer used by the GitHub API wrapper.
+
+This module contains the `HTTPResponse` value object, the `HTTPBackend` base class that concrete HTTP backends
+implement, the `RequestsBackend` built on a pooled `requests.Session`, the `HTTPClientBackend` built on the standard
+library's `http.client`, and the `Transport` class that adds per-request timeouts and jittered exponential backoff on
+top of any backend.
+
+HTTP libraries are imported when a backend is created, and `Transport` creates its default backend on the first
+request, so commands that never touch the network do not pay for importing `requests` and its dependencies.
+
+"""
+
+import importlib.util
+import random
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from utils.custom_exception import GitHubAPIException, InvalidInputException
+
+DEFAULT_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+HTTP_BACKENDS = ("requests", "http.client")
+
+
+def create_backend(name=None, pool_maxsize=10):
+    """
+    Creates an HTTP backend by name.
+
+    Args:
+        name (str, optional): "requests" or "http.client". Defaults to "requests" when it is installed, and to the
+            standard library otherwise.
+        pool_maxsize (int, optional): The maximum number of connections kept alive per host. Defaults to 10.
+
+    Returns:
+        HTTPBackend: The backend.
+
+    Raises:
+        InvalidInputException: If the name is not a known backend.
+    """
+    if name is None:
+        name = "requests" if importlib.util.find_spec("requests") is not None else "http.client"
+    if name == "requests":
+        return RequestsBackend(pool_maxsize=pool_maxsize)
+    if name == "http.client":
+        return HTTPClientBackend(pool_maxsize=pool_maxsize)
+    raise InvalidInputException(f"Unknown HTTP backend {name!r}, expected one of {', '.join(HTTP_BACKENDS)}!")
+
+
+def full_jitter_backoff(attempt, backoff_factor, max_backoff):
+    """
+    Returns a "full jitter" exponential backoff delay.
+
+    Args:
+        attempt (int): The zero-based retry attempt.
+        backoff_factor (float): The base delay in seconds.
+        max_backoff (float): The upper bound for the delay in seconds.
+
+    Returns:
+        float: A delay drawn uniformly between zero and the capped exponential delay.
+    """
+    return random.uniform(0, min(max_backoff, backoff_factor * (2 ** attempt)))
+
+
+class HTTPResponse:
+    """
+    A minimal, backend independent HTTP response.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (dict): The response headers. Lookups are case-insensitive when the backend provides such a mapping.
+        content (bytes): The decoded (decompressed) response body.
+        url (str): The URL the response was received from.
+    """
+
+    def __init__(self, status_code, headers, content, url=""):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        """
+        Returns the response body decoded as UTF-8.
+
+        Returns:
+            str: The response body.
+        """
+        return self.content.decode("utf-8", errors="replace")
+
+
+class HTTPBackend:
+    """
+    A base class for HTTP backends used by `Transport`.
+
+    Backends are responsible for connection management only; retries and backoff are handled by `Transport`.
+    Tests and benchmarks can provide their own backend to serve canned responses without touching the network.
+
+    Methods:
+        request(method, url, headers=None, timeout=None):
+            Sends a single HTTP request.
+            Args:
+                method (str): The HTTP method.
+                url (str): The absolute URL to request.
+                headers (dict): Extra request headers (optional).
+                timeout (float): The per-request timeout in seconds (optional).
+            Returns:
+                HTTPResponse: The received response.
+
+        close():
+            Releases any pooled connections held by the backend.
+    """
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Sends a single HTTP request.
+
+        This method should be implemented in the child class.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL to request.
+            headers (dict): Extra request headers (optional).
+            timeout (float): The per-request timeout in seconds (optional).
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        raise NotImplementedError("request() method must be implemented in child class")
+
+    def close(self):
+        """
+        Releases any pooled connections held by the backend.
+        """
+
+
+class RequestsBackend(HTTPBackend):
+    """
+    An HTTP backend built on a shared `requests.Session`.
+
+    The session keeps connections alive between requests, so consecutive pages reuse the same TCP/TLS connection.
+    `requests` negotiates gzip/deflate and decompresses the body transparently. Connection errors and timeouts are
+    raised as the built-in `ConnectionError` and `TimeoutError`.
+
+    Attributes:
+        session (requests.Session): The pooled session.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10):
+        """
+        Initializes a new instance of the RequestsBackend class.
+
+        Args:
+            pool_connections (int, optional): The number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of connections kept alive per host. Defaults to 10.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._timeout_error, self._connection_error = requests.Timeout, requests.ConnectionError
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Sends a single HTTP request over the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL to request.
+            headers (dict): Extra request headers (optional).
+            timeout (float): The per-request timeout in seconds (optional).
+
+        Returns:
+            HTTPResponse: The received response.
+        """
+        try:
+            response = self.session.request(method, url, headers=headers, timeout=timeout)
+        except self._timeout_error as error:
+            raise TimeoutError(str(error)) from error
+        except self._connection_error as error:
+            raise ConnectionError(str(error)) from error
+        return HTTPResponse(response.status_code, response.headers, response.content, url)
+
+    def close(self):
+        """
+        Closes the underlying session and its pooled connections.
+        """
+        self.session.close()
+
+
+class HTTPClientBackend(HTTPBackend):
+    """
+    An HTTP backend built on the standard library's `http.client`, for environments where importing `requests` is too
+    slow or it is not installed.
+
+    Connections are kept alive in a pool per host and reused by consecutive requests; a pooled connection the server
+    has closed meanwhile is replaced transparently. gzip and deflate bodies are decompressed. Response headers are
+    `http.client.HTTPMessage` objects, whose lookups are case-insensitive.
+
+    Attributes:
+        pool_maxsize (int): The maximum number of idle connections kept alive per host.
+    """
+
+    def __init__(self, pool_maxsize=10):
+        """
+        Initializes a new instance of the HTTPClientBackend class.
+
+        Args:
+            pool_maxsize (int, optional): The maximum number of idle connections kept alive per host. Defaults to 10.
+        """
+        import http.client
+
+        self._client = http.client
+        self.pool_maxsize = pool_maxsize
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, scheme, host, timeout):
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            return connection, True
+        connection_class = self._client.HTTPSConnection if scheme == "https" else self._client.HTTPConnection
+        return connection_class(host, timeout=timeout), False
+
+    def _checkin(self, scheme, host, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.pool_maxsize:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Sends a single HTTP request over a pooled connection.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL to request.
+            headers (dict): Extra request headers (optional).
+            timeout (float): The per-request timeout in seconds (optional).
+
+        Returns:
+            HTTPResponse: The received response.
+
+        Raises:
+            ConnectionError: If the connection failed or the response was malformed.
+            TimeoutError: If the server did not answer within the timeout.
+        """
+        parts = urlsplit(url)
+        target = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+        connection, reused = self._checkout(parts.scheme, parts.netloc, timeout)
+        try:
+            connection.request(method, target, headers=headers or {})
+            response = connection.getresponse()
+            content = response.read()
+        except (OSError, self._client.HTTPException) as error:
+            connection.close()
+            if isinstance(error, TimeoutError):
+                raise
+            if reused:
+                # The server closed the idle connection; a fresh one is not retried again.
+                return self.request(method, url, headers, timeout)
+            raise ConnectionError(f"{type(error).__name__}: {error}") from error
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(parts.scheme, parts.netloc, connection)
+        encoding = (response.getheader("Content-Encoding") or "").lower()
+        if encoding == "gzip":
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            try:
+                content = zlib.decompress(content)
+            except zlib.error:
+                content = zlib.decompress(content, -zlib.MAX_WBITS)
+        return HTTPResponse(response.status, response.headers, content, url)
+
+    def close(self):
+        """
+        Closes every idle connection.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class Transport:
+    """
+    Sends requests through an `HTTPBackend` with timeouts and retries.
+
+    Server errors (5xx) and connection errors are retried with jittered exponential backoff. Any other response is
+    returned to the caller as is.
+
+    Attributes:
+        backend (HTTPBackend): The backend used to send requests, created on first use unless one was given.
+        timeout (float): The per-request timeout in seconds.
+        max_retries (int): The number of retries after the first attempt.
+        backoff_factor (float): The base delay in seconds for the exponential backoff.
+        max_backoff (float): The upper bound for a single backoff delay in seconds.
+        default_headers (dict): Headers sent with every request.
+
+    Methods:
+        request(method, url, headers=None):
+            Sends a request, retrying transient failures.
+
+        backoff_delay(attempt):
+            Returns the delay before the given retry attempt.
+
+        close():
+            Closes the backend.
+    """
+
+    RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, backend=None, timeout=10.0, max_retries=3, backoff_factor=0.5, max_backoff=30.0,
+                 pool_maxsize=10, default_headers=None):
+        """
+        Initializes a new instance of the Transport class.
+
+        Args:
+            backend (HTTPBackend or str, optional): The backend to use, or the name of one for `create_backend`, which
+                is then created on the first request. Defaults to `RequestsBackend`, or to `HTTPClientBackend` when
+                `requests` is not installed.
+            timeout (float, optional): The per-request timeout in seconds. Defaults to 10.
+            max_retries (int, optional): The number of retries after the first attempt. Defaults to 3.
+            backoff_factor (float, optional): The base backoff delay in seconds. Defaults to 0.5.
+            max_backoff (float, optional): The maximum single backoff delay in seconds. Defaults to 30.
+            pool_maxsize (int, optional): The connection pool size for the default backend. Defaults to 10.
+            default_headers (dict, optional): Headers sent with every request.
+        """
+        self._backend = None if isinstance(backend, str) else backend
+        self._backend_name = backend if isinstance(backend, str) else None
+        self._backend_lock = threading.Lock()
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.default_headers = dict(DEFAULT_HEADERS)
+        if default_headers:
+            self.default_headers.update(default_headers)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = create_backend(self._backend_name, self.pool_maxsize)
+        return self._backend
+
+    def backoff_delay(self, attempt):
+        """
+        Returns the delay before the given retry attempt using "full jitter" exponential backoff.
+
+        Args:
+            attempt (int): The zero-based retry attempt.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return full_jitter_backoff(attempt, self.backoff_factor, self.max_backoff)
+
+    def request(self, method, url, headers=None):
+        """
+        Sends a request, retrying server errors and connection errors.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL to request.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            HTTPResponse: The last response received.
+
+        Raises:
+            GitHubAPIException: If the request could not be sent after all retries.
+        """
+        request_headers = dict(self.default_headers)
+        if headers:
+            request_headers.update(headers)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.backend.request(method, url, headers=request_headers, timeout=self.timeout)
+            except (ConnectionError, TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise GitHubAPIException(f"Failed to fetch data from {url}. Error: {e}") from e
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def close(self):
+        """
+        Closes the backend and releases its connections.
+        """
+        if self._backend is not None:
+            self._backend.close()
@@ -0,0 +1,623 @@
+"""
+event_aggregator.py
+
+A Python module providing a single-pass analytics engine for GitHub events.
+
+This module contains the `Metric` base class and the built-in metrics (`EventTypeCounts`, `ActorCounts`,
+`BoundedActorCounts`, `SketchedFieldCounts`, `SketchedActorCounts`, `RepoCounts`, `TimeBounds`, `TopActors` and
+`DistinctCounts`), together with the `EventAggregator` class, which updates every registered metric in a single pass
+over the events. Custom metrics plug in by subclassing `Metric`.
+
+"""
+
+import heapq
+from operator import itemgetter
+
+from controllers.event_sketches import CountMinSketch, HyperLogLog, sketch_hash
+
+
+class Metric:
+    """
+    A base class for metrics computed by `EventAggregator`.
+
+    Attributes:
+        name (str): The key of the metric in the aggregator results.
+        derived (bool): Whether the metric is computed from other metrics only and needs no per-event updates.
+
+    Methods:
+        update(event):
+            Accounts for a single event.
+            Args:
+                event (dict): The event to account for.
+
+        result():
+            Returns the current value of the metric.
+
+        merge(other):
+            Folds the state of another metric of the same kind into this one.
+            Args:
+                other (Metric): The metric computed over another part of the events.
+    """
+
+    name = None
+    derived = False
+
+    def update(self, event):
+        """
+        Accounts for a single event.
+
+        This method should be implemented in the child class.
+
+        Args:
+            event (dict): The event to account for.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        raise NotImplementedError("update() method must be implemented in child class")
+
+    def result(self):
+        """
+        Returns the current value of the metric.
+
+        This method should be implemented in the child class.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        raise NotImplementedError("result() method must be implemented in child class")
+
+    def merge(self, other):
+        """
+        Folds the state of another metric of the same kind into this one.
+
+        This method should be implemented in the child class. Derived metrics need no merge.
+
+        Args:
+            other (Metric): The metric computed over another part of the events.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        if not self.derived:
+            raise NotImplementedError("merge() method must be implemented in child class")
+
+
+class FieldCounts(Metric):
+    """
+    Counts the events per value of a (possibly nested) field. Events missing the field are skipped.
+
+    Attributes:
+        counts (dict): The number of events per field value, in first-seen order.
+    """
+
+    def __init__(self, name, *path):
+        """
+        Initializes a new instance of the FieldCounts class.
+
+        Args:
+            name (str): The key of the metric in the aggregator results.
+            *path (str): The keys leading to the counted field, e.g. "actor", "login".
+        """
+        self.name = name
+        self.path = path
+        self.counts = {}
+
+    def update(self, event):
+        try:
+            for key in self.path:
+                event = event[key]
+        except (KeyError, TypeError):
+            return
+        self.counts[event] = self.counts.get(event, 0) + 1
+
+    def result(self):
+        return self.counts
+
+    def merge(self, other):
+        counts = self.counts
+        for value, count in other.counts.items():
+            counts[value] = counts.get(value, 0) + count
+
+
+class EventTypeCounts(FieldCounts):
+    """
+    Counts the events per event type.
+    """
+
+    def __init__(self):
+        super().__init__("event_types", "type")
+
+    def update(self, event):
+        event_type = event['type']
+        self.counts[event_type] = self.counts.get(event_type, 0) + 1
+
+
+class ActorCounts(FieldCounts):
+    """
+    Counts the events per actor login.
+    """
+
+    def __init__(self):
+        super().__init__("actors", "actor", "login")
+
+    def update(self, event):
+        login = event['actor']['login']
+        self.counts[login] = self.counts.get(login, 0) + 1
+
+
+class BoundedActorCounts(ActorCounts):
+    """
+    Counts the events per actor login in bounded memory, with the Space-Saving algorithm.
+
+    At most `capacity` actors are tracked. When a new actor arrives and every slot is taken, the actor with the lowest
+    count is replaced and the newcomer inherits that count plus one, so counts are overestimates by at most the
+    inherited amount, recorded in `errors`. Any actor with more than 1/capacity of all events is guaranteed to be
+    tracked, so the most active user is exact whenever it stands out. The lowest count is found on a heap with lazily
+    discarded stale entries, so an update takes amortized logarithmic time.
+
+    Attributes:
+        capacity (int): The maximum number of actors tracked.
+        counts (dict): The (over)estimated number of events per tracked actor.
+        errors (dict): The maximum overestimate of each tracked actor that replaced another one.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        Initializes a new instance of the BoundedActorCounts class.
+
+        Args:
+            capacity (int, optional): The maximum number of actors tracked. Defaults to 1000.
+        """
+        super().__init__()
+        self.capacity = capacity
+        self.errors = {}
+        self._heap = []
+
+    def update(self, event):
+        login = event['actor']['login']
+        counts = self.counts
+        count = counts.get(login)
+        if count is not None:
+            count += 1
+        elif len(counts) < self.capacity:
+            count = 1
+        else:
+            heap = self._heap
+            while counts.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            minimum, evicted = heapq.heappop(heap)
+            del counts[evicted]
+            self.errors.pop(evicted, None)
+            self.errors[login] = minimum
+            count = minimum + 1
+        counts[login] = count
+        heapq.heappush(self._heap, (count, login))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, login) for login, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def merge(self, other):
+        super().merge(other)
+        errors = self.errors
+        for login, error in other.errors.items():
+            errors[login] = errors.get(login, 0) + error
+        if len(self.counts) > self.capacity:
+            kept = set(heapq.nlargest(self.capacity, self.counts, key=self.counts.get))
+            self.counts = {login: count for login, count in self.counts.items() if login in kept}
+            self.errors = {login: error for login, error in errors.items() if login in kept}
+        self._heap = [(count, login) for login, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class SketchedFieldCounts(FieldCounts):
+    """
+    Estimates the events per value of a field in bounded memory, with a Count-Min sketch and a heap of heavy hitters.
+
+    Every value is counted in a `CountMinSketch` and a `HyperLogLog`, whose sizes depend only on the configured error
+    bounds. Only the `capacity` values with the highest estimates are kept in `counts`, on a heap whose entries are
+    refreshed lazily, so `TopActors` and `DistinctCounts` work on top of it as they do on exact counts. The counter
+    positions of the kept values are remembered, so their events, typically most of a skewed stream, are counted
+    without hashing. Estimates overcount by at most `sketch.error_bound` with the configured confidence. The sketches
+    of metrics built with the same configuration merge exactly, and the merged heavy hitters are re-estimated from the
+    merged sketch.
+
+    Attributes:
+        capacity (int): The maximum number of values kept in counts.
+        error (float): The configured overcount bound as a fraction of all events.
+        confidence (float): The configured probability that an estimate is within the bound.
+        distinct_error (float): The configured relative standard error of the distinct count.
+        counts (dict): The estimated number of events of the most frequent values.
+        sketch (CountMinSketch): The estimated number of events of every value.
+        distinct (HyperLogLog): The estimated number of distinct values.
+    """
+
+    def __init__(self, name, *path, capacity=100, error=0.001, confidence=0.99, distinct_error=0.01):
+        """
+        Initializes a new instance of the SketchedFieldCounts class.
+
+        Args:
+            name (str): The key of the metric in the aggregator results.
+            *path (str): The keys leading to the counted field, e.g. "actor", "login".
+            capacity (int, optional): The maximum number of values kept in counts. Defaults to 100.
+            error (float, optional): The overcount bound of the estimates as a fraction of all events. Defaults to
+                0.001.
+            confidence (float, optional): The probability that an estimate is within the bound. Defaults to 0.99.
+            distinct_error (float, optional): The relative standard error of the distinct count. Defaults to 0.01.
+        """
+        super().__init__(name, *path)
+        self.capacity = capacity
+        self.error = error
+        self.confidence = confidence
+        self.distinct_error = distinct_error
+        self.sketch = CountMinSketch(error, confidence)
+        self.distinct = HyperLogLog(distinct_error)
+        self._heap = []
+        self._cells = {}
+
+    def update(self, event):
+        try:
+            for key in self.path:
+                event = event[key]
+        except (KeyError, TypeError):
+            return
+        self.track(event)
+
+    def track(self, value):
+        """
+        Counts one event of a value in the sketches and keeps the value if it is among the most frequent.
+
+        Args:
+            value (str): The field value.
+        """
+        counts, tracked_cells = self.counts, self._cells
+        cells = tracked_cells.get(value)
+        if cells is not None:
+            # A kept value was already counted by the distinct sketch, which ignores repeats.
+            counts[value] = self.sketch.add_cells(cells)
+            return
+        hashed = sketch_hash(value)
+        self.distinct.add_hash(hashed)
+        cells = self.sketch.cells(hashed)
+        estimate = self.sketch.add_cells(cells)
+        heap = self._heap
+        if len(counts) >= self.capacity:
+            # Each tracked value has one heap entry, refreshed only when it reaches the top with a stale count.
+            while counts[heap[0][1]] != heap[0][0]:
+                heapq.heapreplace(heap, (counts[heap[0][1]], heap[0][1]))
+            if estimate <= heap[0][0]:
+                return
+            evicted = heapq.heapreplace(heap, (estimate, value))[1]
+            del counts[evicted], tracked_cells[evicted]
+        else:
+            heapq.heappush(heap, (estimate, value))
+        counts[value] = estimate
+        tracked_cells[value] = cells
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        self.distinct.merge(other.distinct)
+        estimate = self.sketch.estimate
+        self.load_counts({value: estimate(value) for value in (*self.counts, *other.counts)})
+
+    def load_counts(self, counts):
+        """
+        Replaces the kept values, keeping the `capacity` most frequent ones, e.g. after merging or loading sketches.
+
+        Args:
+            counts (dict): The estimated number of events per value.
+        """
+        kept = set(heapq.nlargest(self.capacity, counts, key=counts.get))
+        self.counts = {value: count for value, count in counts.items() if value in kept}
+        self._heap = [(count, value) for value, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self._cells = {value: self.sketch.cells(sketch_hash(value)) for value in self.counts}
+
+
+class SketchedActorCounts(SketchedFieldCounts):
+    """
+    Estimates the events per actor login in bounded memory.
+    """
+
+    def __init__(self, capacity=100, error=0.001, confidence=0.99, distinct_error=0.01):
+        super().__init__("actors", "actor", "login", capacity=capacity, error=error, confidence=confidence,
+                         distinct_error=distinct_error)
+
+    def update(self, event):
+        self.track(event['actor']['login'])
+
+
+class RepoCounts(FieldCounts):
+    """
+    Counts the events per repository name.
+    """
+
+    def __init__(self):
+        super().__init__("repos", "repo", "name")
+
+
+class TimeBounds(Metric):
+    """
+    Tracks the first and last `created_at` timestamps.
+
+    GitHub timestamps are ISO 8601 UTC strings, which order chronologically when compared as strings.
+    """
+
+    name = "time_bounds"
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+
+    def update(self, event):
+        created_at = event.get('created_at')
+        if created_at is None:
+            return
+        if self.first is None or created_at < self.first:
+            self.first = created_at
+        if self.last is None or created_at > self.last:
+            self.last = created_at
+
+    def result(self):
+        return self.first, self.last
+
+    def merge(self, other):
+        if other.first is not None and (self.first is None or other.first < self.first):
+            self.first = other.first
+        if other.last is not None and (self.last is None or other.last > self.last):
+            self.last = other.last
+
+
+class TopActors(Metric):
+    """
+    Selects the k most active actors from an `ActorCounts` metric with a heap.
+
+    This metric does not count anything itself, so it adds no per-event work. Ties are resolved in favour of the actor
+    seen first, matching `identify_most_active_user`.
+    """
+
+    name = "top_actors"
+    derived = True
+
+    def __init__(self, actor_counts, k=10):
+        """
+        Initializes a new instance of the TopActors class.
+
+        Args:
+            actor_counts (ActorCounts): The metric holding the per-actor counts.
+            k (int, optional): The number of actors to report. Defaults to 10.
+        """
+        self.actor_counts = actor_counts
+        self.k = k
+
+    def update(self, event):
+        pass
+
+    def result(self):
+        return heapq.nlargest(self.k, self.actor_counts.counts.items(), key=itemgetter(1))
+
+
+class DistinctCounts(Metric):
+    """
+    Reports the number of distinct values of a `FieldCounts` metric.
+
+    Exact counts are counted directly; `SketchedFieldCounts` are estimated from their HyperLogLog sketch. Like
+    `TopActors`, this metric adds no per-event work.
+    """
+
+    derived = True
+
+    def __init__(self, name, field_counts):
+        """
+        Initializes a new instance of the DistinctCounts class.
+
+        Args:
+            name (str): The key of the metric in the aggregator results.
+            field_counts (FieldCounts): The metric holding the per-value counts.
+        """
+        self.name = name
+        self.field_counts = field_counts
+
+    def update(self, event):
+        pass
+
+    def result(self):
+        distinct = getattr(self.field_counts, "distinct", None)
+        return distinct.count() if distinct is not None else len(self.field_counts.counts)
+
+
+class EventAggregator:
+    """
+    Computes every registered metric in a single pass over the events.
+
+    Attributes:
+        metrics (list): The registered metrics.
+
+    Methods:
+        register(metric):
+            Registers an additional metric.
+
+        update(event):
+            Accounts for a single event in every metric.
+
+        add(events):
+            Accounts for every event of an iterable.
+
+        accumulate(events):
+            Pipeline stage accounting for every event passing through it.
+
+        results():
+            Returns the value of every metric keyed by metric name.
+
+        merge(other):
+            Folds the metrics of an aggregator built over other events into this one.
+
+        event_statistics:
+            The event counts per type.
+
+        most_active_user:
+            The username of the most active user, or None if no event was seen.
+
+    Example Usage:
+        aggregator = EventAggregator.default(top_k=5).add(events)
+        print(aggregator.event_statistics, aggregator.results()["top_actors"])
+
+    """
+
+    def __init__(self, metrics=None):
+        """
+        Initializes a new instance of the EventAggregator class.
+
+        Args:
+            metrics (list, optional): The metrics to compute. Defaults to no metrics; see `default()`.
+        """
+        self.metrics = []
+        self._updates = []
+        for metric in metrics or ():
+            self.register(metric)
+
+    @classmethod
+    def default(cls, top_k=10, approximate=False, sketch_error=0.001, sketch_confidence=0.99, distinct_error=0.01):
+        """
+        Creates an aggregator with every built-in metric.
+
+        Args:
+            top_k (int, optional): The number of most active actors to report. Defaults to 10.
+            approximate (bool, optional): Whether to estimate the actor and repository counts with sketches in bounded
+                memory, and report the estimated number of distinct actors as "distinct_actors". Defaults to False.
+            sketch_error (float, optional): With approximate, the overcount bound of the actor and repository counts
+                as a fraction of all events. Defaults to 0.001.
+            sketch_confidence (float, optional): With approximate, the probability that a count is within the bound.
+                Defaults to 0.99.
+            distinct_error (float, optional): With approximate, the relative standard error of the distinct counts.
+                Defaults to 0.01.
+
+        Returns:
+            EventAggregator: The aggregator. Approximate aggregators only merge with aggregators built with the same
+            sketch settings.
+        """
+        if not approximate:
+            actor_counts = ActorCounts()
+            return cls([EventTypeCounts(), actor_counts, TopActors(actor_counts, top_k), RepoCounts(), TimeBounds()])
+        bounds = {"error": sketch_error, "confidence": sketch_confidence, "distinct_error": distinct_error}
+        actor_counts = SketchedActorCounts(capacity=max(100, 4 * top_k), **bounds)
+        return cls([EventTypeCounts(), actor_counts, TopActors(actor_counts, top_k),
+                    DistinctCounts("distinct_actors", actor_counts),
+                    SketchedFieldCounts("repos", "repo", "name", **bounds), TimeBounds()])
+
+    def register(self, metric):
+        """
+        Registers an additional metric.
+
+        Args:
+            metric (Metric): The metric to register.
+
+        Returns:
+            EventAggregator: The aggregator, for chaining.
+        """
+        self.metrics.append(metric)
+        if not metric.derived:
+            self._updates.append(metric.update)
+        return self
+
+    def metric(self, name):
+        """
+        Returns the registered metric with the given name.
+
+        Args:
+            name (str): The metric name.
+
+        Returns:
+            Metric: The metric, or None if no metric has that name.
+        """
+        for metric in self.metrics:
+            if metric.name == name:
+                return metric
+        return None
+
+    def update(self, event):
+        """
+        Accounts for a single event in every metric.
+
+        Args:
+            event (dict): The event to account for.
+        """
+        for update in self._updates:
+            update(event)
+
+    def add(self, events):
+        """
+        Accounts for every event of an iterable in a single pass.
+
+        Args:
+            events (iterable): The events to account for.
+
+        Returns:
+            EventAggregator: The aggregator, for chaining.
+        """
+        updates = self._updates
+        if len(updates) == 1:
+            for event in events:
+                updates[0](event)
+        else:
+            for event in events:
+                for update in updates:
+                    update(event)
+        return self
+
+    def accumulate(self, events):
+        """
+        Pipeline stage accounting for every event passing through it.
+
+        Args:
+            events (iterable): The events to account for.
+
+        Yields:
+            dict: The same events, unchanged.
+        """
+        updates = self._updates
+        for event in events:
+            for update in updates:
+                update(event)
+            yield event
+
+    def results(self):
+        """
+        Returns the value of every metric keyed by metric name.
+
+        Returns:
+            dict: The metric values.
+        """
+        return {metric.name: metric.result() for metric in self.metrics}
+
+    def merge(self, other):
+        """
+        Folds the metrics of an aggregator built over other events into this one.
+
+        Both aggregators must register the same metrics in the same order, e.g. when each worker of a pool builds its
+        partial result with the same factory. Merging is associative, so partial results can be combined in any
+        grouping; counts keep the first-seen order of `self` followed by values new to `other`.
+
+        Args:
+            other (EventAggregator): The aggregator to merge.
+
+        Returns:
+            EventAggregator: The aggregator, for chaining.
+        """
+        for metric, other_metric in zip(self.metrics, other.metrics):
+            metric.merge(other_metric)
+        return self
+
+    @property
+    def event_statistics(self):
+        metric = self.metric("event_types")
+        return metric.result() if metric is not None else {}
+
+    @property
+    def most_active_user(self):
+        metric = self.metric("top_actors")
+        if metric is None:
+            actor_counts = self.metric("actors")
+            metric = TopActors(actor_counts, 1) if actor_counts is not None else None
+        top_actors = metric.result() if metric is not None else []
+        return top_actors[0][0] if top_actors else None
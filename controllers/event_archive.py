@@ -0,0 +1,289 @@
+"""
+event_archive.py
+
+A Python module providing a persistent SQLite archive of GitHub events.
+
+This module contains the `EventArchive` class, which upserts projected events keyed by their id and syncs a
+repository incrementally, and the `ArchivedEvents` class, a lazy query over the archive. The `GitHubEventsAnalysis`
+methods accept `ArchivedEvents` in place of a list and run as indexed SQL instead of Python loops.
+
+"""
+
+import sqlite3
+
+from controllers.event_timeline import EventTimeline
+from utils.timestamps import format_timestamp, parse_timestamp
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    type TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_repo_type ON events (repo, type);
+CREATE INDEX IF NOT EXISTS events_actor ON events (actor);
+CREATE INDEX IF NOT EXISTS events_created_at ON events (created_at);
+"""
+
+
+class EventArchive:
+    """
+    A persistent SQLite archive of GitHub events.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+        connection (sqlite3.Connection): The open database connection.
+
+    Methods:
+        upsert(events):
+            Inserts or updates events keyed by id.
+
+        sync(analyzer, repo_owner, repo_name, max_pages=10):
+            Fetches new events of a repository, stopping at the first event already archived.
+
+        events(repo=None):
+            Returns a lazy query over the archived events.
+
+        close():
+            Closes the database connection.
+
+    Example Usage:
+        with EventArchive("events.db") as archive:
+            archive.sync(GitHubEventsAnalyzer(), "owner", "repo")
+            pushes = analyzer.filter_events(archive.events("owner/repo"), "PushEvent")
+            print(analyzer.calculate_event_statistics(pushes))
+
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a new instance of the EventArchive class, creating the schema if needed.
+
+        Args:
+            path (str): The path of the SQLite database.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def upsert(self, events, repo=None):
+        """
+        Inserts or updates events keyed by id.
+
+        Args:
+            events (iterable): The events in the API schema.
+            repo (str, optional): The "owner/name" to store for events without a `repo` field.
+
+        Returns:
+            int: The number of events written.
+        """
+        rows = [(int(event['id']), event['repo']['name'] if event.get('repo') else repo or "", event['type'],
+                 event['actor']['login'], parse_timestamp(event['created_at'])) for event in events]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO events (id, repo, type, actor, created_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET repo = excluded.repo, type = excluded.type, "
+                "actor = excluded.actor, created_at = excluded.created_at", rows)
+        return len(rows)
+
+    def contains(self, event_id):
+        """
+        Checks whether an event is archived.
+
+        Args:
+            event_id (str): The event id.
+
+        Returns:
+            bool: True if the event is archived.
+        """
+        return self.connection.execute("SELECT 1 FROM events WHERE id = ?", (int(event_id),)).fetchone() is not None
+
+    def sync(self, analyzer, repo_owner, repo_name, max_pages=10):
+        """
+        Fetches new events of a repository, stopping at the first event already archived.
+
+        The API returns the newest events first, so once an archived id is reached every following event is archived
+        too and no further pages are requested.
+
+        Args:
+            analyzer (GitHubEventsAnalyzer): The analyzer used to fetch events.
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            max_pages (int, optional): The maximum number of pages to fetch. Defaults to 10.
+
+        Returns:
+            int: The number of new events archived.
+        """
+        repo = f"{repo_owner}/{repo_name}" if repo_owner and repo_name else None
+        new_events = []
+        for event in analyzer.iter_events(repo_owner, repo_name, 1, max_pages, analyzer.MAX_PER_PAGE):
+            if self.contains(event['id']):
+                break
+            new_events.append(event)
+        return self.upsert(new_events, repo)
+
+    def events(self, repo=None):
+        """
+        Returns a lazy query over the archived events.
+
+        Args:
+            repo (str, optional): The "owner/name" to restrict the query to. Defaults to every repository.
+
+        Returns:
+            ArchivedEvents: The query.
+        """
+        return ArchivedEvents(self, repo)
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+
+class ArchivedEvents:
+    """
+    A lazy, composable query over an `EventArchive`.
+
+    Iterating yields the matching events in the API schema. Filtering and ordering return new queries; statistics and
+    the most active user are answered with indexed aggregate SQL.
+
+    Attributes:
+        archive (EventArchive): The queried archive.
+        repo (str): The repository restriction, or None.
+        event_type (str): The event type restriction, or None.
+        reverse (bool): Whether events are ordered from the most recent.
+
+    Methods:
+        filter(event_type):
+            Returns a query restricted to an event type.
+
+        order_by_time(reverse=False):
+            Returns a query ordered by `created_at`.
+
+        event_statistics():
+            Returns the number of events per event type.
+
+        most_active_user():
+            Returns the login of the actor with the most events.
+
+        timeline(bucket_seconds, by="type"):
+            Returns the number of events per time bucket and event type or actor.
+    """
+
+    def __init__(self, archive, repo=None, event_type=None, reverse=True):
+        self.archive = archive
+        self.repo = repo
+        self.event_type = event_type
+        self.reverse = reverse
+
+    def filter(self, event_type):
+        """
+        Returns a query restricted to an event type.
+
+        Args:
+            event_type (str): The type of events to keep.
+
+        Returns:
+            ArchivedEvents: The filtered query.
+        """
+        return ArchivedEvents(self.archive, self.repo, event_type, self.reverse)
+
+    def order_by_time(self, reverse=False):
+        """
+        Returns a query ordered by `created_at`.
+
+        Args:
+            reverse (bool, optional): Whether to order from the most recent event. Defaults to False.
+
+        Returns:
+            ArchivedEvents: The ordered query.
+        """
+        return ArchivedEvents(self.archive, self.repo, self.event_type, reverse)
+
+    def _where(self):
+        clauses, parameters = [], []
+        if self.repo is not None:
+            clauses.append("repo = ?")
+            parameters.append(self.repo)
+        if self.event_type is not None:
+            clauses.append("type = ?")
+            parameters.append(self.event_type)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+
+    def _first_seen(self):
+        """
+        Returns the SQL ordering of groups by their first occurrence in iteration order.
+        """
+        return "MAX(created_at) DESC" if self.reverse else "MIN(created_at) ASC"
+
+    def __iter__(self):
+        where, parameters = self._where()
+        direction = "DESC" if self.reverse else "ASC"
+        cursor = self.archive.connection.execute(
+            f"SELECT id, repo, type, actor, created_at FROM events{where} "
+            f"ORDER BY created_at {direction}, id {direction}", parameters)
+        for event_id, repo, event_type, actor, created_at in cursor:
+            yield {'id': str(event_id), 'type': event_type, 'actor': {'login': actor},
+                   'created_at': format_timestamp(created_at), 'repo': {'name': repo}}
+
+    def __len__(self):
+        where, parameters = self._where()
+        return self.archive.connection.execute(f"SELECT COUNT(*) FROM events{where}", parameters).fetchone()[0]
+
+    def event_statistics(self):
+        """
+        Returns the number of events per event type, ordered by the first occurrence of each type when iterating.
+
+        Returns:
+            dict: The event counts keyed by event type.
+        """
+        where, parameters = self._where()
+        rows = self.archive.connection.execute(
+            f"SELECT type, COUNT(*) FROM events{where} GROUP BY type ORDER BY {self._first_seen()}", parameters)
+        return dict(rows)
+
+    def most_active_user(self):
+        """
+        Returns the login of the actor with the most events. Ties go to the actor seen first when iterating.
+
+        Returns:
+            str: The login, or None if the query matches no events.
+        """
+        where, parameters = self._where()
+        row = self.archive.connection.execute(
+            f"SELECT actor FROM events{where} GROUP BY actor ORDER BY COUNT(*) DESC, {self._first_seen()} LIMIT 1",
+            parameters).fetchone()
+        return row[0] if row else None
+
+    def timeline(self, bucket_seconds, by="type"):
+        """
+        Returns the number of events per time bucket and event type or actor, counted with a SQL aggregate.
+
+        Args:
+            bucket_seconds (int): The bucket width in seconds.
+            by (str, optional): "type" or "actor". Defaults to "type".
+
+        Returns:
+            EventTimeline: The timeline. Keys are ordered by their first occurrence when iterating.
+        """
+        column = "actor" if by == "actor" else "type"
+        where, parameters = self._where()
+        connection = self.archive.connection
+        keys = [key for key, in connection.execute(
+            f"SELECT {column} FROM events{where} GROUP BY {column} ORDER BY {self._first_seen()}", parameters)]
+        codes = {key: code for code, key in enumerate(keys)}
+        rows = connection.execute(
+            f"SELECT created_at / ? AS bucket, {column}, COUNT(*) FROM events{where} GROUP BY bucket, {column}",
+            [bucket_seconds, *parameters])
+        cells = sorted((bucket * bucket_seconds, codes[key], count) for bucket, key, count in rows)
+        return EventTimeline(bucket_seconds, by, keys, cells)
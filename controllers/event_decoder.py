@@ -0,0 +1,141 @@
+"""
+event_decoder.py
+
+A Python module providing field-projecting JSON decoding of event pages.
+
+An events page is a JSON array of up to 100 events, and most of its bytes are payloads, URLs and avatars that the
+analysis never reads. This module contains the `ProjectingEventDecoder` class, which decodes a page into events
+holding only a projection of their fields, so the full events are never kept beyond the decoding of a single page.
+
+Pages are decoded whole, with `orjson` when it is installed or `json.loads` otherwise, and then projected. For
+memory-bound runs, the streaming mode decodes the array one element at a time with the standard library decoder and
+projects each event as soon as it is complete, so only one full event is alive at a time instead of the whole decoded
+page. It keeps less in memory but costs about twice the CPU of `json.loads`, so it is opt-in.
+
+"""
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from controllers.event_pipeline import DEFAULT_PROJECTION, project_event
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+WHITESPACE_CHARACTERS = frozenset(" \t\n\r")
+
+
+def iter_json_array(text, index=0):
+    """
+    Yields the elements of a JSON array one at a time.
+
+    Args:
+        text (str): The JSON document.
+        index (int, optional): The position of the opening bracket. Defaults to 0.
+
+    Yields:
+        object: The decoded elements, in order.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed JSON array.
+    """
+    skip = WHITESPACE.match
+    scan_once = json.JSONDecoder().scan_once
+    if text[index:index + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, index)
+    index = skip(text, index + 1).end()
+    if text[index:index + 1] == "]":
+        index += 1
+    else:
+        while True:
+            try:
+                element, index = scan_once(text, index)
+            except StopIteration as error:
+                raise json.JSONDecodeError("Expecting value", text, error.value) from None
+            yield element
+            delimiter = text[index:index + 1]
+            if delimiter in WHITESPACE_CHARACTERS:
+                index = skip(text, index).end()
+                delimiter = text[index:index + 1]
+            index += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, index - 1)
+            if text[index:index + 1] in WHITESPACE_CHARACTERS:
+                index = skip(text, index).end()
+    index = skip(text, index).end()
+    if index != len(text):
+        raise json.JSONDecodeError("Extra data", text, index)
+
+
+class ProjectingEventDecoder:
+    """
+    Decodes JSON event pages into projected events.
+
+    Documents that are not arrays, such as error objects, are decoded unchanged.
+
+    Attributes:
+        fields (tuple): The dotted field paths kept of every event.
+        cache_key (str): Distinguishes responses decoded with this projection in a `ResponseCache`.
+        streaming (bool): Whether pages are decoded one event at a time to keep less in memory.
+
+    Methods:
+        decode(content):
+            Decodes a response body, projecting every event of a page.
+            Args:
+                content (bytes): The response body.
+            Returns:
+                list: The projected events.
+
+    Example Usage:
+        analyzer = GitHubEventsAnalyzer()
+        analyzer.event_decoder = ProjectingEventDecoder(("type", "actor.login", "created_at"))
+        events = analyzer.fetch_events("owner", "repo")
+
+    """
+
+    def __init__(self, fields=DEFAULT_PROJECTION, use_orjson=True, streaming=False):
+        """
+        Initializes a new instance of the ProjectingEventDecoder class.
+
+        Args:
+            fields (tuple, optional): The dotted field paths to keep. Defaults to `DEFAULT_PROJECTION`.
+            use_orjson (bool, optional): Whether to decode with `orjson` when it is installed. Defaults to True.
+            streaming (bool, optional): Whether to decode pages one event at a time with the standard library, keeping
+                only one full event in memory at the cost of more CPU. Defaults to False.
+        """
+        self.fields = tuple(fields)
+        self.cache_key = "fields=" + ",".join(self.fields)
+        self.streaming = streaming
+        self._paths = [field.split('.') for field in self.fields]
+        self._loads = orjson.loads if use_orjson and orjson is not None else json.loads
+
+    def decode(self, content):
+        """
+        Decodes a response body, projecting every event of a page.
+
+        Args:
+            content (bytes): The response body.
+
+        Returns:
+            list: The projected events, or the decoded document if it is not an array.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        paths = self._paths
+        if not self.streaming:
+            document = self._loads(content)
+            if not isinstance(document, list):
+                return document
+            return [project_event(event, paths) for event in document]
+
+        text = content.decode("utf-8") if isinstance(content, (bytes, bytearray)) else content
+        start = WHITESPACE.match(text).end()
+        if text[start:start + 1] != "[":
+            return json.loads(text)
+        return [project_event(event, paths) for event in iter_json_array(text, start)]
@@ -0,0 +1,297 @@
+"""
+event_index.py
+
+A Python module providing in-memory indexes over fetched GitHub events for interactive queries.
+
+Re-running the analyzer with other filters refetched and rescanned every event. This module contains the `EventIndex`
+class, which stores events once in an `EventStore` and keeps a time-sorted order of its rows together with per-type and
+per-actor lists of positions in that order. Filtering by type, actor and time range then takes a binary search and a
+slice, so a query costs time proportional to the events it returns rather than to the events held; statistics and
+rankings are kept up to date or cached between refreshes.
+
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+from controllers.event_pipeline import order_stage
+from controllers.event_store import EventStore
+
+
+class EventIndex:
+    """
+    Indexes events by time, type and actor.
+
+    Positions ("ranks") refer to the time-sorted order of the stored rows. Each type and actor keeps the ascending
+    ranks of its events, so the events of a type within a time range are a contiguous slice of its list, found by
+    binary search. Events newer than every indexed event, as fetched by `refresh`, are appended without reindexing.
+
+    Attributes:
+        store (EventStore): The indexed events.
+
+    Methods:
+        add(events):
+            Indexes new events, skipping the ids already indexed.
+
+        refresh(analyzer, repo_owner, repo_name, max_pages=10):
+            Fetches and indexes the events newer than every indexed one.
+
+        events(event_type=None, actor=None, since=None, until=None, reverse=False, limit=None):
+            Returns the matching events ordered by time.
+
+        count(event_type=None, actor=None, since=None, until=None):
+            Returns the number of matching events.
+
+        statistics(actor=None):
+            Returns the number of events per type.
+
+        top_actors(k=10, event_type=None):
+            Returns the k most active actors.
+
+    Example Usage:
+        index = EventIndex()
+        index.add(analyzer.iter_events("owner", "repo", max_pages=10))
+        print(index.events("PushEvent", since=parse_timestamp("2023-06-14T00:00:00Z"), limit=20))
+        print(index.top_actors(5, "IssuesEvent"))
+
+    """
+
+    def __init__(self, store=None):
+        """
+        Initializes a new instance of the EventIndex class.
+
+        Args:
+            store (EventStore, optional): Events to index. Defaults to an empty store.
+        """
+        self.store = store if store is not None else EventStore()
+        self._ids = set()
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._order)
+
+    def _rebuild(self):
+        columns = self.store.columns
+        created_at = columns["created_at"]
+        self._order = sorted(range(len(self.store)), key=created_at.__getitem__)
+        self._times = [created_at[row] for row in self._order]
+        self._by_type = {}
+        self._by_actor = {}
+        self._ids = set(columns["ids"])
+        self._index_ranks(range(len(self._order)))
+
+    def _index_ranks(self, ranks):
+        columns, order = self.store.columns, self._order
+        types, actors = columns["types"], columns["actors"]
+        by_type, by_actor = self._by_type, self._by_actor
+        for rank in ranks:
+            row = order[rank]
+            type_ranks = by_type.get(types[row])
+            if type_ranks is None:
+                type_ranks = by_type[types[row]] = []
+            type_ranks.append(rank)
+            actor_ranks = by_actor.get(actors[row])
+            if actor_ranks is None:
+                actor_ranks = by_actor[actors[row]] = []
+            actor_ranks.append(rank)
+        self._rankings = {}
+
+    def add(self, events):
+        """
+        Indexes new events, skipping the ids already indexed.
+
+        New events that are all at least as recent as the indexed ones are appended to the indexes; older events cause
+        a rebuild.
+
+        Args:
+            events (iterable): The events in the API schema.
+
+        Returns:
+            int: The number of events added.
+        """
+        ids = self._ids
+        new_events = []
+        for event in events:
+            event_id = int(event.get('id') or 0)
+            if event_id and event_id in ids:
+                continue
+            ids.add(event_id)
+            new_events.append(event)
+        if not new_events:
+            return 0
+
+        store = self.store
+        first_row = len(store)
+        store.extend(order_stage(new_events))
+        created_at = store.columns["created_at"]
+        if self._times and created_at[first_row] < self._times[-1]:
+            self._rebuild()
+            return len(new_events)
+        first_rank = len(self._order)
+        self._order.extend(range(first_row, len(store)))
+        self._times.extend(created_at[first_row:])
+        self._index_ranks(range(first_rank, len(self._order)))
+        return len(new_events)
+
+    def refresh(self, analyzer, repo_owner, repo_name, max_pages=10):
+        """
+        Fetches the events newer than every indexed one and indexes them.
+
+        The API returns the newest events first, so fetching stops at the first event already indexed and no further
+        pages are requested.
+
+        Args:
+            analyzer (GitHubEventsAnalyzer): The analyzer used to fetch events.
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            max_pages (int, optional): The maximum number of pages to fetch. Defaults to 10.
+
+        Returns:
+            int: The number of new events indexed.
+        """
+        ids = self._ids
+        new_events = []
+        for event in analyzer.iter_events(repo_owner, repo_name, 1, max_pages, analyzer.MAX_PER_PAGE):
+            if int(event.get('id') or 0) in ids:
+                break
+            new_events.append(event)
+        return self.add(new_events)
+
+    def _bounds(self, since=None, until=None):
+        times = self._times
+        start = bisect_left(times, since) if since is not None else 0
+        stop = bisect_left(times, until) if until is not None else len(times)
+        return start, stop
+
+    def _matches(self, event_type=None, actor=None, since=None, until=None):
+        """
+        Returns the ranks of the matching events, ascending, and a predicate the ranks must additionally pass.
+        """
+        start, stop = self._bounds(since, until)
+        columns = self.store.columns
+        filters = []
+        for value, table, index, column in ((event_type, self.store.type_table, self._by_type, columns["types"]),
+                                            (actor, self.store.actor_table, self._by_actor, columns["actors"])):
+            if value is not None:
+                code = table.lookup(value)
+                filters.append((index.get(code, ()), code, column))
+        if not filters:
+            return range(start, stop), None
+
+        # With both filters, the shorter list is sliced and the other attribute checked on each of its events.
+        filters.sort(key=lambda item: len(item[0]))
+        ranks = filters[0][0]
+        matches = _Slice(ranks, bisect_left(ranks, start), bisect_left(ranks, stop))
+        if len(filters) == 1:
+            return matches, None
+        _, code, column = filters[1]
+        order = self._order
+        return matches, lambda rank: column[order[rank]] == code
+
+    def events(self, event_type=None, actor=None, since=None, until=None, reverse=False, limit=None):
+        """
+        Returns the matching events ordered by time.
+
+        Args:
+            event_type (str, optional): The type of events to return.
+            actor (str, optional): The login of the actor whose events to return.
+            since (int, optional): The earliest `created_at` to return, in epoch seconds, inclusive.
+            until (int, optional): The latest `created_at` to return, in epoch seconds, exclusive.
+            reverse (bool, optional): Whether to order from the most recent event. Defaults to False.
+            limit (int, optional): The maximum number of events to return, from the start of the order.
+
+        Returns:
+            list: The events in the API schema.
+        """
+        ranks, predicate = self._matches(event_type, actor, since, until)
+        ranks = reversed(ranks) if reverse else iter(ranks)
+        if predicate is not None:
+            ranks = filter(predicate, ranks)
+        order, event_at = self._order, self.store.event_at
+        return [event_at(order[rank]) for rank in islice(ranks, limit)]
+
+    def count(self, event_type=None, actor=None, since=None, until=None):
+        """
+        Returns the number of matching events. Without both filters, this takes two binary searches.
+
+        Args:
+            event_type (str, optional): The type of events to count.
+            actor (str, optional): The login of the actor whose events to count.
+            since (int, optional): The earliest `created_at` to count, in epoch seconds, inclusive.
+            until (int, optional): The latest `created_at` to count, in epoch seconds, exclusive.
+
+        Returns:
+            int: The number of events.
+        """
+        ranks, predicate = self._matches(event_type, actor, since, until)
+        if predicate is None:
+            return len(ranks)
+        return sum(map(predicate, ranks))
+
+    def statistics(self, actor=None):
+        """
+        Returns the number of events per type, in first-seen order, like `calculate_event_statistics`.
+
+        Args:
+            actor (str, optional): The login of the actor whose events to count. Defaults to every event.
+
+        Returns:
+            dict: The event counts keyed by event type.
+        """
+        types = self.store.type_table.values
+        if actor is None:
+            return {types[code]: len(self._by_type[code]) for code in sorted(self._by_type)}
+        code = self.store.actor_table.lookup(actor)
+        column, order = self.store.columns["types"], self._order
+        counts = Counter(column[order[rank]] for rank in self._by_actor.get(code, ()))
+        return {types[code]: counts[code] for code in sorted(counts)}
+
+    def top_actors(self, k=10, event_type=None):
+        """
+        Returns the k most active actors. Ties go to the actor seen first, like `identify_most_active_user`.
+
+        The ranking is computed once per type between refreshes, so repeated queries only take the k first entries.
+
+        Args:
+            k (int, optional): The number of actors to return. Defaults to 10.
+            event_type (str, optional): The type of events to rank actors by. Defaults to every event.
+
+        Returns:
+            list: (login, count) tuples, most active first.
+        """
+        ranking = self._rankings.get(event_type)
+        if ranking is None:
+            if event_type is None:
+                counts = {code: len(ranks) for code, ranks in self._by_actor.items()}
+            else:
+                code = self.store.type_table.lookup(event_type)
+                column, order = self.store.columns["actors"], self._order
+                counts = Counter(column[order[rank]] for rank in self._by_type.get(code, ()))
+            logins = self.store.actor_table.values
+            ranked = sorted(sorted(counts.items()), key=itemgetter(1), reverse=True)
+            ranking = self._rankings[event_type] = [(logins[code], count) for code, count in ranked]
+        return ranking[:k]
+
+
+class _Slice:
+    """
+    A lazy view of `values[start:stop]` that supports `len` and `reversed` without copying.
+    """
+
+    def __init__(self, values, start, stop):
+        self.values = values
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        values = self.values
+        return (values[position] for position in range(self.start, self.stop))
+
+    def __reversed__(self):
+        values = self.values
+        return (values[position] for position in range(self.stop - 1, self.start - 1, -1))
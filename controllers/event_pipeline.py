@@ -0,0 +1,187 @@
+"""
+event_pipeline.py
+
+A Python module providing composable, generator based stages for processing GitHub events.
+
+Stages take an iterable of events and return a generator, so a pipeline such as
+
+    events = analyzer.iter_events("owner", "repo", max_pages=10)
+    events = filter_stage(events, "PushEvent")
+    events = project_stage(events)
+    events = aggregator.accumulate(events)
+    analyzer.display_events(events)
+
+handles one event at a time and its memory use does not grow with the number of pages or sources streamed through
+it. Sources can be combined with `itertools.chain`, and statistics are accumulated on the way through with
+`EventAggregator.accumulate`.
+
+Ordering needs every event before the first one can be yielded. `order_stage` computes the sort key of each event
+once, passes input that is already ordered through after a linear check and reverses input in the opposite order,
+`merge_stage` k-way merges runs that are each ordered, such as separately fetched pages, holding only the head of
+every run, and `latest_stage` keeps only the N most recent events on a bounded heap. All three order ties like
+`sorted`.
+
+"""
+
+import heapq
+from itertools import groupby, islice
+from operator import ge, le
+
+DEFAULT_PROJECTION = ("id", "type", "actor.login", "created_at", "repo.name")
+
+
+def filter_stage(events, event_type):
+    """
+    Yields the events of the specified type.
+
+    Args:
+        events (iterable): The events to filter.
+        event_type (str): The type of events to keep.
+
+    Yields:
+        dict: The matching events.
+    """
+    for event in events:
+        if event['type'] == event_type:
+            yield event
+
+
+def project_stage(events, fields=DEFAULT_PROJECTION):
+    """
+    Yields copies of the events holding only the given fields, dropping payloads, URLs and avatars.
+
+    Nested fields are written with dots (e.g. "actor.login") and keep their nesting in the projected event, so the
+    analysis methods read projected and raw events alike.
+
+    Args:
+        events (iterable): The events to project.
+        fields (tuple): The dotted field paths to keep.
+
+    Yields:
+        dict: The projected events.
+    """
+    paths = [field.split('.') for field in fields]
+    for event in events:
+        yield project_event(event, paths)
+
+
+def project_event(event, paths):
+    """
+    Copies the given field paths of a single event.
+
+    Args:
+        event (dict): The event to project.
+        paths (list): The field paths, each a list of keys.
+
+    Returns:
+        dict: The projected event. Missing fields are left out.
+    """
+    projected = {}
+    for path in paths:
+        source = event
+        for key in path:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            target = projected
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = source
+    return projected
+
+
+def event_time(event):
+    """
+    Returns the sort key of an event, its `created_at`.
+
+    GitHub timestamps are fixed-width UTC strings ("2023-06-14T10:30:00Z"), which order exactly like the instants they
+    denote, so the key is computed once per event without parsing and compared as is.
+
+    Args:
+        event (dict): The event.
+
+    Returns:
+        str: The sort key.
+    """
+    return event['created_at']
+
+
+def order_stage(events, reverse=False):
+    """
+    Yields the events ordered by `created_at`, like `sorted` but without sorting input that is already ordered.
+
+    The whole input is read before the first event is yielded. Input already in the requested order is passed
+    through after a single linear check. Input in the opposite order, such as API pages when chronological output is
+    requested, is reversed in linear time, keeping events with equal timestamps in input order. Anything else is
+    sorted on the keys computed for those checks.
+
+    Args:
+        events (iterable): The events to order.
+        reverse (bool, optional): Whether to order from the most recent event. Defaults to False.
+
+    Yields:
+        dict: The ordered events.
+    """
+    events = list(events)
+    keys = [event_time(event) for event in events]
+    if is_ordered(keys, reverse):
+        yield from events
+    elif is_ordered(keys, not reverse):
+        for _, ties in groupby(reversed(range(len(events))), key=keys.__getitem__):
+            for position in reversed(list(ties)):
+                yield events[position]
+    else:
+        for position in sorted(range(len(events)), key=keys.__getitem__, reverse=reverse):
+            yield events[position]
+
+
+def merge_stage(*runs, reverse=False):
+    """
+    Merges runs of events that are each already ordered by `created_at` into a single ordered stream.
+
+    Only the next event of every run is held, so runs are consumed as the merge reaches them. Ties are yielded in run
+    order.
+
+    Args:
+        *runs (iterable): The ordered runs of events, e.g. the ordered pages of a multi-page fetch.
+        reverse (bool, optional): Whether the runs, and the output, go from the most recent event. Defaults to False.
+
+    Yields:
+        dict: The merged events.
+    """
+    yield from heapq.merge(*runs, key=event_time, reverse=reverse)
+
+
+def latest_stage(events, count, reverse=True):
+    """
+    Yields the `count` most recent events, keeping no more than `count` events in memory.
+
+    Args:
+        events (iterable): The events to select from.
+        count (int): The number of events to keep.
+        reverse (bool, optional): Whether to yield from the most recent event. Defaults to True.
+
+    Yields:
+        dict: The most recent events, ordered by `created_at`.
+    """
+    latest = heapq.nlargest(count, events, key=event_time)
+    if reverse:
+        yield from latest
+    else:
+        yield from sorted(latest, key=event_time)
+
+
+def is_ordered(keys, reverse=False):
+    """
+    Checks whether keys are in ascending (or, with reverse, descending) order, allowing ties.
+
+    Args:
+        keys (list): The keys.
+        reverse (bool, optional): Whether to check for descending order. Defaults to False.
+
+    Returns:
+        bool: True if the keys are ordered.
+    """
+    return all(map(ge if reverse else le, keys, islice(keys, 1, None)))
+
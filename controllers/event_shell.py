@@ -0,0 +1,198 @@
+"""
+event_shell.py
+
+A Python module providing an interactive shell for querying fetched GitHub events.
+
+This module contains the `EventShell` class, a `cmd.Cmd` shell answering filter, sort, statistics and top-user
+queries from an `EventIndex`, so events are fetched once and explored without another request per question. The
+`refresh` command fetches only the events newer than the indexed ones.
+
+"""
+
+import cmd
+import re
+import shlex
+import time
+from datetime import datetime
+
+from controllers.output_writers import TextEventWriter
+from utils.custom_exception import GitHubAPIException, InvalidInputException
+from utils.timestamps import parse_timestamp
+
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}Z)?")
+SORT_ORDERS = ("chronological", "reverse-chronological")
+
+
+def parse_query(line, keys):
+    """
+    Parses the `key=value` arguments of a shell command.
+
+    Args:
+        line (str): The arguments, e.g. "type=PushEvent since=2023-06-14".
+        keys (tuple): The keys the command accepts.
+
+    Returns:
+        dict: The values keyed by key, with `since` and `until` converted to epoch seconds and `limit` to an int.
+
+    Raises:
+        InvalidInputException: If an argument is malformed, unknown or has an invalid value.
+    """
+    try:
+        tokens = shlex.split(line)
+    except ValueError as error:
+        raise InvalidInputException(f"Invalid arguments: {error}") from error
+    query = {}
+    for token in tokens:
+        key, separator, value = token.partition("=")
+        if not separator or key not in keys:
+            raise InvalidInputException(f"Invalid argument {token!r}: expected one of "
+                                        f"{', '.join(key + '=...' for key in keys)}")
+        if key in ("since", "until"):
+            if not TIMESTAMP_PATTERN.fullmatch(value):
+                raise InvalidInputException(f"Invalid {key} {value!r}: expected YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ")
+            timestamp = value if len(value) > 10 else f"{value}T00:00:00Z"
+            try:
+                # The fast parser assumes a valid date, so out-of-range fields are rejected here first.
+                datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
+            except ValueError as error:
+                raise InvalidInputException(f"Invalid {key} {value!r}: no such date or time") from error
+            value = parse_timestamp(timestamp)
+        elif key == "limit":
+            if not value.isdigit():
+                raise InvalidInputException(f"Invalid limit {value!r}: expected a non-negative integer")
+            value = int(value)
+        elif key == "sort" and value not in SORT_ORDERS:
+            raise InvalidInputException(f"Invalid sort {value!r}: expected one of {', '.join(SORT_ORDERS)}")
+        query[key] = value
+    return query
+
+
+class EventShell(cmd.Cmd):
+    """
+    An interactive shell querying an `EventIndex`.
+
+    Queries are answered from the index without fetching; `refresh` fetches the new events. Invalid arguments and API
+    errors are reported without leaving the shell.
+
+    Attributes:
+        index (EventIndex): The indexed events.
+        refresh (callable): Fetches and indexes new events, returning their number (optional).
+
+    Methods:
+        do_events(line):
+            Displays the events matching `type=`, `actor=`, `since=` and `until=`, ordered by `sort=`, up to `limit=`.
+
+        do_count(line):
+            Displays the number of matching events.
+
+        do_stats(line):
+            Displays the event statistics and the most active user, of every event or of `actor=`.
+
+        do_top(line):
+            Displays the N most active users, of every event or of `type=`.
+
+        do_refresh(line):
+            Fetches and indexes the events newer than the indexed ones.
+
+        do_quit(line) / do_exit(line) / do_EOF(line):
+            Leaves the shell.
+
+    Example Usage:
+        EventShell(index, lambda: index.refresh(analyzer, "owner", "repo")).cmdloop()
+
+    """
+
+    intro = "Type help for the list of commands."
+    prompt = "events> "
+
+    def __init__(self, index, refresh=None, stdin=None, stdout=None):
+        """
+        Initializes a new instance of the EventShell class.
+
+        Args:
+            index (EventIndex): The indexed events.
+            refresh (callable, optional): Fetches and indexes new events, returning their number. Defaults to None,
+                which disables the refresh command.
+            stdin (file, optional): The stream commands are read from. Defaults to `sys.stdin`.
+            stdout (file, optional): The stream results are written to. Defaults to `sys.stdout`.
+        """
+        super().__init__(stdin=stdin, stdout=stdout)
+        if stdin is not None:
+            self.use_rawinput = False
+        self.index = index
+        self.refresh = refresh
+
+    def onecmd(self, line):
+        try:
+            return super().onecmd(line)
+        except (InvalidInputException, GitHubAPIException) as error:
+            self.stdout.write(f"Error: {error.message}\n")
+            return False
+
+    def emptyline(self):
+        return False
+
+    def _report(self, count, started):
+        self.stdout.write(f"({count} events in {(time.perf_counter() - started) * 1000:.2f} ms)\n")
+
+    def do_events(self, line):
+        """events [type=T] [actor=A] [since=DATE] [until=DATE] [sort=chronological|reverse-chronological] [limit=N]
+        Displays the matching events. `since` is inclusive and `until` exclusive."""
+        query = parse_query(line, ("type", "actor", "since", "until", "sort", "limit"))
+        started = time.perf_counter()
+        events = self.index.events(query.get("type"), query.get("actor"), query.get("since"), query.get("until"),
+                                   query.get("sort") == "reverse-chronological", query.get("limit"))
+        TextEventWriter(self.stdout).write_events(events)
+        self._report(len(events), started)
+
+    def do_count(self, line):
+        """count [type=T] [actor=A] [since=DATE] [until=DATE]
+        Displays the number of matching events."""
+        query = parse_query(line, ("type", "actor", "since", "until"))
+        started = time.perf_counter()
+        count = self.index.count(query.get("type"), query.get("actor"), query.get("since"), query.get("until"))
+        self._report(count, started)
+
+    def do_stats(self, line):
+        """stats [actor=A]
+        Displays the event statistics and the most active user, or the event statistics of an actor."""
+        actor = parse_query(line, ("actor",)).get("actor")
+        if actor is None:
+            top = self.index.top_actors(1)
+            TextEventWriter(self.stdout).write_summary(self.index.statistics(), top[0][0] if top else None)
+            return
+        lines = [f"Event Statistics of {actor}:"]
+        lines.extend(f"{event_type}: {count}" for event_type, count in self.index.statistics(actor).items())
+        self.stdout.write("\n".join(lines) + "\n")
+
+    def do_top(self, line):
+        """top [N] [type=T]
+        Displays the N (default 10) most active users."""
+        count, _, rest = line.strip().partition(" ")
+        if count.isdigit():
+            line = rest
+        elif "=" in count or not count:
+            count = "10"
+        else:
+            raise InvalidInputException(f"Invalid number of users {count!r}")
+        event_type = parse_query(line, ("type",)).get("type")
+        for rank, (login, events) in enumerate(self.index.top_actors(int(count), event_type), 1):
+            self.stdout.write(f"{rank}. {login}: {events}\n")
+
+    def do_refresh(self, line):
+        """refresh
+        Fetches and indexes the events newer than the indexed ones."""
+        if self.refresh is None:
+            raise InvalidInputException("This shell cannot refresh its events.")
+        self.stdout.write(f"Indexed {self.refresh()} new events ({len(self.index)} in total)\n")
+
+    def do_quit(self, line):
+        """quit
+        Leaves the shell."""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, line):
+        self.stdout.write("\n")
+        return True
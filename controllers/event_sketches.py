@@ -0,0 +1,290 @@
+"""
+event_sketches.py
+
+A Python module providing mergeable probabilistic sketches for counting in bounded memory.
+
+Exact per-actor counts keep one dictionary entry for every distinct actor, which over GH Archive-scale streams with
+millions of actors outgrows a worker's memory. This module contains the `HyperLogLog` class, which estimates the number
+of distinct values, and the `CountMinSketch` class, which estimates the number of occurrences of each value. Both use a
+fixed amount of memory chosen from the error bound they are configured with, and both are mergeable: sketches built by
+separate workers over separate shards, with the same configuration, merge into the sketch of the whole stream.
+
+Values are hashed with `sketch_hash`, a 64-bit BLAKE2b digest. Unlike the built-in `hash`, it is the same in every
+process, which merging sketches across worker processes relies on.
+
+"""
+
+import math
+from array import array
+from hashlib import blake2b
+
+HASH_BITS = 64
+
+
+def sketch_hash(value):
+    """
+    Hashes a string to a 64-bit integer, identically in every process.
+
+    Args:
+        value (str): The value to hash.
+
+    Returns:
+        int: The hash.
+    """
+    return int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct values in a stream with HyperLogLog.
+
+    The hash of each value selects one of 2**precision registers, which keeps the longest run of leading zero bits seen
+    in the rest of the hash. The relative standard error of the estimate is about 1.04 / sqrt(2**precision); small
+    cardinalities are counted with linear counting over the empty registers, which is nearly exact.
+
+    Attributes:
+        precision (int): The number of hash bits selecting a register.
+        registers (bytearray): The longest run of leading zeros plus one seen by every register.
+
+    Methods:
+        add(value):
+            Accounts for one occurrence of a value.
+
+        add_hash(hashed):
+            Accounts for one occurrence of a value hashed with `sketch_hash`.
+
+        count():
+            Returns the estimated number of distinct values.
+
+        merge(other):
+            Folds a sketch with the same precision, built over other values, into this one.
+
+    Example Usage:
+        distinct = HyperLogLog(error=0.01)
+        for event in events:
+            distinct.add(event["actor"]["login"])
+        print(distinct.count())
+
+    """
+
+    def __init__(self, error=0.01, precision=None):
+        """
+        Initializes a new instance of the HyperLogLog class.
+
+        Args:
+            error (float, optional): The relative standard error to size the sketch for. Defaults to 0.01, which uses
+                16 KiB.
+            precision (int, optional): The number of register bits, between 4 and 18. Overrides error.
+        """
+        if precision is None:
+            precision = math.ceil(math.log2((1.04 / error) ** 2))
+        self.precision = min(max(precision, 4), 18)
+        self.registers = bytearray(1 << self.precision)
+
+    @property
+    def error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value):
+        """
+        Accounts for one occurrence of a value.
+
+        Args:
+            value (str): The value.
+        """
+        self.add_hash(sketch_hash(value))
+
+    def add_hash(self, hashed):
+        """
+        Accounts for one occurrence of a value hashed with `sketch_hash`.
+
+        Args:
+            hashed (int): The 64-bit hash of the value.
+        """
+        bits = HASH_BITS - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        """
+        Returns the estimated number of distinct values.
+
+        Returns:
+            int: The estimate.
+        """
+        registers = self.registers
+        size = len(registers)
+        # Few distinct ranks occur, so the harmonic sum is taken over rank frequencies instead of every register.
+        harmonic = sum(registers.count(rank) * 2.0 ** -rank for rank in set(registers))
+        estimate = 0.7213 / (1 + 1.079 / size) * size * size / harmonic
+        empty = registers.count(0)
+        if estimate <= 2.5 * size and empty:
+            estimate = size * math.log(size / empty)
+        return round(estimate)
+
+    def merge(self, other):
+        """
+        Folds a sketch with the same precision, built over other values, into this one.
+
+        Args:
+            other (HyperLogLog): The sketch to merge.
+
+        Raises:
+            ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog sketches of precision {self.precision} and {other.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class CountMinSketch:
+    """
+    Estimates the number of occurrences of every value in a stream with a Count-Min sketch.
+
+    Every value increments one counter in each of `depth` rows of `width` counters, and its estimate is the smallest of
+    them. Estimates never undercount; with a width of e / error and a depth of ln(1 / (1 - confidence)), each one
+    overcounts by at most error * total with the given confidence. The row indexes of a value are derived from the two
+    halves of its 64-bit hash.
+
+    Attributes:
+        width (int): The number of counters per row.
+        depth (int): The number of rows.
+        total (int): The number of occurrences counted.
+        counters (array): The rows of counters, one after another.
+
+    Methods:
+        add(value, count=1):
+            Counts occurrences of a value and returns its new estimate.
+
+        add_hash(hashed, count=1):
+            Counts occurrences of a value hashed with `sketch_hash` and returns its new estimate.
+
+        cells(hashed):
+            Returns the positions of the counters of a value hashed with `sketch_hash`.
+
+        add_cells(cells, count=1):
+            Counts occurrences of a value given the positions of its counters and returns its new estimate.
+
+        estimate(value):
+            Returns the estimated number of occurrences of a value.
+
+        merge(other):
+            Folds a sketch of the same dimensions, built over other values, into this one.
+
+    Example Usage:
+        sketch = CountMinSketch(error=0.001, confidence=0.99)
+        for event in events:
+            sketch.add(event["actor"]["login"])
+        print(sketch.estimate("octocat"), sketch.error_bound)
+
+    """
+
+    def __init__(self, error=0.001, confidence=0.99):
+        """
+        Initializes a new instance of the CountMinSketch class.
+
+        Args:
+            error (float, optional): The overcount bound as a fraction of the total. Defaults to 0.001, which together
+                with the default confidence uses about 106 KiB.
+            confidence (float, optional): The probability that an estimate is within the bound. Defaults to 0.99.
+        """
+        self.width = math.ceil(math.e / error)
+        self.depth = max(1, math.ceil(math.log(1 / (1 - confidence))))
+        self.total = 0
+        self.counters = array("q", bytes(8 * self.width * self.depth))
+
+    @property
+    def error_bound(self):
+        """
+        The maximum overcount of an estimate with the configured confidence.
+        """
+        return math.ceil(math.e / self.width * self.total)
+
+    def cells(self, hashed):
+        """
+        Returns the positions of the counters of a value, one per row, in `counters`.
+
+        Callers counting the same values repeatedly can keep the positions and use `add_cells`, skipping the hashing.
+
+        Args:
+            hashed (int): The 64-bit hash of the value.
+
+        Returns:
+            tuple: The positions.
+        """
+        width = self.width
+        low, high = hashed & 0xFFFFFFFF, hashed >> 32
+        return tuple(row * width + (low + row * high) % width for row in range(self.depth))
+
+    def add(self, value, count=1):
+        """
+        Counts occurrences of a value and returns its new estimate.
+
+        Args:
+            value (str): The value.
+            count (int, optional): The number of occurrences. Defaults to 1.
+
+        Returns:
+            int: The new estimate of the value.
+        """
+        return self.add_hash(sketch_hash(value), count)
+
+    def add_hash(self, hashed, count=1):
+        """
+        Counts occurrences of a value hashed with `sketch_hash` and returns its new estimate.
+
+        Args:
+            hashed (int): The 64-bit hash of the value.
+            count (int, optional): The number of occurrences. Defaults to 1.
+
+        Returns:
+            int: The new estimate of the value.
+        """
+        return self.add_cells(self.cells(hashed), count)
+
+    def add_cells(self, cells, count=1):
+        """
+        Counts occurrences of a value given the positions of its counters and returns its new estimate.
+
+        Args:
+            cells (tuple): The positions returned by `cells` for the value.
+            count (int, optional): The number of occurrences. Defaults to 1.
+
+        Returns:
+            int: The new estimate of the value.
+        """
+        counters = self.counters
+        self.total += count
+        for cell in cells:
+            counters[cell] += count
+        return min(map(counters.__getitem__, cells))
+
+    def estimate(self, value):
+        """
+        Returns the estimated number of occurrences of a value.
+
+        Args:
+            value (str): The value.
+
+        Returns:
+            int: The estimate, never lower than the true count.
+        """
+        return min(map(self.counters.__getitem__, self.cells(sketch_hash(value))))
+
+    def merge(self, other):
+        """
+        Folds a sketch of the same dimensions, built over other values, into this one.
+
+        Args:
+            other (CountMinSketch): The sketch to merge.
+
+        Raises:
+            ValueError: If the dimensions differ.
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f"Cannot merge Count-Min sketches of {self.depth}x{self.width} and "
+                             f"{other.depth}x{other.width} counters")
+        self.counters = array("q", map(int.__add__, self.counters, other.counters))
+        self.total += other.total
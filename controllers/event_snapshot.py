@@ -0,0 +1,185 @@
+"""
+event_snapshot.py
+
+A Python module providing a memory-mapped binary snapshot format for large sets of projected GitHub events.
+
+Reloading fetched or GH Archive events used to mean decoding their JSON again, which takes minutes for millions of
+events. A snapshot stores the columns of an `EventStore` as fixed-width little-endian arrays and its string tables as
+offsets into a UTF-8 blob, each section aligned to 8 bytes. `load_snapshot` maps the file read-only with `mmap` and
+wraps the sections in memoryviews, and in NumPy arrays when NumPy is installed, without reading or copying them: loading
+takes the same time for any number of events, the kernel pages columns in as analysis methods touch them, and every
+process loading the same snapshot shares its pages through the page cache.
+
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from controllers.event_store import EventStore, StringTable
+from utils.custom_exception import InvalidInputException
+
+MAGIC = b"GHES"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xQ")
+COLUMNS = ("ids", "created_at", "types", "actors", "repos")
+TABLES = ("type_table", "actor_table", "repo_table")
+DIRECTORY = struct.Struct(f"<{2 * (len(COLUMNS) + 2 * len(TABLES))}Q")
+ALIGNMENT = 8
+
+
+class MappedStringTable(StringTable):
+    """
+    A `StringTable` read from a snapshot. Its strings are decoded on first use, so loading a snapshot does not pay for
+    tables an analysis never reads, such as the actor logins of a type count.
+    """
+
+    def __init__(self, offsets, blob):
+        """
+        Args:
+            offsets (memoryview): The start of every string in the blob, followed by the end of the last one.
+            blob (memoryview): The UTF-8 encoded strings.
+        """
+        self._offsets = offsets
+        self._blob = blob
+        self._values = None
+        self._code_map = None
+
+    @property
+    def values(self):
+        if self._values is None:
+            offsets, blob = self._offsets.tolist(), self._blob
+            self._values = [str(blob[start:end], "utf-8") for start, end in zip(offsets, offsets[1:])]
+        return self._values
+
+    @property
+    def _codes(self):
+        if self._code_map is None:
+            self._code_map = {value: code for code, value in enumerate(self.values)}
+        return self._code_map
+
+    def __len__(self):
+        return len(self._offsets) - 1 if self._values is None else len(self._values)
+
+
+def _padding(size):
+    return -size % ALIGNMENT
+
+
+def save_snapshot(store, path):
+    """
+    Writes the events of a store to a snapshot file atomically: a crash while saving leaves the previous file intact.
+
+    Args:
+        store (EventStore): The events, including a store loaded from another snapshot.
+        path (str): The path of the snapshot file.
+
+    Returns:
+        int: The size of the snapshot in bytes.
+    """
+    sections = []
+    for name in COLUMNS:
+        column = store.columns[name]
+        if sys.byteorder == "big":  # pragma: no cover - snapshots are always little-endian
+            column = array(EventStore.TYPECODES[name], column)
+            column.byteswap()
+        sections.append(memoryview(column).cast("B"))
+    for name in TABLES:
+        encoded = [value.encode("utf-8") for value in getattr(store, name).values]
+        offsets = array("q", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        if sys.byteorder == "big":  # pragma: no cover - snapshots are always little-endian
+            offsets.byteswap()
+        sections.extend((memoryview(offsets).cast("B"), b"".join(encoded)))
+
+    directory = []
+    position = HEADER.size + DIRECTORY.size
+    for section in sections:
+        directory.extend((position, len(section)))
+        position += len(section) + _padding(len(section))
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, VERSION, len(store)))
+        snapshot_file.write(DIRECTORY.pack(*directory))
+        for section in sections:
+            snapshot_file.write(section)
+            snapshot_file.write(b"\0" * _padding(len(section)))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temporary_path, path)
+    return position
+
+
+def load_snapshot(path):
+    """
+    Maps a snapshot written by `save_snapshot` into memory as a read-only `EventStore`.
+
+    Nothing is read or decoded up front: the columns are views of the mapping, and the NumPy arrays the vectorized
+    analysis methods use are views of the same pages. Events cannot be appended to the store; `select`, `filter` and
+    `order_by_time` return ordinary in-memory stores.
+
+    Args:
+        path (str): The path of the snapshot file.
+
+    Returns:
+        EventStore: The mapped events.
+
+    Raises:
+        InvalidInputException: If the file is not a snapshot of a supported version, or is truncated.
+    """
+    with open(path, "rb") as snapshot_file:
+        size = os.fstat(snapshot_file.fileno()).st_size
+        if size < HEADER.size + DIRECTORY.size:
+            raise InvalidInputException(f"Not an event snapshot: {path} is too short!")
+        mapping = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, rows = HEADER.unpack_from(mapping)
+    if magic != MAGIC:
+        raise InvalidInputException(f"Not an event snapshot: {path}!")
+    if version != VERSION:
+        raise InvalidInputException(f"Unsupported event snapshot version {version} in {path}!")
+    directory = DIRECTORY.unpack_from(mapping, HEADER.size)
+    view = memoryview(mapping)
+    sections = []
+    for offset, length in zip(directory[::2], directory[1::2]):
+        if offset + length > size:
+            raise InvalidInputException(f"Corrupt event snapshot: {path} is truncated!")
+        sections.append((offset, length))
+
+    try:
+        columns, numpy_columns = {}, {}
+        for name, (offset, length) in zip(COLUMNS, sections):
+            typecode = EventStore.TYPECODES[name]
+            column = view[offset:offset + length].cast(typecode)
+            if len(column) != rows:
+                raise InvalidInputException(f"Corrupt event snapshot: the {name} column of {path} has "
+                                            f"{len(column)} rows instead of {rows}!")
+            if sys.byteorder == "big":  # pragma: no cover - snapshots are always little-endian
+                column = array(typecode, column)
+                column.byteswap()
+            columns[name] = column
+            if np is not None:
+                dtype = np.dtype(EventStore.DTYPES[name]).newbyteorder("<")
+                numpy_columns[name] = np.frombuffer(mapping, dtype, rows, offset)
+
+        tables = []
+        for index in range(len(TABLES)):
+            (offsets_offset, offsets_length), (blob_offset, blob_length) = sections[len(COLUMNS) + 2 * index:][:2]
+            tables.append(MappedStringTable(view[offsets_offset:offsets_offset + offsets_length].cast("q"),
+                                            view[blob_offset:blob_offset + blob_length]))
+    except (TypeError, ValueError) as error:
+        raise InvalidInputException(f"Corrupt event snapshot {path}: {error}") from error
+
+    store = EventStore(columns, *tables)
+    store._numpy_columns = numpy_columns
+    store._mapping = mapping
+    return store
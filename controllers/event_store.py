@@ -0,0 +1,329 @@
+"""
+event_store.py
+
+A Python module providing a compact, columnar in-memory store for GitHub events.
+
+This module contains the `StringTable` class, which dictionary-encodes strings as integer codes, and the `EventStore`
+class, which keeps only the fields the analyzer reads (`id`, `type`, `actor.login`, `created_at` and `repo.name`) in
+array-backed columns. Event types, actors and repositories are stored as codes and timestamps as int64 epoch seconds,
+so an event takes a few dozen bytes instead of the several kilobytes of its decoded JSON.
+
+Filtering, statistics, the most active user and ordering run as vectorized NumPy operations over the columns when
+NumPy is installed, and fall back to the standard library otherwise.
+
+"""
+
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from controllers.event_timeline import EventTimeline, bin_counts
+from utils.timestamps import format_timestamp, parse_timestamp
+
+
+class StringTable:
+    """
+    A dictionary encoding of strings to dense integer codes, assigned in first-seen order.
+
+    Attributes:
+        values (list): The strings, indexed by code.
+    """
+
+    def __init__(self, values=None):
+        self.values = list(values or ())
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value):
+        """
+        Returns the code of a string, assigning a new code if the string is new.
+
+        Args:
+            value (str): The string to encode.
+
+        Returns:
+            int: The code.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """
+        Returns the code of a string without assigning one.
+
+        Args:
+            value (str): The string to look up.
+
+        Returns:
+            int: The code, or None if the string is unknown.
+        """
+        return self._codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class EventStore:
+    """
+    A columnar, dictionary-encoded store of projected GitHub events.
+
+    Attributes:
+        columns (dict): The "ids", "created_at", "types", "actors" and "repos" columns.
+        type_table (StringTable): The encoding of event types.
+        actor_table (StringTable): The encoding of actor logins.
+        repo_table (StringTable): The encoding of repository names.
+
+    Methods:
+        from_events(events):
+            Builds a store from an iterable of decoded events.
+
+        append(event) / extend(events):
+            Adds decoded events to the store.
+
+        column(name):
+            Returns a column as a NumPy array, or as an `array.array` without NumPy.
+
+        filter(event_type):
+            Returns a new store holding only the events of the given type.
+
+        event_statistics():
+            Returns the number of events per event type.
+
+        most_active_user():
+            Returns the login of the actor with the most events.
+
+        order_by_time(reverse=False):
+            Returns a new store ordered by `created_at`.
+
+        timeline(bucket_seconds, by="type"):
+            Returns the number of events per time bucket and event type or actor.
+
+    Iterating over a store yields the events as dictionaries in the API schema, so `display_events` and the other
+    `GitHubEventsAnalysis` methods accept a store in place of a list.
+
+    Example Usage:
+        store = EventStore.from_events(analyzer.iter_events("owner", "repo", max_pages=10))
+        pushes = analyzer.filter_events(store, "PushEvent")
+        print(analyzer.calculate_event_statistics(store), analyzer.identify_most_active_user(pushes))
+
+    """
+
+    TYPECODES = {"ids": "q", "created_at": "q", "types": "i", "actors": "i", "repos": "i"}
+    DTYPES = {"ids": "int64", "created_at": "int64", "types": "int32", "actors": "int32", "repos": "int32"}
+
+    def __init__(self, columns=None, type_table=None, actor_table=None, repo_table=None):
+        """
+        Initializes a new instance of the EventStore class.
+
+        Args:
+            columns (dict, optional): Existing columns keyed by name. Defaults to empty columns.
+            type_table (StringTable, optional): The encoding of event types.
+            actor_table (StringTable, optional): The encoding of actor logins.
+            repo_table (StringTable, optional): The encoding of repository names.
+        """
+        self.columns = columns or {name: array(typecode) for name, typecode in self.TYPECODES.items()}
+        self.type_table = type_table or StringTable()
+        self.actor_table = actor_table or StringTable()
+        self.repo_table = repo_table or StringTable()
+        self._numpy_columns = {}
+
+    @classmethod
+    def from_events(cls, events):
+        """
+        Builds a store from an iterable of decoded events.
+
+        Args:
+            events (iterable): The events in the API schema.
+
+        Returns:
+            EventStore: The store.
+        """
+        store = cls()
+        store.extend(events)
+        return store
+
+    def append(self, event):
+        """
+        Adds a single decoded event to the store.
+
+        Args:
+            event (dict): The event in the API schema.
+        """
+        self.extend((event,))
+
+    def extend(self, events):
+        """
+        Adds decoded events to the store.
+
+        Args:
+            events (iterable): The events in the API schema.
+        """
+        columns = self.columns
+        append_id, append_created_at = columns["ids"].append, columns["created_at"].append
+        append_type, append_actor, append_repo = (columns["types"].append, columns["actors"].append,
+                                                  columns["repos"].append)
+        encode_type, encode_actor, encode_repo = (self.type_table.encode, self.actor_table.encode,
+                                                  self.repo_table.encode)
+        for event in events:
+            event_id = event.get('id')
+            append_id(int(event_id) if event_id else 0)
+            created_at = event.get('created_at')
+            append_created_at(parse_timestamp(created_at) if created_at else 0)
+            append_type(encode_type(event['type']))
+            append_actor(encode_actor(event['actor']['login']))
+            repo = event.get('repo')
+            append_repo(encode_repo(repo['name'] if repo else ""))
+        self._numpy_columns = {}
+
+    def __len__(self):
+        return len(self.columns["ids"])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.event_at(index)
+
+    def event_at(self, index):
+        """
+        Rebuilds the event at the given row in the API schema.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            dict: The projected event.
+        """
+        columns = self.columns
+        return {
+            'id': str(columns["ids"][index]),
+            'type': self.type_table.values[columns["types"][index]],
+            'actor': {'login': self.actor_table.values[columns["actors"][index]]},
+            'created_at': format_timestamp(columns["created_at"][index]),
+            'repo': {'name': self.repo_table.values[columns["repos"][index]]},
+        }
+
+    def column(self, name):
+        """
+        Returns a column as a NumPy array, or as an `array.array` when NumPy is not installed.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            The column.
+        """
+        if np is None:
+            return self.columns[name]
+        if name not in self._numpy_columns:
+            # Copy rather than view, so the array.array stays resizable for later appends.
+            self._numpy_columns[name] = np.array(self.columns[name], dtype=self.DTYPES[name])
+        return self._numpy_columns[name]
+
+    def select(self, rows):
+        """
+        Returns a new store holding the given rows, sharing the string tables.
+
+        Args:
+            rows: A NumPy index array, or a list of row numbers without NumPy.
+
+        Returns:
+            EventStore: The new store.
+        """
+        if np is not None:
+            columns = {name: array(typecode, self.column(name)[rows].tobytes())
+                       for name, typecode in self.TYPECODES.items()}
+        else:
+            columns = {name: array(typecode, [self.columns[name][row] for row in rows])
+                       for name, typecode in self.TYPECODES.items()}
+        return EventStore(columns, self.type_table, self.actor_table, self.repo_table)
+
+    def filter(self, event_type):
+        """
+        Returns a new store holding only the events of the given type.
+
+        Args:
+            event_type (str): The type of events to keep.
+
+        Returns:
+            EventStore: The filtered store.
+        """
+        code = self.type_table.lookup(event_type)
+        if code is None:
+            return self.select([] if np is None else np.empty(0, dtype="int64"))
+        if np is not None:
+            return self.select(np.flatnonzero(self.column("types") == code))
+        return self.select([row for row, type_code in enumerate(self.columns["types"]) if type_code == code])
+
+    def event_statistics(self):
+        """
+        Returns the number of events per event type, in first-seen order.
+
+        Returns:
+            dict: The event counts keyed by event type.
+        """
+        return {self.type_table.values[code]: count for code, count in self._counts("types")}
+
+    def most_active_user(self):
+        """
+        Returns the login of the actor with the most events. Ties go to the actor seen first.
+
+        Returns:
+            str: The login, or None if the store is empty.
+        """
+        counts = self._counts("actors")
+        if not counts:
+            return None
+        code, _ = max(counts, key=lambda item: item[1])
+        return self.actor_table.values[code]
+
+    def order_by_time(self, reverse=False):
+        """
+        Returns a new store ordered by `created_at`. The sort is stable, like `sorted`.
+
+        Args:
+            reverse (bool, optional): Whether to order from the most recent event. Defaults to False.
+
+        Returns:
+            EventStore: The ordered store.
+        """
+        if np is not None:
+            created_at = self.column("created_at")
+            return self.select(np.argsort(-created_at if reverse else created_at, kind="stable"))
+        created_at = self.columns["created_at"]
+        return self.select(sorted(range(len(self)), key=created_at.__getitem__, reverse=reverse))
+
+    def timeline(self, bucket_seconds, by="type"):
+        """
+        Returns the number of events per time bucket and event type or actor, binned over the stored columns.
+
+        Args:
+            bucket_seconds (int): The bucket width in seconds.
+            by (str, optional): "type" or "actor". Defaults to "type".
+
+        Returns:
+            EventTimeline: The timeline.
+        """
+        column, table = ("actors", self.actor_table) if by == "actor" else ("types", self.type_table)
+        rows = bin_counts(self.column("created_at"), self.column(column), bucket_seconds)
+        return EventTimeline(bucket_seconds, by, table.values, rows)
+
+    def _counts(self, name):
+        """
+        Counts the occurrences of every code of a column.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            list: (code, count) pairs in first-seen order.
+        """
+        if np is None:
+            return list(Counter(self.columns[name]).items())
+        codes, first_rows, counts = np.unique(self.column(name), return_index=True, return_counts=True)
+        order = np.argsort(first_rows, kind="stable")
+        return list(zip(codes[order].tolist(), counts[order].tolist()))
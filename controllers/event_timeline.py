@@ -0,0 +1,174 @@
+"""
+event_timeline.py
+
+A Python module providing time-bucketed activity histograms of GitHub events.
+
+This module contains the `EventTimeline` class, which holds the number of events per time bucket and event type or
+actor, and the functions building it. `created_at` is parsed once per event into an integer column of epoch seconds,
+and the counts are then binned in one vectorized pass over the columns with NumPy when it is installed, or with a
+`Counter` otherwise. `EventStore` and `ArchivedEvents` build timelines from their own columns and indexes without
+materializing events.
+
+"""
+
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from utils.timestamps import format_timestamp, parse_timestamp
+
+TIMELINE_KEYS = ("type", "actor")
+
+
+def bin_counts(created_at, codes, bucket_seconds):
+    """
+    Counts the events per time bucket and key code.
+
+    Args:
+        created_at: The epoch seconds of every event, as a NumPy array or a sequence of ints.
+        codes: The key code of every event, aligned with created_at.
+        bucket_seconds (int): The bucket width in seconds. Buckets are aligned to the Unix epoch.
+
+    Returns:
+        list: (bucket start, code, count) tuples of the non-empty buckets, ordered by bucket and then code.
+    """
+    if np is None:
+        counts = Counter(zip([seconds // bucket_seconds for seconds in created_at], codes))
+        return [(bucket * bucket_seconds, code, count) for (bucket, code), count in sorted(counts.items())]
+
+    buckets = np.asarray(created_at, dtype="int64") // bucket_seconds
+    codes = np.asarray(codes, dtype="int64")
+    if not len(buckets):
+        return []
+    first = int(buckets.min())
+    width = int(codes.max()) + 1
+    cells = (buckets - first) * width + codes
+    size = (int(buckets.max()) - first + 1) * width
+    if size <= max(4 * len(cells), 1 << 16):
+        counts = np.bincount(cells, minlength=size)
+        cells = np.flatnonzero(counts)
+        counts = counts[cells]
+    else:
+        cells, counts = np.unique(cells, return_counts=True)
+    buckets, codes = np.divmod(cells, width)
+    return list(zip(((buckets + first) * bucket_seconds).tolist(), codes.tolist(), counts.tolist()))
+
+
+def timeline_from_events(events, bucket_seconds, by="type"):
+    """
+    Builds a timeline from an iterable of decoded events, parsing each `created_at` once.
+
+    Events cluster in time, so the epoch seconds of every minute are computed once and only the seconds are parsed
+    per event.
+
+    Args:
+        events (iterable): The events in the API schema.
+        bucket_seconds (int): The bucket width in seconds.
+        by (str, optional): "type" or "actor". Defaults to "type".
+
+    Returns:
+        EventTimeline: The timeline.
+    """
+    created_at = array("q")
+    codes = array("i")
+    key_codes = {}
+    minutes = {}
+    append_created_at, append_code, setdefault = created_at.append, codes.append, key_codes.setdefault
+    if by == "actor":
+        for event in events:
+            timestamp = event['created_at']
+            minute = minutes.get(timestamp[:16])
+            if minute is None:
+                minute = minutes[timestamp[:16]] = parse_timestamp(timestamp[:17] + "00Z")
+            append_created_at(minute + int(timestamp[17:19]))
+            append_code(setdefault(event['actor']['login'], len(key_codes)))
+    else:
+        for event in events:
+            timestamp = event['created_at']
+            minute = minutes.get(timestamp[:16])
+            if minute is None:
+                minute = minutes[timestamp[:16]] = parse_timestamp(timestamp[:17] + "00Z")
+            append_created_at(minute + int(timestamp[17:19]))
+            append_code(setdefault(event['type'], len(key_codes)))
+    return EventTimeline(bucket_seconds, by, list(key_codes), bin_counts(created_at, codes, bucket_seconds))
+
+
+class EventTimeline:
+    """
+    The number of events per time bucket and event type or actor.
+
+    Attributes:
+        bucket_seconds (int): The bucket width in seconds.
+        by (str): What events are counted by: "type" or "actor".
+        keys (list): The event types or actors, indexed by code, in first-seen order.
+        rows (list): (bucket start, code, count) tuples of the non-empty buckets, ordered by bucket and then code.
+
+    Methods:
+        buckets():
+            Returns the counts per key of every non-empty bucket.
+
+        totals():
+            Returns the number of events of every non-empty bucket.
+
+        to_rows():
+            Yields (bucket timestamp, key, count) tuples.
+
+    Example Usage:
+        timeline = analyzer.calculate_event_timeline(archive.events("owner/repo"), bucket="1h", by="actor")
+        for start, counts in timeline.buckets().items():
+            print(format_timestamp(start), counts)
+
+    """
+
+    def __init__(self, bucket_seconds, by, keys, rows):
+        self.bucket_seconds = bucket_seconds
+        self.by = by
+        self.keys = keys
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def buckets(self):
+        """
+        Returns the counts per key of every non-empty bucket.
+
+        Returns:
+            dict: Dictionaries of counts keyed by event type or actor, keyed by bucket start in epoch seconds and
+                ordered by time.
+        """
+        keys = self.keys
+        buckets = {}
+        for start, code, count in self.rows:
+            counts = buckets.get(start)
+            if counts is None:
+                counts = buckets[start] = {}
+            counts[keys[code]] = count
+        return buckets
+
+    def totals(self):
+        """
+        Returns the number of events of every non-empty bucket.
+
+        Returns:
+            dict: The counts keyed by bucket start in epoch seconds, ordered by time.
+        """
+        totals = {}
+        for start, _, count in self.rows:
+            totals[start] = totals.get(start, 0) + count
+        return totals
+
+    def to_rows(self):
+        """
+        Yields the non-empty cells of the timeline.
+
+        Yields:
+            tuple: The bucket start as an API timestamp, the event type or actor, and the count.
+        """
+        keys = self.keys
+        for start, code, count in self.rows:
+            yield format_timestamp(start), keys[code], count
@@ -0,0 +1,199 @@
+"""
+event_watcher.py
+
+A Python module providing a long-running watch mode over the GitHub events API.
+
+This module contains the `RecentIds` class, a bounded LRU set of event ids, and the `EventWatcher` class, which polls
+the events endpoint at the interval the server advises with `X-Poll-Interval` and emits only the events it has not
+seen before. Polls are conditional requests through the analyzer's `ResponseCache`, so an unchanged page costs a
+`304 Not Modified` and no rate limit. Statistics are updated with the new events only, and every structure the watcher
+keeps is bounded, so memory stays constant however long it runs.
+
+"""
+
+import sys
+import time
+from collections import OrderedDict
+
+from controllers.base.response_cache import ResponseCache
+from controllers.event_aggregator import BoundedActorCounts, EventAggregator, EventTypeCounts, TopActors
+from controllers.event_pipeline import filter_stage, order_stage
+from utils.custom_exception import GitHubAPIException
+
+DEFAULT_POLL_INTERVAL = 60
+
+
+class RecentIds:
+    """
+    A bounded set of the most recently seen event ids, evicting the least recently seen one when full.
+
+    Attributes:
+        capacity (int): The maximum number of ids kept.
+
+    Methods:
+        add(event_id):
+            Records an id as seen.
+            Args:
+                event_id (str): The event id.
+            Returns:
+                bool: True if the id was not in the set.
+    """
+
+    def __init__(self, capacity=10000):
+        """
+        Initializes a new instance of the RecentIds class.
+
+        Args:
+            capacity (int, optional): The maximum number of ids kept. Defaults to 10000.
+        """
+        self.capacity = capacity
+        self._ids = OrderedDict()
+
+    def __contains__(self, event_id):
+        return event_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, event_id):
+        """
+        Records an id as seen, refreshing it if it was already in the set.
+
+        Args:
+            event_id (str): The event id.
+
+        Returns:
+            bool: True if the id was not in the set.
+        """
+        ids = self._ids
+        if event_id in ids:
+            ids.move_to_end(event_id)
+            return False
+        ids[event_id] = None
+        if len(ids) > self.capacity:
+            ids.popitem(last=False)
+        return True
+
+
+class EventWatcher:
+    """
+    Polls the events of a repository, or the public events, and yields the events not seen before.
+
+    Each poll fetches the first page; while every event of a page is new, the following page is fetched as well, up
+    to `max_pages`, so bursts between polls are not lost. New events are emitted oldest first.
+
+    Attributes:
+        analyzer (GitHubEventsAnalyzer): The analyzer used to fetch events.
+        repo_owner (str): The owner of the repository, or None for the public events.
+        repo_name (str): The name of the repository, or None for the public events.
+        event_type (str): The type of events to emit, or None for every type.
+        seen_ids (RecentIds): The ids of the recently seen events.
+        aggregator (EventAggregator): The running statistics of the emitted events.
+        poll_interval (int): The number of seconds to wait before the next poll.
+
+    Methods:
+        poll():
+            Fetches the latest events once and returns the new ones.
+
+        watch(max_polls=None):
+            Yields the new events of every poll, sleeping between polls.
+
+    Example Usage:
+        watcher = EventWatcher(GitHubEventsAnalyzer(cache=ResponseCache()), "owner", "repo")
+        for new_events in watcher.watch():
+            analyzer.display_events(new_events)
+            print(watcher.aggregator.event_statistics, watcher.aggregator.most_active_user)
+
+    """
+
+    def __init__(self, analyzer, repo_owner=None, repo_name=None, event_type=None, seen_capacity=10000,
+                 actor_capacity=1000, max_pages=3, min_interval=1, sleep=time.sleep):
+        """
+        Initializes a new instance of the EventWatcher class.
+
+        Args:
+            analyzer (GitHubEventsAnalyzer): The analyzer used to fetch events. A small response cache is attached if
+                it has none, so that polls are conditional requests.
+            repo_owner (str, optional): The owner of the repository. Defaults to the public events.
+            repo_name (str, optional): The name of the repository. Defaults to the public events.
+            event_type (str, optional): The type of events to emit. Defaults to every type.
+            seen_capacity (int, optional): The number of recent event ids remembered. Defaults to 10000.
+            actor_capacity (int, optional): The number of actors counted for the most active user. Defaults to 1000.
+            max_pages (int, optional): The maximum number of pages fetched per poll. Defaults to 3.
+            min_interval (float, optional): The shortest wait between polls in seconds. Defaults to 1.
+            sleep (callable, optional): Sleeps for a number of seconds. Defaults to `time.sleep`.
+        """
+        self.analyzer = analyzer
+        if analyzer.cache is None:
+            analyzer.cache = ResponseCache(max_entries=max_pages)
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.event_type = event_type
+        self.max_pages = max_pages
+        self.min_interval = min_interval
+        self.seen_ids = RecentIds(seen_capacity)
+        actor_counts = BoundedActorCounts(actor_capacity)
+        self.aggregator = EventAggregator([EventTypeCounts(), actor_counts, TopActors(actor_counts, 1)])
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self._sleep = sleep
+
+    def poll(self):
+        """
+        Fetches the latest events once and returns the new ones, updating the statistics with them only.
+
+        Returns:
+            list: The events not seen before, oldest first.
+
+        Raises:
+            GitHubAPIException: If a request fails.
+        """
+        analyzer, seen_ids = self.analyzer, self.seen_ids
+        new_events = []
+        polled_ids = set()
+        for page in range(1, self.max_pages + 1):
+            endpoint = analyzer.events_endpoint(self.repo_owner, self.repo_name, page, analyzer.MAX_PER_PAGE)
+            events, headers = analyzer.fetch_with_headers(endpoint, analyzer.event_decoder)
+            if page == 1:
+                self.poll_interval = max(int(headers.get("X-Poll-Interval") or DEFAULT_POLL_INTERVAL),
+                                         self.min_interval)
+            unseen = [event for event in analyzer.unseen_events(events, polled_ids) if event['id'] not in seen_ids]
+            new_events.extend(unseen)
+            if len(unseen) < len(events) or page >= analyzer.last_page_number(headers):
+                break
+
+        # Ids are only recorded once every page arrived, so events of a failed poll are emitted by the next one.
+        for event_id in polled_ids:
+            seen_ids.add(event_id)
+
+        if self.event_type:
+            new_events = filter_stage(new_events, self.event_type)
+        new_events = list(order_stage(new_events))
+        self.aggregator.add(new_events)
+        return new_events
+
+    def watch(self, max_polls=None):
+        """
+        Yields the new events of every poll, sleeping between polls for the interval the server advised.
+
+        The interval is waited in full after each poll, so the cached first page has always expired by the next poll
+        and is revalidated rather than served from the cache. A failed poll is reported on standard error and retried
+        at the next interval instead of ending the watch.
+
+        Args:
+            max_polls (int, optional): The number of polls after which to stop. Defaults to watching forever.
+
+        Yields:
+            list: The new events of each poll, oldest first. Polls without new events, or that failed, yield an
+                empty list.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            try:
+                new_events = self.poll()
+            except GitHubAPIException as error:
+                print(f"Poll failed: {error}", file=sys.stderr)
+                new_events = []
+            yield new_events
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                self._sleep(self.poll_interval)
@@ -0,0 +1,295 @@
+"""
+gharchive.py
+
+A Python module providing offline bulk ingestion of GH Archive (https://www.gharchive.org) hourly dumps.
+
+GH Archive files are gzip-compressed JSON lines in the same schema as the GitHub events API. This module contains the
+`iter_archive_events` generator, which stream-decompresses one file and filters it by repository and event type before
+fully decoding each line, and the `GHArchiveIngestor` class, which spreads files across a process pool and merges the
+per-worker `EventAggregator` results. Ingestion can be checkpointed to an `AggregateState` snapshot recording the line
+offset reached in every file, so an interrupted backfill resumes where it stopped and adding files to a run only
+ingests the new ones.
+
+"""
+
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from controllers.aggregate_state import AggregateState, Checkpointer
+from controllers.event_aggregator import EventAggregator
+from utils.custom_exception import InvalidInputException
+
+CHECKPOINT_CHECK_EVENTS = 4096
+
+
+def iter_archive_events(path, repo=None, event_type=None, counter=None, start=0):
+    """
+    Yields the events of a GH Archive file, stream-decompressing it line by line.
+
+    Lines are first screened with a substring test on the raw bytes, so most non-matching events are skipped without
+    being decoded. Matching candidates are decoded and checked exactly.
+
+    Args:
+        path (str): The path of a `.json.gz` (or plain `.json`) GH Archive file.
+        repo (str, optional): The "owner/name" of the repository to keep.
+        event_type (str, optional): The type of events to keep.
+        counter (dict, optional): Updated in place with the "scanned" line count. The count is current whenever an
+            event is yielded, so it is the offset to resume from after that event.
+        start (int, optional): The number of lines to skip, e.g. the offset a previous run stopped at. Skipped lines
+            are not counted as scanned. Defaults to 0.
+
+    Yields:
+        dict: The matching events.
+    """
+    repo_needle = f'"{repo}"'.encode() if repo else None
+    type_needle = f'"{event_type}"'.encode() if event_type else None
+    opener = gzip.open if path.endswith(".gz") else open
+
+    if counter is None:
+        counter = {}
+    scanned = counter.get("scanned", 0)
+    with opener(path, "rb") as archive_file:
+        for line in islice(archive_file, start, None):
+            scanned += 1
+            if repo_needle is not None and repo_needle not in line:
+                continue
+            if type_needle is not None and type_needle not in line:
+                continue
+            event = json.loads(line)
+            if repo is not None and event['repo']['name'] != repo:
+                continue
+            if event_type is not None and event['type'] != event_type:
+                continue
+            counter["scanned"] = scanned
+            yield event
+
+    counter["scanned"] = scanned
+
+
+def aggregate_archive_file(path, repo=None, event_type=None, top_k=10, approximate=False, start=0,
+                           sketch_settings=None):
+    """
+    Aggregates the matching events of one GH Archive file. Runs inside a worker process.
+
+    Args:
+        path (str): The path of the GH Archive file.
+        repo (str, optional): The "owner/name" of the repository to keep.
+        event_type (str, optional): The type of events to keep.
+        top_k (int, optional): The number of most active actors to report. Defaults to 10.
+        approximate (bool, optional): Whether to count actors and repositories with sketches. Defaults to False.
+        start (int, optional): The number of lines already ingested by a previous run. Defaults to 0.
+        sketch_settings (tuple, optional): With approximate, the (sketch_error, sketch_confidence, distinct_error) of
+            the sketches. Defaults to the `EventAggregator.default` settings.
+
+    Returns:
+        tuple: The partial `EventAggregator`, the number of lines scanned and the number of events matched.
+    """
+    counter = {}
+    aggregator = EventAggregator.default(top_k, approximate, *(sketch_settings or ()))
+    matched = 0
+    for event in iter_archive_events(path, repo, event_type, counter, start):
+        aggregator.update(event)
+        matched += 1
+    return aggregator, counter["scanned"], matched
+
+
+class IngestResult:
+    """
+    The merged result of an ingestion run.
+
+    Attributes:
+        aggregator (EventAggregator): The merged statistics, including those of a resumed checkpoint.
+        files (int): The number of files ingested.
+        scanned (int): The number of events read.
+        matched (int): The number of events matching the filters.
+        elapsed (float): The wall-clock duration in seconds.
+        workers (int): The number of worker processes.
+        skipped (int): The number of files skipped because a resumed checkpoint already covered them.
+    """
+
+    def __init__(self, aggregator, files, scanned, matched, elapsed, workers, skipped=0):
+        self.aggregator = aggregator
+        self.files = files
+        self.scanned = scanned
+        self.matched = matched
+        self.elapsed = elapsed
+        self.workers = workers
+        self.skipped = skipped
+
+    @property
+    def events_per_second(self):
+        return self.scanned / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def events_per_second_per_core(self):
+        return self.events_per_second / self.workers
+
+
+class GHArchiveIngestor:
+    """
+    Ingests GH Archive files in parallel on a process pool.
+
+    Each worker aggregates whole files and returns a small partial `EventAggregator`; the partial results are merged in
+    file order, so the output is the same for any number of workers. Parsing is CPU bound, so throughput scales with
+    the number of cores as long as there are at least as many files as workers. With `approximate`, actors and
+    repositories are counted with fixed-size sketches, so neither the workers nor their partial results grow with the
+    number of distinct actors; their error bounds are configurable and every worker uses the same ones, so the partial
+    sketches merge exactly.
+
+    With a checkpoint file, the merged statistics and the line offset reached in every file are saved after each file
+    and, with a single worker, periodically within a file. A later run with the same checkpoint skips the completed
+    files and resumes a partially ingested one at its offset.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        top_k (int): The number of most active actors to report.
+        approximate (bool): Whether actors and repositories are counted with sketches.
+        sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+        sketch_confidence (float): With approximate, the probability that a count is within the bound.
+        distinct_error (float): With approximate, the relative standard error of the distinct counts.
+        checkpoint_interval (float): The minimum number of seconds between periodic checkpoints.
+
+    Methods:
+        ingest(files, repo=None, event_type=None, checkpoint=None):
+            Aggregates the matching events of every file not covered by the checkpoint.
+
+    Example Usage:
+        result = GHArchiveIngestor(workers=8).ingest(glob.glob("2023-06-14-*.json.gz"), repo="python/cpython",
+                                                     checkpoint="cpython.state")
+        print(result.aggregator.event_statistics, f"{result.events_per_second_per_core:.0f} events/s/core")
+
+    """
+
+    def __init__(self, workers=None, top_k=10, approximate=False, checkpoint_interval=30.0, sketch_error=0.001,
+                 sketch_confidence=0.99, distinct_error=0.01):
+        """
+        Initializes a new instance of the GHArchiveIngestor class.
+
+        Args:
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            top_k (int, optional): The number of most active actors to report. Defaults to 10.
+            approximate (bool, optional): Whether to count actors and repositories with sketches in bounded memory.
+                Defaults to False.
+            checkpoint_interval (float, optional): The minimum number of seconds between periodic checkpoints.
+                Defaults to 30.
+            sketch_error (float, optional): With approximate, the overcount bound of the actor and repository counts
+                as a fraction of all events. Defaults to 0.001.
+            sketch_confidence (float, optional): With approximate, the probability that a count is within the bound.
+                Defaults to 0.99.
+            distinct_error (float, optional): With approximate, the relative standard error of the distinct counts.
+                Defaults to 0.01.
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.top_k = top_k
+        self.approximate = approximate
+        self.sketch_error = sketch_error
+        self.sketch_confidence = sketch_confidence
+        self.distinct_error = distinct_error
+        self.checkpoint_interval = checkpoint_interval
+
+    @property
+    def sketch_settings(self):
+        """
+        The (sketch_error, sketch_confidence, distinct_error) of the sketches, or None if the statistics are exact.
+        """
+        return (self.sketch_error, self.sketch_confidence, self.distinct_error) if self.approximate else None
+
+    def ingest(self, files, repo=None, event_type=None, checkpoint=None):
+        """
+        Aggregates the matching events of every file not covered by the checkpoint.
+
+        Args:
+            files (list): The paths of the GH Archive files.
+            repo (str, optional): The "owner/name" of the repository to keep.
+            event_type (str, optional): The type of events to keep.
+            checkpoint (str, optional): The path of an `AggregateState` snapshot to resume from, if it exists, and to
+                save progress to. Defaults to no checkpointing.
+
+        Returns:
+            IngestResult: The merged statistics and throughput figures.
+
+        Raises:
+            InvalidInputException: If the checkpoint was written with other filters or aggregation settings.
+        """
+        started = time.perf_counter()
+        state = self.resume(checkpoint, repo, event_type)
+        checkpointer = Checkpointer(checkpoint, self.checkpoint_interval) if checkpoint else None
+        pending = []
+        for path in files:
+            position = state.cursor.get(os.path.abspath(path), {"offset": 0, "done": False})
+            if not position["done"]:
+                pending.append((path, position["offset"]))
+        workers = min(self.workers, len(pending)) or 1
+
+        if workers == 1:
+            scanned, matched = self._ingest_in_process(state, checkpointer, pending, repo, event_type)
+        else:
+            arguments = ([path for path, _ in pending], [repo] * len(pending), [event_type] * len(pending),
+                         [self.top_k] * len(pending), [self.approximate] * len(pending),
+                         [offset for _, offset in pending], [self.sketch_settings] * len(pending))
+            scanned = matched = 0
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partials = executor.map(aggregate_archive_file, *arguments)
+                for (path, offset), (partial, partial_scanned, partial_matched) in zip(pending, partials):
+                    state.aggregator.merge(partial)
+                    state.cursor[os.path.abspath(path)] = {"offset": offset + partial_scanned, "done": True}
+                    scanned += partial_scanned
+                    matched += partial_matched
+                    if checkpointer is not None:
+                        checkpointer.save(state)
+
+        return IngestResult(state.aggregator, len(pending), scanned, matched, time.perf_counter() - started, workers,
+                            len(files) - len(pending))
+
+    def resume(self, checkpoint, repo=None, event_type=None):
+        """
+        Loads the state saved at a checkpoint, or creates an empty one if there is no checkpoint yet.
+
+        Args:
+            checkpoint (str): The path of the snapshot file, or None.
+            repo (str, optional): The "owner/name" of the repository to keep.
+            event_type (str, optional): The type of events to keep.
+
+        Returns:
+            AggregateState: The state to continue from.
+
+        Raises:
+            InvalidInputException: If the checkpoint was written with other filters or aggregation settings.
+        """
+        scope = {"repo": repo, "event_type": event_type}
+        if not checkpoint or not os.path.exists(checkpoint):
+            return AggregateState(EventAggregator.default(self.top_k, self.approximate, *(self.sketch_settings or ())),
+                                  scope=scope)
+        state = AggregateState.load(checkpoint)
+        if state.scope != scope:
+            raise InvalidInputException(f"Checkpoint {checkpoint} was written for {state.scope}, not {scope}!")
+        if (state.top_k, state.approximate, state.sketch_settings) != (self.top_k, self.approximate,
+                                                                         self.sketch_settings):
+            raise InvalidInputException(f"Checkpoint {checkpoint} was written with top_k={state.top_k}, "
+                                        f"approximate={state.approximate} and sketch settings "
+                                        f"{state.sketch_settings}!")
+        return state
+
+    def _ingest_in_process(self, state, checkpointer, pending, repo, event_type):
+        aggregator = state.aggregator
+        update = aggregator.update
+        scanned = matched = 0
+        for path, offset in pending:
+            counter = {}
+            position = state.cursor[os.path.abspath(path)] = {"offset": offset, "done": False}
+            for event in iter_archive_events(path, repo, event_type, counter, offset):
+                update(event)
+                matched += 1
+                if checkpointer is not None and matched % CHECKPOINT_CHECK_EVENTS == 0 and checkpointer.due():
+                    position["offset"] = offset + counter["scanned"]
+                    checkpointer.save(state)
+            position["offset"] = offset + counter["scanned"]
+            position["done"] = True
+            scanned += counter["scanned"]
+            if checkpointer is not None:
+                checkpointer.save(state)
+        return scanned, matched
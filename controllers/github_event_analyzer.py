@@ -1,34 +1,82 @@
 """
 github_event_analyzer.py
 
-A Python module providing the GitHubEventsAnalyzer and GitHubEventsAnalyzerCLI classes.
+A Python module providing the GitHubEventsAnalysis, GitHubEventsAnalyzer and GitHubEventsAnalyzerCLI classes.
 
-This module contains the `GitHubEventsAnalyzer` class, which is responsible for fetching GitHub events and performing event analysis.
+This module contains the `GitHubEventsAnalysis` class, which implements the event analysis shared by all analyzers, and
+the `GitHubEventsAnalyzer` class, which is responsible for fetching GitHub events and performing event analysis.
 It also includes the `GitHubEventsAnalyzerCLI` class, which extends the `GitHubEventsAnalyzer` functionality to provide a command-line interface.
 
 Author: Takrim Rahman Albi
 """
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import cached_property
+from itertools import chain
+from urllib.parse import parse_qs, urlparse
+
 from controllers.base.github_api import GitHubAPI
 from controllers.base.event_analyzer import EventAnalyzer
+from controllers.output_writers import TextEventWriter, create_writer
+from controllers.event_aggregator import ActorCounts, EventAggregator, EventTypeCounts
+from controllers.event_pipeline import filter_stage, latest_stage, merge_stage, order_stage, project_stage
+from controllers.event_shell import EventShell
+from controllers.event_watcher import EventWatcher
 from utils.custom_exception import InvalidInputException
+from utils.timestamps import parse_bucket
+
+# Event collections answering the analysis methods themselves (vectorized columns or indexed SQL), as (module, class).
+# Their modules import NumPy and SQLite, which startup avoids, so they are only looked up once something loaded them.
+QUERYABLE_EVENTS = (("controllers.event_store", "EventStore"), ("controllers.event_archive", "ArchivedEvents"))
 
 
-class GitHubEventsAnalyzer(GitHubAPI, EventAnalyzer):
+def is_queryable(events):
     """
-    A class for fetching GitHub events and performing event analysis.
+    Returns whether the events are an `EventStore` or `ArchivedEvents`, without importing either module.
+
+    Args:
+        events (iterable): The events.
+
+    Returns:
+        bool: True if the events answer the analysis methods themselves.
+    """
+    for module_name, class_name in QUERYABLE_EVENTS:
+        module = sys.modules.get(module_name)
+        if module is not None and isinstance(events, getattr(module, class_name)):
+            return True
+    return False
 
-    This class inherits from GitHubAPI and EventAnalyzer, combining their functionality to analyze GitHub events.
+
+class GitHubEventsAnalysis(EventAnalyzer):
+    """
+    Transport independent helpers and event analysis shared by the synchronous and asynchronous analyzers.
+
+    This class implements the `EventAnalyzer` methods together with the endpoint and pagination helpers, so that every
+    analyzer produces identical results regardless of how the events were fetched.
+
+    Attributes:
+        MAX_PER_PAGE (int): The largest page size accepted by the GitHub events API.
 
     Methods:
-        fetch_events(repo_owner, repo_name, page=1):
-            Fetches GitHub events for the specified repository.
-            Args:
-                repo_owner (str): The owner of the repository.
-                repo_name (str): The name of the repository.
-                page (int): The page number of the events to fetch.
-            Returns:
-                list: The list of fetched events.
+        events_endpoint(repo_owner, repo_name, page=1, per_page=None):
+            Builds the events endpoint for the specified repository, or the public events endpoint.
+
+        repository_name(repo_owner, repo_name):
+            Returns the "owner/name" of the specified repository, or None when neither part is given.
+
+        parse_repositories(lines):
+            Parses "owner/name" lines, such as those of a repositories file, into (owner, name) tuples.
+
+        last_page_number(headers):
+            Reads the number of the last page from the `Link` response header.
+
+        deduplicate_events(pages):
+            Flattens pages of events, keeping the first occurrence of every event id.
+
+        unseen_events(events, seen_ids):
+            Yields the events whose id has not been seen yet.
 
         display_events(events):
             Displays the provided events.
@@ -55,24 +103,36 @@ class GitHubEventsAnalyzer(GitHubAPI, EventAnalyzer):
             Args:
                 events (list): The list of events to be analyzed.
             Returns:
-                str: The username of the most active user.
+                str: The username of the most active user, or None if there are no events.
+
+        calculate_event_timeline(events, bucket='1h', by='type'):
+            Counts the events per time bucket and event type or actor.
+            Args:
+                events (list): The list of events to be binned.
+                bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+                by (str): What events are counted by: 'type' or 'actor'.
+            Returns:
+                EventTimeline: The counts of the non-empty buckets.
 
     """
 
-    def fetch_events(self, repo_owner, repo_name, page=1):
+    MAX_PER_PAGE = 100
+
+    def events_endpoint(self, repo_owner, repo_name, page=1, per_page=None):
         """
-        Fetches GitHub events for the specified repository.
+        Builds the events endpoint for the specified repository, or the public events endpoint.
 
         Args:
             repo_owner (str): The owner of the repository.
             repo_name (str): The name of the repository.
             page (int): The page number of the events to fetch.
+            per_page (int): The page size (optional).
 
         Returns:
-            list: The list of fetched events.
+            str: The endpoint relative to the API base URL.
 
         Raises:
-            InvalidInputException: If both repo_owner and repo_name are not provided.
+            InvalidInputException: If only one of repo_owner and repo_name is provided.
         """
         endpoint = ""
         if repo_owner and not repo_name:
@@ -83,7 +143,100 @@ class GitHubEventsAnalyzer(GitHubAPI, EventAnalyzer):
             endpoint = f"repos/{repo_owner}/{repo_name}/"
 
         endpoint += f"events?page={page}"
-        return self.fetch(endpoint)
+        if per_page:
+            endpoint += f"&per_page={per_page}"
+        return endpoint
+
+    def repository_name(self, repo_owner, repo_name):
+        """
+        Returns the "owner/name" of the specified repository.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+
+        Returns:
+            str: The full repository name, or None when neither part is given.
+
+        Raises:
+            InvalidInputException: If only one of repo_owner and repo_name is provided.
+        """
+        if bool(repo_owner) != bool(repo_name):
+            raise InvalidInputException("Both Repo Owner and Repo Name are required!")
+        return f"{repo_owner}/{repo_name}" if repo_owner else None
+
+    @staticmethod
+    def parse_repositories(lines):
+        """
+        Parses "owner/name" lines, such as those of a repositories file, skipping blank lines and "#" comments.
+
+        Args:
+            lines (iterable): The lines to parse.
+
+        Returns:
+            list: (owner, name) tuples, in the order of the lines.
+
+        Raises:
+            InvalidInputException: If a line is not of the form "owner/name".
+        """
+        repositories = []
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            repo_owner, _, repo_name = line.partition('/')
+            if not repo_owner or not repo_name or '/' in repo_name:
+                raise InvalidInputException(f"Invalid repository '{line}', expected owner/name!")
+            repositories.append((repo_owner, repo_name))
+        return repositories
+
+    def last_page_number(self, headers):
+        """
+        Reads the number of the last page from the `Link` response header.
+
+        Args:
+            headers (dict): The response headers of the first page.
+
+        Returns:
+            int: The last page number, or 1 if the response was not paginated.
+        """
+        last_url = GitHubAPI.parse_link_header(headers.get("Link")).get("last")
+        if not last_url:
+            return 1
+        return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+
+    def deduplicate_events(self, pages):
+        """
+        Flattens pages of events, keeping the first occurrence of every event id.
+
+        Args:
+            pages (iterable): The pages of events in API order.
+
+        Returns:
+            list: The flattened, deduplicated list of events.
+        """
+        seen_ids = set()
+        return [event for page in pages for event in self.unseen_events(page, seen_ids)]
+
+    @staticmethod
+    def unseen_events(events, seen_ids):
+        """
+        Yields the events whose id is not in `seen_ids`, recording the ids of the yielded events.
+
+        Args:
+            events (iterable): The events to check.
+            seen_ids (set): The ids seen so far. Updated in place.
+
+        Yields:
+            dict: The events not seen before. Events without an id are always yielded.
+        """
+        for event in events:
+            event_id = event.get('id')
+            if event_id is not None:
+                if event_id in seen_ids:
+                    continue
+                seen_ids.add(event_id)
+            yield event
 
     def display_events(self, events):
         """
@@ -92,23 +245,22 @@ class GitHubEventsAnalyzer(GitHubAPI, EventAnalyzer):
         Args:
             events (list): The list of events to be displayed.
         """
-        for event in events:
-            print(f"Event: {event['type']}")
-            print(f"User: {event['actor']['login']}")
-            print(f"Timestamp: {event['created_at']}")
-            print("-------------------------------------------")
+        TextEventWriter(sys.stdout).write_events(events)
 
     def filter_events(self, events, event_type):
         """
         Filters the provided events based on the specified event type.
 
         Args:
-            events (list): The list of events to be filtered.
+            events (list, EventStore or ArchivedEvents): The list of events to be filtered.
             event_type (str): The type of events to include in the filter.
 
         Returns:
-            list: The filtered list of events.
+            list: The filtered list of events, or a collection of the same kind when given an `EventStore` or
+                `ArchivedEvents`.
         """
+        if is_queryable(events):
+            return events.filter(event_type)
         filtered_events = [event for event in events if event['type'] == event_type]
         return filtered_events
 
@@ -117,34 +269,356 @@ class GitHubEventsAnalyzer(GitHubAPI, EventAnalyzer):
         Calculates event statistics based on the provided events.
 
         Args:
-            events (list): The list of events to be used for calculating statistics.
+            events (list, EventStore or ArchivedEvents): The list of events to be used for calculating statistics.
 
         Returns:
             dict: A dictionary containing event types as keys and their respective counts as values.
         """
-        event_counts = {}
-        for event in events:
-            event_type = event['type']
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-        return event_counts
+        if is_queryable(events):
+            return events.event_statistics()
+        return EventAggregator([EventTypeCounts()]).add(events).event_statistics
 
     def identify_most_active_user(self, events):
         """
         Identifies the most active user based on the provided events.
 
         Args:
-            events (list): The list of events to be analyzed.
+            events (list, EventStore or ArchivedEvents): The list of events to be analyzed.
 
         Returns:
-            str: The username of the most active user.
+            str: The username of the most active user, or None if there are no events.
         """
-        user_counts = {}
-        for event in events:
-            username = event['actor']['login']
-            user_counts[username] = user_counts.get(username, 0) + 1
+        if is_queryable(events):
+            return events.most_active_user()
+        return EventAggregator([ActorCounts()]).add(events).most_active_user
+
+    def calculate_event_timeline(self, events, bucket='1h', by='type'):
+        """
+        Counts the events per time bucket and event type or actor.
+
+        Buckets are aligned to the Unix epoch, so "1d" buckets start at midnight UTC. Only non-empty buckets are
+        reported.
+
+        Args:
+            events (list, EventStore or ArchivedEvents): The list of events to be binned.
+            bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+            by (str): What events are counted by: 'type' or 'actor'.
+
+        Returns:
+            EventTimeline: The counts of the non-empty buckets.
+
+        Raises:
+            InvalidInputException: If the bucket width or the key is invalid.
+        """
+        from controllers.event_timeline import TIMELINE_KEYS, timeline_from_events  # deferred: it imports NumPy
+
+        bucket_seconds = parse_bucket(bucket)
+        if by not in TIMELINE_KEYS:
+            raise InvalidInputException(f"Invalid timeline key {by!r}, expected one of {', '.join(TIMELINE_KEYS)}!")
+        if is_queryable(events):
+            return events.timeline(bucket_seconds, by)
+        return timeline_from_events(events, bucket_seconds, by)
+
 
-        most_active_user = max(user_counts, key=user_counts.get)
-        return most_active_user
+class GitHubEventsAnalyzer(GitHubAPI, GitHubEventsAnalysis):
+    """
+    A class for fetching GitHub events and performing event analysis.
+
+    This class inherits from GitHubAPI and GitHubEventsAnalysis, combining their functionality to analyze GitHub events.
+
+    Attributes:
+        event_decoder (ProjectingEventDecoder): Decodes event pages into projected events, or None to keep the full
+            events as returned by the API.
+
+    Methods:
+        fetch_events(repo_owner, repo_name, page=1, per_page=None):
+            Fetches GitHub events for the specified repository.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                page (int): The page number of the events to fetch.
+                per_page (int): The page size (optional, API default when omitted).
+            Returns:
+                list: The list of fetched events.
+
+        fetch_all_events(repo_owner, repo_name, max_pages=10, concurrency=4):
+            Fetches every available page of GitHub events, fetching pages after the first concurrently.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                max_pages (int): The maximum number of pages to fetch.
+                concurrency (int): The maximum number of pages fetched in parallel.
+            Returns:
+                list: The list of fetched events, deduplicated by id, in API order.
+
+        iter_events(repo_owner, repo_name, page=1, max_pages=1, per_page=None, concurrency=1):
+            Yields GitHub events page by page, deduplicated by id, in API order.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                page (int): The first page to fetch.
+                max_pages (int): The maximum number of pages to fetch.
+                per_page (int): The page size (optional, API default when omitted).
+                concurrency (int): The maximum number of pages fetched in parallel.
+            Yields:
+                dict: The fetched events.
+
+        iter_event_pages(repo_owner, repo_name, page=1, max_pages=1, per_page=None, concurrency=1):
+            Yields the events of every page as a list, deduplicated by id, in API order.
+
+        fetch_org_repositories(org, max_pages=10):
+            Fetches the repositories of an organization.
+            Args:
+                org (str): The login of the organization.
+                max_pages (int): The maximum number of pages of 100 repositories to fetch.
+            Returns:
+                list: (owner, name) tuples of the repositories.
+
+        aggregate_repository(repo_owner, repo_name, event_type=None, all_pages=False, max_pages=10, approximate=False,
+                             sketch_error=0.001, sketch_confidence=0.99, distinct_error=0.01):
+            Streams the events of a repository into an `EventAggregator`.
+            Returns:
+                EventAggregator: The event statistics and the most active user of the repository.
+
+        analyze_repositories(repositories, event_type=None, all_pages=False, max_pages=10, concurrency=8,
+                             approximate=False, sketch_error=0.001, sketch_confidence=0.99, distinct_error=0.01):
+            Aggregates the events of many repositories on a shared pool of worker threads.
+            Args:
+                repositories (list): (owner, name) tuples of the repositories to analyze.
+                event_type (str): The type of events to filter (optional).
+                all_pages (bool): Whether to fetch every available page instead of the first one.
+                max_pages (int): The maximum number of pages per repository when all_pages is set.
+                concurrency (int): The number of repositories analyzed in parallel.
+                approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+                sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+                sketch_confidence (float): With approximate, the probability that a count is within the bound.
+                distinct_error (float): With approximate, the relative standard error of the distinct counts.
+            Returns:
+                dict: The `EventAggregator`, or the raised exception, keyed by "owner/name".
+
+        instrument(name, events):
+            Passes the events flowing out of a pipeline stage through the stage hook of every registered hook.
+
+        phase(name):
+            Returns a context manager reporting a phase of work to every registered hook.
+
+    Analysis methods are inherited from `GitHubEventsAnalysis`.
+
+    """
+
+    event_decoder = None
+
+    def fetch_events(self, repo_owner, repo_name, page=1, per_page=None):
+        """
+        Fetches GitHub events for the specified repository.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            page (int): The page number of the events to fetch.
+            per_page (int): The page size (optional, API default when omitted).
+
+        Returns:
+            list: The list of fetched events.
+
+        Raises:
+            InvalidInputException: If both repo_owner and repo_name are not provided.
+        """
+        return self.fetch(self.events_endpoint(repo_owner, repo_name, page, per_page), self.event_decoder)
+
+    def fetch_all_events(self, repo_owner, repo_name, max_pages=10, concurrency=4):
+        """
+        Fetches every available page of GitHub events.
+
+        The first page is requested with the maximum page size and its `Link: rel="last"` header determines how many
+        pages exist. The remaining pages are then fetched in parallel on a bounded thread pool sharing the connection
+        pool. Events that moved between pages while fetching are deduplicated by id.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            max_pages (int): The maximum number of pages to fetch.
+            concurrency (int): The maximum number of pages fetched in parallel.
+
+        Returns:
+            list: The list of fetched events, deduplicated by id, in API order.
+
+        Raises:
+            InvalidInputException: If both repo_owner and repo_name are not provided.
+        """
+        return list(self.iter_events(repo_owner, repo_name, 1, max_pages, self.MAX_PER_PAGE, concurrency))
+
+    def iter_events(self, repo_owner, repo_name, page=1, max_pages=1, per_page=None, concurrency=1):
+        """
+        Yields GitHub events page by page, starting at the given page.
+
+        The number of available pages is read from the `Link: rel="last"` header of the first page. With a concurrency
+        of one, each following page is only requested once the previous one has been consumed, so memory use does not
+        grow with the number of pages. Events are deduplicated by id and yielded in API order.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            page (int): The first page to fetch.
+            max_pages (int): The maximum number of pages to fetch.
+            per_page (int): The page size (optional, API default when omitted).
+            concurrency (int): The maximum number of pages fetched in parallel.
+
+        Yields:
+            dict: The fetched events.
+
+        Raises:
+            InvalidInputException: If both repo_owner and repo_name are not provided.
+        """
+        for events in self.iter_event_pages(repo_owner, repo_name, page, max_pages, per_page, concurrency):
+            yield from events
+
+    def iter_event_pages(self, repo_owner, repo_name, page=1, max_pages=1, per_page=None, concurrency=1):
+        """
+        Yields the events of every page as a list, like `iter_events` but keeping the pages apart.
+
+        Each page is ordered by the API on its own, so the pages can be merged as separate runs.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            page (int): The first page to fetch.
+            max_pages (int): The maximum number of pages to fetch.
+            per_page (int): The page size (optional, API default when omitted).
+            concurrency (int): The maximum number of pages fetched in parallel.
+
+        Yields:
+            list: The events of a page not seen on an earlier page, in API order.
+
+        Raises:
+            InvalidInputException: If both repo_owner and repo_name are not provided.
+        """
+        endpoint = self.events_endpoint(repo_owner, repo_name, page, per_page)
+        first_page, headers = self.fetch_with_headers(endpoint, self.event_decoder)
+        seen_ids = set()
+        yield list(self.unseen_events(first_page, seen_ids))
+
+        remaining_pages = range(page + 1, min(self.last_page_number(headers), page + max_pages - 1) + 1)
+        if not remaining_pages:
+            return
+
+        def fetch_page(number):
+            return self.fetch_events(repo_owner, repo_name, number, per_page)
+
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for events in executor.map(fetch_page, remaining_pages):
+                    yield list(self.unseen_events(events, seen_ids))
+        else:
+            for number in remaining_pages:
+                yield list(self.unseen_events(fetch_page(number), seen_ids))
+
+    def instrument(self, name, events):
+        """
+        Passes the events flowing out of a pipeline stage through the stage hook of every registered hook.
+
+        Args:
+            name (str): The name of the stage.
+            events (iterable): The events produced by the stage.
+
+        Returns:
+            iterable: The events, unchanged and unwrapped when no hook is registered.
+        """
+        for hook in self.hooks:
+            events = hook.stage(name, events)
+        return events
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Returns a context manager reporting a phase of work to every registered hook.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        with ExitStack() as stack:
+            for hook in self.hooks:
+                stack.enter_context(hook.phase(name))
+            yield
+
+    def fetch_org_repositories(self, org, max_pages=10):
+        """
+        Fetches the repositories of an organization.
+
+        Args:
+            org (str): The login of the organization.
+            max_pages (int): The maximum number of pages of 100 repositories to fetch.
+
+        Returns:
+            list: (owner, name) tuples of the repositories, in API order.
+        """
+        endpoint = f"orgs/{org}/repos?per_page={self.MAX_PER_PAGE}&page="
+        first_page, headers = self.fetch_with_headers(endpoint + "1")
+        pages = [first_page]
+        for page in range(2, min(self.last_page_number(headers), max_pages) + 1):
+            pages.append(self.fetch(endpoint + str(page)))
+        return [tuple(repository['full_name'].split('/', 1)) for repositories in pages for repository in repositories]
+
+    def aggregate_repository(self, repo_owner, repo_name, event_type=None, all_pages=False, max_pages=10,
+                             approximate=False, sketch_error=0.001, sketch_confidence=0.99, distinct_error=0.01):
+        """
+        Streams the events of a repository into an `EventAggregator`, without keeping the events.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            event_type (str): The type of events to filter (optional).
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set.
+            approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+            sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+            sketch_confidence (float): With approximate, the probability that a count is within the bound.
+            distinct_error (float): With approximate, the relative standard error of the distinct counts.
+
+        Returns:
+            EventAggregator: The event statistics and the most active user of the repository.
+        """
+        if all_pages:
+            events = self.iter_events(repo_owner, repo_name, 1, max_pages, self.MAX_PER_PAGE)
+        else:
+            events = self.iter_events(repo_owner, repo_name)
+        if event_type:
+            events = filter_stage(events, event_type)
+        return EventAggregator.default(1, approximate, sketch_error, sketch_confidence, distinct_error).add(events)
+
+    def analyze_repositories(self, repositories, event_type=None, all_pages=False, max_pages=10, concurrency=8,
+                             approximate=False, sketch_error=0.001, sketch_confidence=0.99, distinct_error=0.01):
+        """
+        Aggregates the events of many repositories on a shared pool of worker threads.
+
+        All workers share this analyzer's connection pool. Each repository's pages are fetched one after another by
+        its worker, so at most `concurrency` requests are in flight. A failing repository does not stop the others;
+        its exception is returned in place of the result.
+
+        Args:
+            repositories (list): (owner, name) tuples of the repositories to analyze.
+            event_type (str): The type of events to filter (optional).
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages per repository when all_pages is set.
+            concurrency (int): The number of repositories analyzed in parallel.
+            approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+            sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+            sketch_confidence (float): With approximate, the probability that a count is within the bound.
+            distinct_error (float): With approximate, the relative standard error of the distinct counts.
+
+        Returns:
+            dict: The `EventAggregator`, or the raised exception, keyed by "owner/name" in the order of repositories.
+        """
+        def analyze(repository):
+            try:
+                return self.aggregate_repository(*repository, event_type, all_pages, max_pages, approximate,
+                                                 sketch_error, sketch_confidence, distinct_error)
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = executor.map(analyze, repositories)
+            return {f"{owner}/{name}": result for (owner, name), result in zip(repositories, results)}
 
 
 class GitHubEventsAnalyzerCLI(GitHubEventsAnalyzer):
@@ -152,10 +626,12 @@ class GitHubEventsAnalyzerCLI(GitHubEventsAnalyzer):
     A class that extends GitHubEventsAnalyzer to provide a command-line interface for analyzing GitHub events.
 
     This class inherits from GitHubEventsAnalyzer and provides additional methods for fetching and displaying events
-    along with event statistics.
+    along with event statistics. Event pages are decoded straight into the fields the CLI reads.
 
     Methods:
-        fetch_and_display_events(repo_owner, repo_name, event_type=None, page=1, sort_order='chronological'):
+        fetch_and_display_events(repo_owner, repo_name, event_type=None, page=1, sort_order='chronological',
+                                 all_pages=False, max_pages=10, concurrency=4, output_format='text', output=None,
+                                 latest=None):
             Fetches GitHub events, filters them based on event type, and displays them along with event statistics.
             Args:
                 repo_owner (str): The owner of the repository.
@@ -163,36 +639,486 @@ class GitHubEventsAnalyzerCLI(GitHubEventsAnalyzer):
                 event_type (str): The type of events to filter (optional).
                 page (int): The page number of the events to fetch.
                 sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+                all_pages (bool): Whether to fetch every available page instead of a single one.
+                max_pages (int): The maximum number of pages to fetch when all_pages is set.
+                concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+                output_format (str): The output format ('text', 'jsonl' or 'csv').
+                output (str): The path of the output file (optional, standard output by default).
+                latest (int): Only display this many of the most recent events (optional).
+
+        archive_and_display_events(repo_owner, repo_name, archive_path, event_type=None, sort_order='chronological',
+                                   max_pages=10, output_format='text', output=None, latest=None):
+            Syncs new events into a SQLite archive and displays the archived events along with event statistics.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                archive_path (str): The path of the SQLite archive.
+                event_type (str): The type of events to filter (optional).
+                sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+                max_pages (int): The maximum number of pages to fetch while syncing.
+                output_format (str): The output format ('text', 'jsonl' or 'csv').
+                output (str): The path of the output file (optional, standard output by default).
+                latest (int): Only display this many of the most recent events (optional).
+
+        analyze_and_display_repositories(repositories, event_type=None, all_pages=False, max_pages=10, concurrency=8,
+                                         approximate=False, sketch_error=0.001, sketch_confidence=0.99,
+                                         distinct_error=0.01):
+            Analyzes many repositories and displays per-repository and combined event statistics.
+            Args:
+                repositories (list): (owner, name) tuples of the repositories to analyze.
+                event_type (str): The type of events to filter (optional).
+                all_pages (bool): Whether to fetch every available page instead of the first one.
+                max_pages (int): The maximum number of pages per repository when all_pages is set.
+                concurrency (int): The number of repositories analyzed in parallel.
+                approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+                sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+                sketch_confidence (float): With approximate, the probability that a count is within the bound.
+                distinct_error (float): With approximate, the relative standard error of the distinct counts.
+
+        watch_and_display_events(repo_owner, repo_name, event_type=None, output_format='text', output=None,
+                                 max_polls=None):
+            Polls for new GitHub events and displays them, with running event statistics, as they arrive.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                event_type (str): The type of events to display (optional).
+                output_format (str): The output format ('text', 'jsonl' or 'csv').
+                output (str): The path of the output file (optional, standard output by default).
+                max_polls (int): The number of polls after which to stop (optional, watches until interrupted).
+
+        timeline_and_display_events(repo_owner, repo_name, bucket='1h', by='type', event_type=None, page=1,
+                                    all_pages=False, max_pages=10, concurrency=4, archive_path=None,
+                                    output_format='text', output=None):
+            Fetches or syncs GitHub events and displays their activity per time bucket.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+                by (str): What events are counted by: 'type' or 'actor'.
+                event_type (str): The type of events to filter (optional).
+                page (int): The page number of the events to fetch.
+                all_pages (bool): Whether to fetch every available page instead of a single one.
+                max_pages (int): The maximum number of pages to fetch when all_pages is set or while syncing.
+                concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+                archive_path (str): The path of a SQLite archive to sync and bin instead of a single fetch (optional).
+                output_format (str): The output format ('text', 'jsonl' or 'csv').
+                output (str): The path of the output file (optional, standard output by default).
+
+        explore_events(repo_owner, repo_name, all_pages=False, max_pages=10, concurrency=4, stdin=None,
+                       stdout=None):
+            Fetches GitHub events once, indexes them and answers queries in an interactive shell.
+            Args:
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                all_pages (bool): Whether to fetch every available page instead of the first one.
+                max_pages (int): The maximum number of pages to fetch when all_pages is set or while refreshing.
+                concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+                stdin (file): The stream commands are read from (optional, standard input by default).
+                stdout (file): The stream results are written to (optional, standard output by default).
+
+        save_events_snapshot(snapshot_path, repo_owner=None, repo_name=None, event_type=None, all_pages=False,
+                             max_pages=10, concurrency=4, files=None):
+            Fetches GitHub events, or reads GH Archive files, and saves them to a memory-mapped snapshot.
+            Args:
+                snapshot_path (str): The path of the snapshot file.
+                repo_owner (str): The owner of the repository.
+                repo_name (str): The name of the repository.
+                event_type (str): The type of events to keep (optional).
+                all_pages (bool): Whether to fetch every available page instead of the first one.
+                max_pages (int): The maximum number of pages to fetch when all_pages is set.
+                concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+                files (list): GH Archive files to read instead of fetching (optional).
+
+        snapshot_and_display_events(snapshot_path, event_type=None, sort_order='chronological', output_format='text',
+                                    output=None, latest=None):
+            Maps a snapshot into memory and displays its events along with event statistics.
+            Args:
+                snapshot_path (str): The path of the snapshot file.
+                event_type (str): The type of events to filter (optional).
+                sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+                output_format (str): The output format ('text', 'jsonl' or 'csv').
+                output (str): The path of the output file (optional, standard output by default).
+                latest (int): Only display this many of the most recent events (optional).
+
+        ingest_and_display_archive(files, repo_owner=None, repo_name=None, event_type=None, workers=None,
+                                   approximate=False, checkpoint=None, checkpoint_interval=30.0, sketch_error=0.001,
+                                   sketch_confidence=0.99, distinct_error=0.01):
+            Aggregates GH Archive files on a process pool and displays the event statistics and throughput.
+            Args:
+                files (list): The paths of the GH Archive `.json.gz` files.
+                repo_owner (str): The owner of the repository to keep (optional).
+                repo_name (str): The name of the repository to keep (optional).
+                event_type (str): The type of events to keep (optional).
+                workers (int): The number of worker processes (optional, defaults to the number of CPUs).
+                approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+                checkpoint (str): The statistics snapshot to resume from and save progress to (optional).
+                checkpoint_interval (float): The minimum number of seconds between periodic checkpoints.
+                sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+                sketch_confidence (float): With approximate, the probability that a count is within the bound.
+                distinct_error (float): With approximate, the relative standard error of the distinct counts.
 
     """
 
-    def fetch_and_display_events(self, repo_owner, repo_name, event_type=None, page=1, sort_order='chronological'):
+    @cached_property
+    def event_decoder(self):
+        """
+        Decodes event pages straight into the fields the CLI reads. Built on first use; assign None to decode them
+        fully.
+        """
+        from controllers.event_decoder import ProjectingEventDecoder
+
+        return ProjectingEventDecoder()
+
+    def fetch_and_display_events(self, repo_owner, repo_name, event_type=None, page=1, sort_order='chronological',
+                                 all_pages=False, max_pages=10, concurrency=4, output_format='text', output=None,
+                                 latest=None):
         """
         Fetches GitHub events, filters them based on event type, and displays them along with event statistics.
 
+        Events stream from `iter_events` through the filter and projection stages one at a time; the projection stage
+        is skipped when `event_decoder` already projected the events while decoding. The API returns events newest
+        first, so the ordering stage only reverses them for chronological output instead of sorting. With all_pages,
+        every page goes through these stages as a separate run and the ordered runs are k-way merged. Statistics are
+        accumulated over every ordered event, so ties for the most active user go to the first one displayed; with
+        `latest`, only that many events are then kept, on a heap.
+
         Args:
             repo_owner (str): The owner of the repository.
             repo_name (str): The name of the repository.
             event_type (str): The type of events to filter (optional).
             page (int): The page number of the events to fetch.
             sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+            all_pages (bool): Whether to fetch every available page instead of a single one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set.
+            concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+            output_format (str): The output format ('text', 'jsonl' or 'csv').
+            output (str): The path of the output file (optional, standard output by default).
+            latest (int): Only display this many of the most recent events (optional).
         """
-        events = self.fetch_events(repo_owner, repo_name, page)
-        if event_type:
-            events = self.filter_events(events, event_type)
+        if all_pages:
+            pages = self.iter_event_pages(repo_owner, repo_name, 1, max_pages, self.MAX_PER_PAGE, concurrency)
+        else:
+            pages = [self.iter_events(repo_owner, repo_name, page)]
+
+        reverse = sort_order == 'reverse-chronological'
+        runs = []
+        for events in pages:
+            events = self.instrument("fetch", events)
+            if event_type:
+                events = self.instrument("filter", filter_stage(events, event_type))
+            if self.event_decoder is None:
+                events = self.instrument("project", project_stage(events))
+            runs.append(self.instrument("order", order_stage(events, reverse)))
+        events = runs[0] if len(runs) == 1 else self.instrument("merge", merge_stage(*runs, reverse=reverse))
+
+        aggregator = EventAggregator.default(top_k=1)
+        events = self.instrument("aggregate", aggregator.accumulate(events))
+        if latest:
+            events = self.instrument("latest", latest_stage(events, latest, reverse))
+
+        with create_writer(output_format, output) as writer, self.phase("write"):
+            writer.write_events(events)
+            writer.write_summary(aggregator.event_statistics, aggregator.most_active_user)
+
+    def archive_and_display_events(self, repo_owner, repo_name, archive_path, event_type=None,
+                                   sort_order='chronological', max_pages=10, output_format='text', output=None,
+                                   latest=None):
+        """
+        Syncs new events into a SQLite archive and displays the archived events along with event statistics.
+
+        Only events newer than the newest archived one are fetched. Filtering, ordering, statistics and the most
+        active user then run as indexed SQL over the whole archived history of the repository.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            archive_path (str): The path of the SQLite archive.
+            event_type (str): The type of events to filter (optional).
+            sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+            max_pages (int): The maximum number of pages to fetch while syncing.
+            output_format (str): The output format ('text', 'jsonl' or 'csv').
+            output (str): The path of the output file (optional, standard output by default).
+            latest (int): Only display this many of the most recent events (optional).
+        """
+        from controllers.event_archive import EventArchive  # deferred: it imports SQLite and NumPy
+
+        with EventArchive(archive_path) as archive:
+            with self.phase("sync"):
+                archive.sync(self, repo_owner, repo_name, max_pages)
+
+            events = archive.events(self.repository_name(repo_owner, repo_name))
+            if event_type:
+                events = self.filter_events(events, event_type)
+            reverse = sort_order == 'reverse-chronological'
+            events = events.order_by_time(reverse)
+            ordered = latest_stage(events, latest, reverse) if latest else events
+
+            with create_writer(output_format, output) as writer, self.phase("write"):
+                writer.write_events(self.instrument("query", ordered))
+                with self.phase("query"):
+                    event_statistics = self.calculate_event_statistics(events)
+                    most_active_user = self.identify_most_active_user(events)
+                writer.write_summary(event_statistics, most_active_user)
+
+    def analyze_and_display_repositories(self, repositories, event_type=None, all_pages=False, max_pages=10,
+                                         concurrency=8, approximate=False, sketch_error=0.001, sketch_confidence=0.99,
+                                         distinct_error=0.01):
+        """
+        Analyzes many repositories and displays per-repository and combined event statistics.
+
+        Repositories that fail are reported and left out of the combined statistics; the rest of the batch continues.
+        With `approximate`, actors are counted with sketches and the estimated number of distinct actors across the
+        batch is displayed as well.
 
-        if sort_order == 'reverse-chronological':
-            events = sorted(events, key=lambda event: event['created_at'], reverse=True)
+        Args:
+            repositories (list): (owner, name) tuples of the repositories to analyze.
+            event_type (str): The type of events to filter (optional).
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages per repository when all_pages is set.
+            concurrency (int): The number of repositories analyzed in parallel.
+            approximate (bool): Whether to count actors and repositories with sketches in bounded memory.
+            sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+            sketch_confidence (float): With approximate, the probability that a count is within the bound.
+            distinct_error (float): With approximate, the relative standard error of the distinct counts.
+        """
+        sketch_settings = (sketch_error, sketch_confidence, distinct_error)
+        results = self.analyze_repositories(repositories, event_type, all_pages, max_pages, concurrency, approximate,
+                                            *sketch_settings)
+        writer = TextEventWriter(sys.stdout)
+        combined = EventAggregator.default(1, approximate, *sketch_settings)
+        failed = 0
+
+        for repository, result in results.items():
+            print(f"Repository: {repository}")
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"Failed: {result}")
+            else:
+                combined.merge(result)
+                writer.write_summary(result.event_statistics, result.most_active_user)
+            print(TextEventWriter.SEPARATOR)
+
+        print(f"Combined ({len(results) - failed} of {len(results)} repositories, {failed} failed)")
+        writer.write_summary(combined.event_statistics, combined.most_active_user)
+        if approximate:
+            print(f"Distinct Actors (approximate): {combined.metric('distinct_actors').result()}")
+
+    def watch_and_display_events(self, repo_owner, repo_name, event_type=None, output_format='text', output=None,
+                                 max_polls=None):
+        """
+        Polls for new GitHub events and displays them, with running event statistics, as they arrive.
+
+        Polls follow the server-advised `X-Poll-Interval` and only events not seen before are displayed, oldest
+        first, followed by the statistics and most active user over every event displayed so far. Interrupting the
+        watch (Ctrl-C) ends it cleanly.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            event_type (str): The type of events to display (optional).
+            output_format (str): The output format ('text', 'jsonl' or 'csv').
+            output (str): The path of the output file (optional, standard output by default).
+            max_polls (int): The number of polls after which to stop (optional, watches until interrupted).
+        """
+        watcher = EventWatcher(self, repo_owner, repo_name, event_type)
+        aggregator = watcher.aggregator
+        with create_writer(output_format, output) as writer:
+            try:
+                for new_events in watcher.watch(max_polls):
+                    if new_events:
+                        writer.write_events(new_events)
+                        writer.write_summary(aggregator.event_statistics, aggregator.most_active_user)
+            except KeyboardInterrupt:
+                pass
+
+    def timeline_and_display_events(self, repo_owner, repo_name, bucket='1h', by='type', event_type=None, page=1,
+                                    all_pages=False, max_pages=10, concurrency=4, archive_path=None,
+                                    output_format='text', output=None):
+        """
+        Fetches or syncs GitHub events and displays their activity per time bucket.
+
+        With an archive, new events are synced first and the timeline covers the whole archived history of the
+        repository, binned with a SQL aggregate. Otherwise the fetched events stream straight into the timeline.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            bucket (str): The bucket width, e.g. '15m', '1h' or '1d'.
+            by (str): What events are counted by: 'type' or 'actor'.
+            event_type (str): The type of events to filter (optional).
+            page (int): The page number of the events to fetch.
+            all_pages (bool): Whether to fetch every available page instead of a single one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set or while syncing.
+            concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+            archive_path (str): The path of a SQLite archive to sync and bin instead of a single fetch (optional).
+            output_format (str): The output format ('text', 'jsonl' or 'csv').
+            output (str): The path of the output file (optional, standard output by default).
+        """
+        if archive_path:
+            from controllers.event_archive import EventArchive  # deferred: it imports SQLite and NumPy
+
+            with EventArchive(archive_path) as archive:
+                with self.phase("sync"):
+                    archive.sync(self, repo_owner, repo_name, max_pages)
+                events = archive.events(self.repository_name(repo_owner, repo_name))
+                if event_type:
+                    events = self.filter_events(events, event_type)
+                with self.phase("timeline"):
+                    timeline = self.calculate_event_timeline(events, bucket, by)
+        else:
+            if all_pages:
+                events = self.iter_events(repo_owner, repo_name, 1, max_pages, self.MAX_PER_PAGE, concurrency)
+            else:
+                events = self.iter_events(repo_owner, repo_name, page)
+            events = self.instrument("fetch", events)
+            if event_type:
+                events = self.instrument("filter", filter_stage(events, event_type))
+            with self.phase("timeline"):
+                timeline = self.calculate_event_timeline(events, bucket, by)
+
+        with create_writer(output_format, output) as writer, self.phase("write"):
+            writer.write_timeline(timeline)
+
+    def explore_events(self, repo_owner, repo_name, all_pages=False, max_pages=10, concurrency=4, stdin=None,
+                       stdout=None):
+        """
+        Fetches GitHub events once, indexes them and answers queries in an interactive shell.
+
+        The events are indexed by time, type and actor in an `EventIndex`, so filter, sort, statistics and top-user
+        queries take time proportional to their results instead of another fetch and scan. The shell's `refresh`
+        command fetches only the events newer than the indexed ones.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set or while refreshing.
+            concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+            stdin (file): The stream commands are read from (optional, standard input by default).
+            stdout (file): The stream results are written to (optional, standard output by default).
+        """
+        from controllers.event_index import EventIndex  # deferred: it imports NumPy
+
+        index = EventIndex()
+        with self.phase("index"):
+            index.add(self.iter_events(repo_owner, repo_name, 1, max_pages if all_pages else 1, self.MAX_PER_PAGE,
+                                       concurrency))
+        shell = EventShell(index, lambda: index.refresh(self, repo_owner, repo_name, max_pages), stdin, stdout)
+        shell.intro = f"Indexed {len(index)} events. {shell.intro}"
+        shell.cmdloop()
+
+    def save_events_snapshot(self, snapshot_path, repo_owner=None, repo_name=None, event_type=None, all_pages=False,
+                             max_pages=10, concurrency=4, files=None):
+        """
+        Fetches GitHub events, or reads GH Archive files, and saves them to a memory-mapped snapshot.
+
+        The events are decoded once into an `EventStore`; later runs map the snapshot with `--source snapshot`
+        instead of decoding them again.
+
+        Args:
+            snapshot_path (str): The path of the snapshot file.
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            event_type (str): The type of events to keep (optional).
+            all_pages (bool): Whether to fetch every available page instead of the first one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set.
+            concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+            files (list): GH Archive files to read instead of fetching (optional). `repo_owner`, `repo_name` and
+                `event_type` then restrict the events kept.
+        """
+        from controllers.event_snapshot import save_snapshot  # deferred: they import NumPy
+        from controllers.event_store import EventStore
+
+        if files:
+            from controllers.gharchive import iter_archive_events
+
+            repo = self.repository_name(repo_owner, repo_name)
+            events = chain.from_iterable(iter_archive_events(path, repo, event_type) for path in files)
         else:
-            events = sorted(events, key=lambda event: event['created_at'])
+            events = self.iter_events(repo_owner, repo_name, 1, max_pages if all_pages else 1, self.MAX_PER_PAGE,
+                                      concurrency)
+            events = self.instrument("fetch", events)
+            if event_type:
+                events = self.instrument("filter", filter_stage(events, event_type))
+        with self.phase("store"):
+            store = EventStore.from_events(events)
+        with self.phase("write"):
+            size = save_snapshot(store, snapshot_path)
+        print(f"Saved {len(store)} events to {snapshot_path} ({size:,} bytes)")
 
-        self.display_events(events)
+    def snapshot_and_display_events(self, snapshot_path, event_type=None, sort_order='chronological',
+                                    output_format='text', output=None, latest=None):
+        """
+        Maps a snapshot into memory and displays its events along with event statistics.
+
+        Loading does not read the snapshot: filtering and ordering run over its mapped columns, statistics and the
+        most active user over the ordered columns, like a fetch, and only the displayed events are rebuilt as
+        dictionaries.
+
+        Args:
+            snapshot_path (str): The path of the snapshot file.
+            event_type (str): The type of events to filter (optional).
+            sort_order (str): The sort order of the events ('chronological' or 'reverse-chronological').
+            output_format (str): The output format ('text', 'jsonl' or 'csv').
+            output (str): The path of the output file (optional, standard output by default).
+            latest (int): Only display this many of the most recent events (optional).
+        """
+        from controllers.event_snapshot import load_snapshot  # deferred: it imports NumPy
+
+        store = load_snapshot(snapshot_path)
+        if event_type:
+            with self.phase("filter"):
+                store = self.filter_events(store, event_type)
+
+        reverse = sort_order == 'reverse-chronological'
+        with self.phase("order"):
+            store = ordered = store.order_by_time(reverse)
+            if latest:
+                ordered = store.select(range(min(latest, len(store))) if reverse else
+                                       range(max(len(store) - latest, 0), len(store)))
+
+        with create_writer(output_format, output) as writer, self.phase("write"):
+            writer.write_events(ordered)
+            writer.write_summary(self.calculate_event_statistics(store), self.identify_most_active_user(store))
+
+    def ingest_and_display_archive(self, files, repo_owner=None, repo_name=None, event_type=None, workers=None,
+                                   approximate=False, checkpoint=None, checkpoint_interval=30.0, sketch_error=0.001,
+                                   sketch_confidence=0.99, distinct_error=0.01):
+        """
+        Aggregates GH Archive files on a process pool and displays the event statistics and throughput.
+
+        Args:
+            files (list): The paths of the GH Archive `.json.gz` files.
+            repo_owner (str): The owner of the repository to keep (optional).
+            repo_name (str): The name of the repository to keep (optional).
+            event_type (str): The type of events to keep (optional).
+            workers (int): The number of worker processes (optional, defaults to the number of CPUs).
+            approximate (bool): Whether to count actors and repositories with sketches in bounded memory, and display
+                the estimated number of distinct actors.
+            checkpoint (str): The statistics snapshot to resume from and save progress to (optional). Files it already
+                covers are skipped and the statistics include theirs.
+            checkpoint_interval (float): The minimum number of seconds between periodic checkpoints.
+            sketch_error (float): With approximate, the overcount bound of the counts as a fraction of all events.
+            sketch_confidence (float): With approximate, the probability that a count is within the bound.
+            distinct_error (float): With approximate, the relative standard error of the distinct counts.
+        """
+        from controllers.gharchive import GHArchiveIngestor  # deferred: only GH Archive runs need it
+
+        repo = self.repository_name(repo_owner, repo_name)
+        ingestor = GHArchiveIngestor(workers=workers, approximate=approximate, checkpoint_interval=checkpoint_interval,
+                                     sketch_error=sketch_error, sketch_confidence=sketch_confidence,
+                                     distinct_error=distinct_error)
+        result = ingestor.ingest(files, repo, event_type, checkpoint)
 
-        event_statistics = self.calculate_event_statistics(events)
         print("Event Statistics:")
-        for event_type, count in event_statistics.items():
+        for event_type, count in result.aggregator.event_statistics.items():
             print(f"{event_type}: {count}")
 
-        most_active_user = self.identify_most_active_user(events)
-        print(f"Most Active User: {most_active_user}")
-
+        print(f"Most Active User: {result.aggregator.most_active_user}")
+        if approximate:
+            print(f"Distinct Actors (approximate): {result.aggregator.metric('distinct_actors').result()}")
+        if result.skipped:
+            print(f"Resumed from {checkpoint}: skipped {result.skipped} files already ingested")
+        print(f"Ingested {result.matched} of {result.scanned} events from {result.files} files in "
+              f"{result.elapsed:.2f}s ({result.events_per_second:,.0f} events/s, "
+              f"{result.events_per_second_per_core:,.0f} events/s per core on {result.workers} workers)")
@@ -0,0 +1,334 @@
+"""
+instrumentation.py
+
+A Python module providing hooks into the request and event pipeline, and per-phase instrumentation built on them.
+
+This module contains the `Hook` base class, whose no-op callbacks `GitHubAPI` and `GitHubEventsAnalyzer` invoke for
+every request, cache hit, JSON decode, pipeline stage and phase, and the `Instrumentation` hook, which turns those
+callbacks into timers and counters: requests, bytes downloaded, cache hits, events per stage, peak memory through
+`tracemalloc`, and the time spent in each phase.
+
+Phase times are self times. Pipeline stages are lazy, so the time a stage spends waiting for the stage before it, and
+the time spent in requests and decoding, is attributed to that stage or phase and not counted twice. For requests made
+on the calling thread the phase times add up to the wall-clock time of the run; requests made on worker threads, as
+with concurrent page fetching, overlap with it and their network time is the sum over all threads.
+
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+METRIC_PREFIX = "github_events"
+
+
+class Hook:
+    """
+    A base class for request and pipeline hooks. Every callback does nothing unless overridden.
+
+    Methods:
+        on_request(url, status_code, size, seconds):
+            Called after every HTTP response.
+
+        on_cache_hit(url, revalidated):
+            Called when a response is served from the cache.
+
+        on_decode(size, seconds):
+            Called after a response body is decoded from JSON.
+
+        stage(name, events):
+            Wraps the events flowing out of a pipeline stage.
+
+        phase(name):
+            Returns a context manager around a phase of work that is not a stage.
+    """
+
+    def on_request(self, url, status_code, size, seconds):
+        """
+        Called after every HTTP response.
+
+        Args:
+            url (str): The requested URL.
+            status_code (int): The status code of the response.
+            size (int): The number of bytes downloaded.
+            seconds (float): The duration of the request, including retries.
+        """
+
+    def on_cache_hit(self, url, revalidated):
+        """
+        Called when a response is served from the cache.
+
+        Args:
+            url (str): The requested URL.
+            revalidated (bool): True after a `304 Not Modified`, False if no request was sent.
+        """
+
+    def on_decode(self, size, seconds):
+        """
+        Called after a response body is decoded from JSON.
+
+        Args:
+            size (int): The size of the body in bytes.
+            seconds (float): The duration of the decoding.
+        """
+
+    def stage(self, name, events):
+        """
+        Wraps the events flowing out of a pipeline stage.
+
+        Args:
+            name (str): The name of the stage.
+            events (iterable): The events produced by the stage.
+
+        Returns:
+            iterable: The events, unchanged.
+        """
+        return events
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Returns a context manager around a phase of work that is not a stage.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        yield
+
+
+class Instrumentation(Hook):
+    """
+    A hook collecting per-phase timers and counters.
+
+    Attributes:
+        trace_memory (bool): Whether peak memory is measured with `tracemalloc`.
+        phases (dict): The self time in seconds of every phase and stage, in first-seen order.
+        stage_events (dict): The number of events out of every stage.
+        counters (dict): The "requests", "bytes_downloaded", "cache_hits", "not_modified" and "decoded_bytes" counts.
+        peak_memory (int): The peak traced memory in bytes, once stopped with `trace_memory` set.
+        wall_time (float): The duration between `start()` and `stop()` in seconds.
+
+    Methods:
+        start() / stop():
+            Start and stop the run, including memory tracing.
+
+        to_dict():
+            Returns the measurements as a dictionary.
+
+        summary():
+            Returns a human readable summary.
+
+        to_prometheus():
+            Returns the measurements in the Prometheus text exposition format.
+
+    Example Usage:
+        instrumentation = Instrumentation()
+        analyzer = GitHubEventsAnalyzerCLI(hooks=[instrumentation])
+        with instrumentation:
+            analyzer.fetch_and_display_events("owner", "repo", all_pages=True)
+        print(instrumentation.summary(), file=sys.stderr)
+
+    """
+
+    def __init__(self, trace_memory=True):
+        """
+        Initializes a new instance of the Instrumentation class.
+
+        Args:
+            trace_memory (bool, optional): Whether to measure peak memory with `tracemalloc`, which slows Python
+                allocations down noticeably. Defaults to True.
+        """
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.stage_events = {}
+        self.counters = {"requests": 0, "bytes_downloaded": 0, "cache_hits": 0, "not_modified": 0,
+                         "decoded_bytes": 0}
+        self.peak_memory = None
+        self.wall_time = None
+        self._started = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts the run, and memory tracing when enabled.
+        """
+        if self.trace_memory:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """
+        Stops the run, recording the wall-clock time and the peak traced memory.
+        """
+        self.wall_time = time.perf_counter() - self._started
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, seconds):
+        """
+        Adds time measured elsewhere to a phase, removing it from the enclosing phase of the same thread.
+        """
+        stack = self._stack()
+        if stack:
+            stack[-1][0] += seconds
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def _measure(self, name):
+        stack = self._stack()
+        frame = [0.0]
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed - frame[0]
+
+    def on_request(self, url, status_code, size, seconds):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["bytes_downloaded"] += size
+        self._record("network", seconds)
+
+    def on_cache_hit(self, url, revalidated):
+        with self._lock:
+            self.counters["not_modified" if revalidated else "cache_hits"] += 1
+
+    def on_decode(self, size, seconds):
+        with self._lock:
+            self.counters["decoded_bytes"] += size
+        self._record("decode", seconds)
+
+    def stage(self, name, events):
+        with self._lock:
+            self.phases.setdefault(name, 0.0)
+            self.stage_events.setdefault(name, 0)
+        return self._timed_stage(name, iter(events))
+
+    def _timed_stage(self, name, iterator):
+        """
+        Yields the events of a stage, timing each step without the time spent in the enclosed upstream stages.
+        """
+        stack = self._stack()
+        perf_counter = time.perf_counter
+        seconds = 0.0
+        count = 0
+        try:
+            while True:
+                frame = [0.0]
+                stack.append(frame)
+                started = perf_counter()
+                try:
+                    event = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed = perf_counter() - started
+                    stack.pop()
+                    if stack:
+                        stack[-1][0] += elapsed
+                    seconds += elapsed - frame[0]
+                count += 1
+                yield event
+        finally:
+            with self._lock:
+                self.phases[name] += seconds
+                self.stage_events[name] += count
+
+    @contextmanager
+    def phase(self, name):
+        with self._measure(name):
+            yield
+
+    def to_dict(self):
+        """
+        Returns the measurements as a dictionary.
+
+        Returns:
+            dict: The "wall_time", "peak_memory", "phases", "stage_events" and "counters" entries.
+        """
+        return {
+            "wall_time": self.wall_time,
+            "peak_memory": self.peak_memory,
+            "phases": dict(self.phases),
+            "stage_events": dict(self.stage_events),
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        """
+        Returns the measurements as a JSON document.
+
+        Returns:
+            str: The JSON document.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def summary(self):
+        """
+        Returns a human readable summary of the run.
+
+        Returns:
+            str: The summary.
+        """
+        lines = ["Profile:"]
+        total = self.wall_time or sum(self.phases.values()) or 1.0
+        for name, seconds in self.phases.items():
+            events = self.stage_events.get(name)
+            suffix = f"  {events} events out" if events is not None else ""
+            lines.append(f"  {name:<12}{seconds:10.4f}s {seconds / total:7.1%}{suffix}")
+        if self.wall_time is not None:
+            lines.append(f"  {'total':<12}{self.wall_time:10.4f}s")
+        counters = self.counters
+        lines.append(f"  requests: {counters['requests']}, downloaded: {counters['bytes_downloaded']:,} bytes, "
+                     f"cache hits: {counters['cache_hits']}, not modified: {counters['not_modified']}")
+        if self.peak_memory is not None:
+            lines.append(f"  peak memory: {self.peak_memory / 2 ** 20:.1f} MiB")
+        return "\n".join(lines)
+
+    def to_prometheus(self):
+        """
+        Returns the measurements in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines = [f"# TYPE {METRIC_PREFIX}_phase_seconds gauge"]
+        lines.extend(f'{METRIC_PREFIX}_phase_seconds{{phase="{name}"}} {seconds}'
+                     for name, seconds in self.phases.items())
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_events_total counter")
+        lines.extend(f'{METRIC_PREFIX}_stage_events_total{{stage="{name}"}} {count}'
+                     for name, count in self.stage_events.items())
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{name}_total {value}")
+        if self.wall_time is not None:
+            lines.append(f"# TYPE {METRIC_PREFIX}_wall_seconds gauge")
+            lines.append(f"{METRIC_PREFIX}_wall_seconds {self.wall_time}")
+        if self.peak_memory is not None:
+            lines.append(f"# TYPE {METRIC_PREFIX}_peak_memory_bytes gauge")
+            lines.append(f"{METRIC_PREFIX}_peak_memory_bytes {self.peak_memory}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,259 @@
+"""
+output_writers.py
+
+A Python module providing buffered, streaming writers for analyzed GitHub events.
+
+This module contains the `EventWriter` base class and the `TextEventWriter`, `JSONLEventWriter` and `CSVEventWriter`
+classes. Writers consume an iterable of events and format them in batches, issuing one `write()` per batch instead of
+several `print()` calls per event, so output starts as soon as the first batch is ready and large result sets are not
+bound by per-call write overhead. Writers also format event timelines. `create_writer` selects a writer by format
+name.
+
+"""
+
+import csv
+import io
+import json
+import sys
+
+from utils.timestamps import format_bucket, format_timestamp
+
+OUTPUT_FORMATS = ("text", "jsonl", "csv")
+TIMELINE_BAR_WIDTH = 40
+
+
+class EventWriter:
+    """
+    A base class for streaming event writers.
+
+    Attributes:
+        stream (file): The stream events are written to.
+        summary_stream (file): The stream the statistics summary is written to.
+        batch_size (int): The number of events formatted per `write()` call.
+
+    Methods:
+        format_events(events):
+            Formats a batch of events as a single string.
+            Args:
+                events (list): The batch of events.
+            Returns:
+                str: The formatted batch.
+
+        write_events(events):
+            Writes every event of an iterable, batch by batch.
+
+        write_summary(event_statistics, most_active_user):
+            Writes the event statistics and the most active user.
+
+        write_timeline(timeline):
+            Writes the counts of every non-empty bucket of an `EventTimeline`.
+
+        close():
+            Flushes the streams and closes the output file if the writer opened it.
+    """
+
+    def __init__(self, stream=None, summary_stream=None, batch_size=1024, owns_stream=False):
+        """
+        Initializes a new instance of the EventWriter class.
+
+        Args:
+            stream (file, optional): The stream events are written to. Defaults to the current `sys.stdout`.
+            summary_stream (file, optional): The stream for the summary. Defaults to the event stream.
+            batch_size (int, optional): The number of events formatted per write. Defaults to 1024.
+            owns_stream (bool, optional): Whether `close()` closes the event stream. Defaults to False.
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.summary_stream = summary_stream if summary_stream is not None else self.stream
+        self.batch_size = batch_size
+        self.owns_stream = owns_stream
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def format_events(self, events):
+        """
+        Formats a batch of events as a single string.
+
+        This method should be implemented in the child class.
+
+        Args:
+            events (list): The batch of events.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in the child class.
+        """
+        raise NotImplementedError("format_events() method must be implemented in child class")
+
+    def write_events(self, events):
+        """
+        Writes every event of an iterable, batch by batch, as the events arrive.
+
+        Args:
+            events (iterable): The events to write.
+
+        Returns:
+            int: The number of events written.
+        """
+        write, format_events, batch_size = self.stream.write, self.format_events, self.batch_size
+        written = 0
+        batch = []
+        for event in events:
+            batch.append(event)
+            if len(batch) == batch_size:
+                write(format_events(batch))
+                written += batch_size
+                batch = []
+        if batch:
+            write(format_events(batch))
+            written += len(batch)
+        return written
+
+    def write_summary(self, event_statistics, most_active_user):
+        """
+        Writes the event statistics and the most active user in the text layout.
+
+        Args:
+            event_statistics (dict): The event counts keyed by event type.
+            most_active_user (str): The username of the most active user.
+        """
+        lines = ["Event Statistics:"]
+        lines.extend(f"{event_type}: {count}" for event_type, count in event_statistics.items())
+        lines.append(f"Most Active User: {most_active_user}")
+        self.stream.flush()
+        self.summary_stream.write("\n".join(lines) + "\n")
+        self.summary_stream.flush()
+
+    def write_timeline(self, timeline):
+        """
+        Writes the counts of every non-empty bucket in the text layout: one line per bucket with its start, total,
+        a bar scaled to the busiest bucket and the counts per key.
+
+        Args:
+            timeline (EventTimeline): The timeline to write.
+        """
+        totals = timeline.totals()
+        peak = max(totals.values(), default=0)
+        lines = [f"Event Timeline ({format_bucket(timeline.bucket_seconds)} buckets by {timeline.by}):"]
+        for start, counts in timeline.buckets().items():
+            total = totals[start]
+            bar = "#" * max(1, round(total * TIMELINE_BAR_WIDTH / peak))
+            breakdown = ", ".join(f"{key}: {count}" for key, count in counts.items())
+            lines.append(f"{format_timestamp(start)} {total:>8} {bar:<{TIMELINE_BAR_WIDTH}} {breakdown}")
+        self.stream.write("\n".join(lines) + "\n")
+
+    def close(self):
+        """
+        Flushes the streams and closes the output file if the writer opened it.
+        """
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class TextEventWriter(EventWriter):
+    """
+    Writes events in the human readable layout of `display_events`.
+    """
+
+    SEPARATOR = "-------------------------------------------"
+
+    def format_events(self, events):
+        separator = self.SEPARATOR
+        return "".join(f"Event: {event['type']}\nUser: {event['actor']['login']}\n"
+                       f"Timestamp: {event['created_at']}\n{separator}\n" for event in events)
+
+
+class JSONLEventWriter(EventWriter):
+    """
+    Writes one compact JSON object per line.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def format_events(self, events):
+        encode = self._encode
+        return "\n".join([encode(event) for event in events]) + "\n"
+
+    def write_timeline(self, timeline):
+        encode, by = self._encode, timeline.by
+        self.stream.write("".join(encode({"bucket": start, by: key, "count": count}) + "\n"
+                                  for start, key, count in timeline.to_rows()))
+
+
+class CSVEventWriter(EventWriter):
+    """
+    Writes events as CSV rows with an `id,type,actor,created_at,repo` header. The header is written even when there
+    are no events.
+    """
+
+    HEADER = ("id", "type", "actor", "created_at", "repo")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._header_written = False
+
+    def format_events(self, events):
+        self._writer.writerows((event.get('id', ""), event['type'], event['actor']['login'], event['created_at'],
+                                event['repo']['name'] if event.get('repo') else "") for event in events)
+        return self._flush_buffer()
+
+    def write_events(self, events):
+        self._write_header(self.HEADER)
+        return super().write_events(events)
+
+    def write_timeline(self, timeline):
+        # A timeline replaces the event rows, and their header.
+        self._write_header(("bucket", timeline.by, "count"))
+        self._writer.writerows(timeline.to_rows())
+        self.stream.write(self._flush_buffer())
+
+    def close(self):
+        self._write_header(self.HEADER)
+        super().close()
+
+    def _write_header(self, header):
+        if not self._header_written:
+            self._header_written = True
+            self._writer.writerow(header)
+            self.stream.write(self._flush_buffer())
+
+    def _flush_buffer(self):
+        formatted = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return formatted
+
+
+WRITERS = {"text": TextEventWriter, "jsonl": JSONLEventWriter, "csv": CSVEventWriter}
+
+
+def create_writer(output_format="text", output=None, buffer_size=1 << 20):
+    """
+    Creates a writer for the given format and destination.
+
+    With a machine readable format on standard output, the summary goes to standard error so that the event stream
+    can be piped into other tools unchanged.
+
+    Args:
+        output_format (str, optional): One of "text", "jsonl" or "csv". Defaults to "text".
+        output (str, optional): The path of the output file. Defaults to standard output.
+        buffer_size (int, optional): The buffer size of the output file in bytes. Defaults to 1 MiB.
+
+    Returns:
+        EventWriter: The writer. Close it (or use it as a context manager) to flush the output.
+    """
+    writer_class = WRITERS[output_format]
+    if output:
+        stream = open(output, "w", encoding="utf-8", newline="", buffering=buffer_size)
+        summary_stream = stream if output_format == "text" else sys.stdout
+        return writer_class(stream, summary_stream, owns_stream=True)
+    summary_stream = sys.stdout if output_format == "text" else sys.stderr
+    return writer_class(sys.stdout, summary_stream)
@@ -0,0 +1,471 @@
+"""
+query_service.py
+
+A Python module providing a local HTTP/JSON query service in front of `GitHubEventsAnalyzer`.
+
+Dashboards and scripts that each ran the CLI fetched the same repositories again and again. This module contains the
+`EventQueryService` class, which answers event, statistics, most active user and timeline queries from one shared
+analyzer, and the `QueryServer` class, a threaded HTTP server exposing it as JSON endpoints:
+
+    GET /repos/<owner>/<repo>/events?type=&page=&all_pages=&max_pages=&sort=&latest=
+    GET /repos/<owner>/<repo>/statistics?type=&page=&all_pages=&max_pages=
+    GET /repos/<owner>/<repo>/most-active-user?type=&page=&all_pages=&max_pages=
+    GET /repos/<owner>/<repo>/timeline?bucket=&by=&type=&page=&all_pages=&max_pages=
+    GET /status
+
+Three layers keep upstream traffic down. Fetched events and computed results are kept in a `TTLCache`, an LRU cache
+whose entries expire after a time to live. Concurrent queries missing the cache for the same key are coalesced by a
+`RequestCoalescer` into one computation, so a burst of dashboards asking for the same repository causes one fetch.
+Once an entry expires, pages are revalidated through the analyzer's `ResponseCache`, so unchanged pages cost a
+`304 Not Modified` and no rate limit.
+
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from controllers.base.response_cache import ResponseCache
+from controllers.event_pipeline import filter_stage, latest_stage, order_stage
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from controllers.event_decoder import ProjectingEventDecoder
+from utils.custom_exception import GitHubAPIException, InvalidInputException, RateLimitException
+
+OPERATIONS = ("events", "statistics", "most-active-user", "timeline")
+SORT_ORDERS = ("chronological", "reverse-chronological")
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries expire a fixed time after they were stored.
+
+    Attributes:
+        max_entries (int): The maximum number of entries kept.
+        ttl (float): The number of seconds an entry stays valid.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that found nothing or an expired entry.
+
+    Methods:
+        get(key, default=None):
+            Returns the value stored under a key if it has not expired.
+
+        set(key, value):
+            Stores a value, evicting the least recently used entry when full.
+
+        clear():
+            Removes every entry.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60.0, clock=time.monotonic):
+        """
+        Initializes a new instance of the TTLCache class.
+
+        Args:
+            max_entries (int, optional): The maximum number of entries kept. Defaults to 1024.
+            ttl (float, optional): The number of seconds an entry stays valid. Defaults to 60.
+            clock (callable, optional): Returns the current monotonic time. Defaults to `time.monotonic`.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored under a key if it has not expired, marking it as recently used.
+
+        Args:
+            key: The key.
+            default (optional): The value returned on a miss. Defaults to None.
+
+        Returns:
+            The stored value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry when the cache is full.
+
+        Args:
+            key: The key.
+            value: The value.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class RequestCoalescer:
+    """
+    Runs at most one computation per key at a time; concurrent callers for the same key share its outcome.
+
+    Attributes:
+        coalesced (int): The number of calls answered by another caller's computation.
+
+    Methods:
+        call(key, function):
+            Runs the function, or waits for the computation already running for the key.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def call(self, key, function):
+        """
+        Runs the function, or waits for the computation already running for the same key and returns its result.
+
+        Args:
+            key: The key identifying the computation.
+            function (callable): Computes the result. Called without arguments.
+
+        Returns:
+            The result of the computation.
+
+        Raises:
+            Exception: Whatever the computation raised, re-raised in every caller that waited for it.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class EventQueryService:
+    """
+    Answers event queries from one shared analyzer, with cached and coalesced fetches and results.
+
+    Attributes:
+        analyzer (GitHubEventsAnalyzer): The analyzer used to fetch and analyze events.
+        cache (TTLCache): The fetched events and computed results.
+        coalescer (RequestCoalescer): Merges concurrent computations of the same key.
+        upstream_fetches (int): The number of event fetches sent to the analyzer.
+
+    Methods:
+        events(repo_owner, repo_name, page=1, all_pages=False, max_pages=10):
+            Returns the fetched events of a repository, from the cache when possible.
+
+        query(operation, repo_owner, repo_name, params):
+            Answers one query.
+
+        status():
+            Returns the cache and coalescing counters.
+
+    Example Usage:
+        service = EventQueryService(ttl=30)
+        print(service.query("statistics", "owner", "repo", {"type": "PushEvent"}))
+
+    """
+
+    def __init__(self, analyzer=None, ttl=60.0, max_entries=1024, concurrency=4, clock=time.monotonic):
+        """
+        Initializes a new instance of the EventQueryService class.
+
+        Args:
+            analyzer (GitHubEventsAnalyzer, optional): The analyzer to use. Defaults to an analyzer with a response
+                cache that decodes events into their projected fields.
+            ttl (float, optional): The number of seconds fetched events and results are reused. Defaults to 60.
+            max_entries (int, optional): The maximum number of cached entries. Defaults to 1024.
+            concurrency (int, optional): The number of pages fetched in parallel with all_pages. Defaults to 4.
+            clock (callable, optional): Returns the current monotonic time. Defaults to `time.monotonic`.
+        """
+        if analyzer is None:
+            analyzer = GitHubEventsAnalyzer(cache=ResponseCache(max_entries=max_entries))
+            analyzer.event_decoder = ProjectingEventDecoder()
+        self.analyzer = analyzer
+        self.cache = TTLCache(max_entries, ttl, clock)
+        self.coalescer = RequestCoalescer()
+        self.concurrency = concurrency
+        self.upstream_fetches = 0
+        self._lock = threading.Lock()
+
+    def cached(self, key, function):
+        """
+        Returns the cached value of a key, computing it once for all concurrent callers on a miss.
+
+        Args:
+            key (tuple): The cache key.
+            function (callable): Computes the value. Called without arguments.
+
+        Returns:
+            The value.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def compute():
+            # Another leader may have stored the value between the lookup above and this call.
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = function()
+                self.cache.set(key, value)
+            return value
+
+        return self.coalescer.call(key, compute)
+
+    def events(self, repo_owner, repo_name, page=1, all_pages=False, max_pages=10):
+        """
+        Returns the fetched events of a repository, from the cache when possible.
+
+        Args:
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            page (int, optional): The page to fetch without all_pages. Defaults to 1.
+            all_pages (bool, optional): Whether to fetch every available page. Defaults to False.
+            max_pages (int, optional): The maximum number of pages fetched with all_pages. Defaults to 10.
+
+        Returns:
+            list: The events in API order. Shared between callers; do not modify.
+        """
+        def fetch():
+            with self._lock:
+                self.upstream_fetches += 1
+            analyzer = self.analyzer
+            if all_pages:
+                return list(analyzer.iter_events(repo_owner, repo_name, 1, max_pages, analyzer.MAX_PER_PAGE,
+                                                 self.concurrency))
+            return list(analyzer.iter_events(repo_owner, repo_name, page))
+
+        source = (repo_owner, repo_name, 1, True, max_pages) if all_pages else (repo_owner, repo_name, page, False, 0)
+        return self.cached(("events",) + source, fetch)
+
+    def query(self, operation, repo_owner, repo_name, params):
+        """
+        Answers one query.
+
+        Args:
+            operation (str): One of "events", "statistics", "most-active-user" or "timeline".
+            repo_owner (str): The owner of the repository.
+            repo_name (str): The name of the repository.
+            params (dict): The query parameters, each a single string: "type", "page", "all_pages", "max_pages",
+                and "sort" and "latest" for events, or "bucket" and "by" for the timeline.
+
+        Returns:
+            dict: The JSON-serializable answer.
+
+        Raises:
+            InvalidInputException: If the operation or a parameter is invalid.
+            GitHubAPIException: If fetching the events fails.
+        """
+        if operation not in OPERATIONS:
+            raise InvalidInputException(f"Unknown operation {operation!r}, expected one of {', '.join(OPERATIONS)}!")
+        event_type = params.get("type") or None
+        page = self._integer(params, "page", 1)
+        all_pages = params.get("all_pages", "false").lower() in ("1", "true", "yes")
+        max_pages = self._integer(params, "max_pages", 10)
+        sort_order = params.get("sort", "chronological")
+        if sort_order not in SORT_ORDERS:
+            raise InvalidInputException(f"Invalid sort order {sort_order!r}, expected one of {', '.join(SORT_ORDERS)}!")
+        latest = self._integer(params, "latest", 0)
+        bucket, by = params.get("bucket", "1h"), params.get("by", "type")
+
+        key = (operation, repo_owner, repo_name, event_type, page, all_pages, max_pages, sort_order, latest, bucket, by)
+        analyzer = self.analyzer
+
+        def answer():
+            events = self.events(repo_owner, repo_name, page, all_pages, max_pages)
+            if event_type:
+                events = list(filter_stage(events, event_type))
+            repository = analyzer.repository_name(repo_owner, repo_name)
+            if operation == "statistics":
+                return {"repository": repository, "event_statistics": analyzer.calculate_event_statistics(events)}
+            if operation == "most-active-user":
+                return {"repository": repository, "most_active_user": analyzer.identify_most_active_user(events)}
+            if operation == "timeline":
+                timeline = analyzer.calculate_event_timeline(events, bucket, by)
+                rows = [{"bucket": start, by: key, "count": count} for start, key, count in timeline.to_rows()]
+                return {"repository": repository, "bucket": bucket, "by": by, "rows": rows}
+            reverse = sort_order == "reverse-chronological"
+            ordered = latest_stage(events, latest, reverse) if latest else order_stage(events, reverse)
+            events = list(ordered)
+            return {"repository": repository, "count": len(events), "events": events}
+
+        return self.cached(key, answer)
+
+    def status(self):
+        """
+        Returns the cache and coalescing counters.
+
+        Returns:
+            dict: The "cache_entries", "cache_hits", "cache_misses", "coalesced" and "upstream_fetches" counts.
+        """
+        return {"cache_entries": len(self.cache), "cache_hits": self.cache.hits, "cache_misses": self.cache.misses,
+                "coalesced": self.coalescer.coalesced, "upstream_fetches": self.upstream_fetches}
+
+    @staticmethod
+    def _integer(params, name, default):
+        value = params.get(name)
+        if value in (None, ""):
+            return default
+        if not value.isdigit():
+            raise InvalidInputException(f"Invalid {name} {value!r}, expected a non-negative integer!")
+        return int(value)
+
+
+class _QueryHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class QueryServer:
+    """
+    A threaded HTTP server exposing an `EventQueryService` as JSON endpoints.
+
+    Each connection is handled on its own thread; the threads share the service, and with it the analyzer's
+    connection pool, the caches and the request coalescing.
+
+    Attributes:
+        service (EventQueryService): The service answering the queries.
+        base_url (str): The base URL of the server once bound.
+
+    Methods:
+        serve_forever():
+            Serves requests on the calling thread until interrupted or shut down.
+
+        start() / stop():
+            Serves requests on a background thread, and stops.
+
+    Example Usage:
+        with QueryServer(EventQueryService(ttl=30), port=8080) as server:
+            print(requests.get(f"{server.base_url}/repos/owner/repo/statistics").json())
+
+    """
+
+    def __init__(self, service=None, host="127.0.0.1", port=8080):
+        """
+        Initializes a new instance of the QueryServer class and binds its socket.
+
+        Args:
+            service (EventQueryService, optional): The service answering the queries. Defaults to a new service.
+            host (str, optional): The interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind; 0 picks a free port. Defaults to 8080.
+        """
+        self.service = service if service is not None else EventQueryService()
+        self._server = _QueryHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def serve_forever(self):
+        """
+        Serves requests on the calling thread until interrupted or shut down.
+        """
+        self._server.serve_forever()
+
+    def start(self):
+        """
+        Serves requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the server, joins the background thread and closes the analyzer.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self.service.analyzer.close()
+
+    def _handler_class(self):
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {name: values[-1] for name, values in parse_qs(parsed.query).items()}
+                parts = parsed.path.strip("/").split("/")
+                try:
+                    if parts == ["status"]:
+                        self.send_json(200, service.status())
+                    elif len(parts) == 4 and parts[0] == "repos":
+                        self.send_json(200, service.query(parts[3], parts[1], parts[2], params))
+                    else:
+                        self.send_json(404, {"error": f"Not found: {parsed.path}"})
+                except InvalidInputException as error:
+                    self.send_json(400, {"error": error.message})
+                except RateLimitException as error:
+                    retry_after = max(0, int(error.retry_at - time.time())) if error.retry_at else None
+                    self.send_json(503, {"error": error.message, "retry_after": retry_after},
+                                   {"Retry-After": retry_after} if retry_after is not None else None)
+                except GitHubAPIException as error:
+                    self.send_json(502, {"error": error.message, "upstream_status": error.status_code})
+
+            def send_json(self, status_code, document, headers=None):
+                body = json.dumps(document, separators=(",", ":")).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -9,9 +9,13 @@ Classes:
 """
 
 import argparse
+import sys
+import time
 
-from controllers.github_event_analyzer import GitHubEventsAnalyzerCLI
+from controllers.base.transport import HTTP_BACKENDS
+from controllers.output_writers import OUTPUT_FORMATS
 from utils.custom_exception import InvalidInputException
+from utils.timestamps import parse_bucket
 
 
 class GitHubEventAnalyzerEntryPoint:
@@ -20,10 +24,19 @@ class GitHubEventAnalyzerEntryPoint:
 
     Methods:
         - `event_analyzer_entry_point(owner, repo, event_type, page, sort_order)`: Executes the event analysis process.
+        - `report_wait(delay, ready_at)`: Reports a wait for a rate limit reset on standard error.
+        - `report_profile(instrumentation, profile_output=None, profile_format="json")`: Prints and exports a profile.
     """
 
+    DEFAULT_PSTATS_FILE = "github_event_analyzer.pstats"
+
     @staticmethod
-    def main(owner, repo, event_type, page, sort_order):
+    def main(owner, repo, event_type, page, sort_order, all_pages=False, max_pages=10, concurrency=4, cache_dir=None,
+             archive=None, source="api", files=None, workers=None, output_format="text", output=None, latest=None,
+             repos_file=None, org=None, request_rate=10.0, profile=None, profile_output=None, profile_format="json",
+             timeline=None, timeline_by="type", watch=False, approximate=False, checkpoint=None,
+             checkpoint_interval=30.0, shell=False, save_snapshot=None, transport=None, sketch_error=0.001,
+             sketch_confidence=0.99, distinct_error=0.01, max_wait=60.0):
         """
         Executes the event analysis process.
 
@@ -33,21 +46,168 @@ class GitHubEventAnalyzerEntryPoint:
             event_type (str): The type of events to filter (optional).
             page (int): The page number for pagination.
             sort_order (str): The sort order for events.
+            all_pages (bool): Whether to fetch every available page instead of a single one.
+            max_pages (int): The maximum number of pages to fetch when all_pages is set.
+            concurrency (int): The maximum number of pages fetched in parallel when all_pages is set.
+            cache_dir (str): The directory of the conditional request cache (optional).
+            archive (str): The path of a SQLite archive to sync and query instead of a single fetch (optional).
+            source (str): Where events come from: "api", "gharchive" or "snapshot".
+            files (list): The GH Archive files to ingest when source is "gharchive", or the snapshot file to map when
+                source is "snapshot".
+            workers (int): The number of worker processes for GH Archive ingestion (optional).
+            output_format (str): The output format for events: "text", "jsonl" or "csv".
+            output (str): The file events are written to (optional, standard output by default).
+            latest (int): Only display this many of the most recent events (optional).
+            repos_file (str): A file listing "owner/name" repositories to analyze in one batch (optional).
+            org (str): An organization whose repositories are analyzed in one batch (optional).
+            request_rate (float): The sustained API requests per second per token; 0 disables pacing.
+            profile (str): "summary" to print per-phase timers and counters, or "cprofile" to dump pstats (optional).
+            profile_output (str): The file the profile is exported to, or the pstats file for "cprofile" (optional).
+            profile_format (str): The export format of the summary profile: "json" or "prometheus".
+            timeline (str): Display activity per time bucket of this width, e.g. "1h", instead of events (optional).
+            timeline_by (str): What the timeline counts events by: "type" or "actor".
+            watch (bool): Whether to keep polling and display new events as they arrive, until interrupted.
+            approximate (bool): Whether batch and GH Archive statistics count actors with sketches in bounded memory.
+            checkpoint (str): A statistics snapshot for GH Archive ingestion to resume from and save to (optional).
+            checkpoint_interval (float): The minimum number of seconds between periodic checkpoints.
+            shell (bool): Whether to fetch events once and query them in an interactive shell.
+            save_snapshot (str): Save the fetched or GH Archive events to this snapshot file instead of displaying
+                them (optional).
+            transport (str): The HTTP backend: "requests" or "http.client" (optional, defaults to "requests" when
+                it is installed).
+            sketch_error (float): With approximate, the overcount bound of the actor and repository counts as a
+                fraction of all events.
+            sketch_confidence (float): With approximate, the probability that a count is within the bound.
+            distinct_error (float): With approximate, the relative standard error of the distinct actor count.
+            max_wait (float): The longest a request waits for an exhausted rate limit to reset, in seconds, before
+                the run fails; None waits as long as needed. Every wait is reported on standard error.
 
         Returns:
             None
 
         Raises:
-            InvalidInputException: If both the repository owner and repository name are not provided.
+            InvalidInputException: If both the repository owner and repository name are not provided, if no files
+                are given for the "gharchive" source or not exactly one for the "snapshot" source, if the repositories
+                file has an invalid line, if the timeline bucket is invalid, if a sketch setting is not strictly
+                between 0 and 1, or if the maximum wait is negative.
 
         Usage:
         ```python
         analyzer = GitHubEventAnalyzer()
         analyzer.event_analyzer_entry_point("owner", "repo", event_type="PushEvent", page=1, sort_order="chronological")
         ```
+
+        Every argument is validated before the analyzer and its dependencies are imported, so `--help` and invalid
+        arguments return without loading them. The analyzer in turn imports NumPy, SQLite and the GH Archive
+        ingestion only in the methods that use them, and `requests` only once a request is sent.
+        """
+        if bool(owner) != bool(repo) and not (repos_file or org):
+            raise InvalidInputException()
+        for name, value in (("sketch error", sketch_error), ("sketch confidence", sketch_confidence),
+                            ("distinct error", distinct_error)):
+            if not 0 < value < 1:
+                raise InvalidInputException(f"The {name} must be between 0 and 1, not {value}!")
+        if source == "gharchive" and not files:
+            raise InvalidInputException("At least one GH Archive file is required with --source gharchive!")
+        if source == "snapshot" and len(files or ()) != 1:
+            raise InvalidInputException("Exactly one snapshot file is required with --source snapshot!")
+        if timeline:
+            parse_bucket(timeline)
+        if max_wait is not None and max_wait < 0:
+            raise InvalidInputException(f"The maximum wait must not be negative, not {max_wait}!")
+
+        import cProfile
+        from controllers.base.rate_limiter import RateLimitScheduler
+        from controllers.base.response_cache import ResponseCache
+        from controllers.github_event_analyzer import GitHubEventsAnalyzerCLI
+        from controllers.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation() if profile == "summary" else None
+        profiler = cProfile.Profile() if profile == "cprofile" else None
+        if profiler is not None:
+            profiler.enable()
+        if instrumentation is not None:
+            instrumentation.start()
+        try:
+            cache = ResponseCache(cache_dir=cache_dir) if cache_dir else None
+            rate_limiter = RateLimitScheduler.from_environment(rate=request_rate, max_wait=max_wait,
+                                                               on_wait=GitHubEventAnalyzerEntryPoint.report_wait)
+            event_controller = GitHubEventsAnalyzerCLI(backend=transport, pool_maxsize=max(10, concurrency),
+                                                       cache=cache, rate_limiter=rate_limiter,
+                                                       hooks=[instrumentation] if instrumentation else None)
+            if save_snapshot:
+                event_controller.save_events_snapshot(save_snapshot, owner, repo, event_type, all_pages, max_pages,
+                                                      concurrency, files if source == "gharchive" else None)
+            elif source == "snapshot":
+                event_controller.snapshot_and_display_events(files[0], event_type, sort_order, output_format, output,
+                                                             latest)
+            elif source == "gharchive":
+                event_controller.ingest_and_display_archive(files, owner, repo, event_type, workers, approximate,
+                                                            checkpoint, checkpoint_interval, sketch_error,
+                                                            sketch_confidence, distinct_error)
+            elif repos_file or org:
+                repositories = []
+                if repos_file:
+                    with open(repos_file, encoding="utf-8") as lines:
+                        repositories.extend(event_controller.parse_repositories(lines))
+                if org:
+                    repositories.extend(event_controller.fetch_org_repositories(org, max_pages))
+                event_controller.analyze_and_display_repositories(repositories, event_type, all_pages, max_pages,
+                                                                  concurrency, approximate, sketch_error,
+                                                                  sketch_confidence, distinct_error)
+            elif shell:
+                event_controller.explore_events(owner, repo, all_pages, max_pages, concurrency)
+            elif watch:
+                event_controller.watch_and_display_events(owner, repo, event_type, output_format, output)
+            elif timeline:
+                event_controller.timeline_and_display_events(owner, repo, timeline, timeline_by, event_type, page,
+                                                             all_pages, max_pages, concurrency, archive, output_format,
+                                                             output)
+            elif archive:
+                event_controller.archive_and_display_events(owner, repo, archive, event_type, sort_order, max_pages,
+                                                            output_format, output, latest)
+            else:
+                event_controller.fetch_and_display_events(owner, repo, event_type, page, sort_order, all_pages,
+                                                          max_pages, concurrency, output_format, output, latest)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                pstats_file = profile_output or GitHubEventAnalyzerEntryPoint.DEFAULT_PSTATS_FILE
+                profiler.dump_stats(pstats_file)
+                print(f"Profile written to {pstats_file}", file=sys.stderr)
+            if instrumentation is not None:
+                instrumentation.stop()
+                GitHubEventAnalyzerEntryPoint.report_profile(instrumentation, profile_output, profile_format)
+
+    @staticmethod
+    def report_wait(delay, ready_at):
+        """
+        Reports on standard error that every token is rate limited and the run waits for a reset.
+
+        Args:
+            delay (float): The number of seconds waited.
+            ready_at (float): The epoch time waited for.
+        """
+        reset = time.strftime("%H:%M:%S UTC", time.gmtime(ready_at))
+        print(f"Rate limited: waiting {delay:.0f}s until {reset}", file=sys.stderr, flush=True)
+
+    @staticmethod
+    def report_profile(instrumentation, profile_output=None, profile_format="json"):
+        """
+        Prints the profile summary to standard error and optionally exports the measurements.
+
+        Args:
+            instrumentation (Instrumentation): The measurements of the run.
+            profile_output (str): The file to export the measurements to (optional).
+            profile_format (str): The export format: "json" or "prometheus".
         """
-        event_controller = GitHubEventsAnalyzerCLI()
-        event_controller.fetch_and_display_events(owner, repo, event_type, page, sort_order)
+        print(instrumentation.summary(), file=sys.stderr)
+        if profile_output:
+            with open(profile_output, "w", encoding="utf-8") as output_file:
+                if profile_format == "prometheus":
+                    output_file.write(instrumentation.to_prometheus())
+                else:
+                    output_file.write(instrumentation.to_json())
 
 
 if __name__ == "__main__":
@@ -64,11 +224,66 @@ if __name__ == "__main__":
         "--sort_order", choices=["chronological", "reverse-chronological"], default="chronological",
         help="Sort order for events"
     )
+    parser.add_argument("--all-pages", action="store_true", help="Fetch every available page of events")
+    parser.add_argument("--max-pages", type=int, default=10, help="Maximum number of pages to fetch with --all-pages")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of pages fetched in parallel")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the ETag / conditional request cache")
+    parser.add_argument("--archive", default=None, help="SQLite archive to sync new events into and query")
+    parser.add_argument("--source", choices=["api", "gharchive", "snapshot"], default="api",
+                        help="Where events are read from")
+    parser.add_argument("--files", nargs="+", default=None,
+                        help="GH Archive .json.gz files for --source gharchive, or the snapshot for --source snapshot")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --source gharchive")
+    parser.add_argument("--format", dest="output_format", choices=OUTPUT_FORMATS, default="text",
+                        help="Output format for events")
+    parser.add_argument("--output", default=None, help="File to write events to (defaults to standard output)")
+    parser.add_argument("--latest", type=int, default=None, help="Only display the N most recent events")
+    parser.add_argument("--repos-file", default=None, help="File of owner/name lines to analyze in one batch")
+    parser.add_argument("--org", default=None, help="Organization whose repositories are analyzed in one batch")
+    parser.add_argument("--request-rate", type=float, default=10.0,
+                        help="Sustained API requests per second per token (0 disables pacing)")
+    parser.add_argument("--max-wait", type=float, default=60.0,
+                        help="Longest wait in seconds for a rate limit reset before failing (default 60)")
+    parser.add_argument("--profile", nargs="?", const="summary", choices=["summary", "cprofile"], default=None,
+                        help="Print per-phase timers and counters, or dump a cProfile pstats file with =cprofile")
+    parser.add_argument("--profile-output", default=None, help="File to export the profile (or pstats dump) to")
+    parser.add_argument("--profile-format", choices=["json", "prometheus"], default="json",
+                        help="Export format of the --profile summary")
+    parser.add_argument("--timeline", default=None, metavar="BUCKET",
+                        help="Display activity per time bucket (e.g. 15m, 1h, 1d) instead of events")
+    parser.add_argument("--timeline-by", choices=["type", "actor"], default="type",
+                        help="Count --timeline buckets by event type or by actor")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep polling at the server-advised interval and display new events as they arrive")
+    parser.add_argument("--approximate", action="store_true",
+                        help="Count actors with bounded-memory sketches for --source gharchive, --repos-file and --org")
+    parser.add_argument("--sketch-error", type=float, default=0.001,
+                        help="With --approximate, the overcount bound of actor counts as a fraction of all events")
+    parser.add_argument("--sketch-confidence", type=float, default=0.99,
+                        help="With --approximate, the probability that an actor count is within --sketch-error")
+    parser.add_argument("--distinct-error", type=float, default=0.01,
+                        help="With --approximate, the relative standard error of the distinct actor count")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Statistics snapshot to resume --source gharchive ingestion from and save progress to")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0,
+                        help="Minimum seconds between periodic --checkpoint saves")
+    parser.add_argument("--shell", action="store_true",
+                        help="Fetch events once, index them and query them in an interactive shell")
+    parser.add_argument("--save-snapshot", default=None, metavar="PATH",
+                        help="Save the fetched or GH Archive events to a memory-mapped snapshot instead of displaying")
+    parser.add_argument("--transport", choices=HTTP_BACKENDS, default=None,
+                        help="HTTP client library (defaults to requests when installed, else the standard library)")
     args = parser.parse_args()
 
     try:
         analyzer = GitHubEventAnalyzerEntryPoint()
-        analyzer.main(args.owner, args.repo, args.event_type, args.page, args.sort_order)
+        analyzer.main(args.owner, args.repo, args.event_type, args.page, args.sort_order, args.all_pages,
+                      args.max_pages, args.concurrency, args.cache_dir, args.archive, args.source, args.files,
+                      args.workers, args.output_format, args.output, args.latest, args.repos_file, args.org,
+                      args.request_rate, args.profile, args.profile_output, args.profile_format, args.timeline,
+                      args.timeline_by, args.watch, args.approximate, args.checkpoint, args.checkpoint_interval,
+                      args.shell, args.save_snapshot, args.transport, args.sketch_error, args.sketch_confidence,
+                      args.distinct_error, args.max_wait)
     except InvalidInputException as e:
         print(e)
     except Exception as e:
@@ -0,0 +1,79 @@
+"""
+GitHub Events Query Service
+
+This module contains the `GitHubEventQueryServiceEntryPoint` class that starts the local HTTP/JSON query service.
+
+Classes:
+- `GitHubEventQueryServiceEntryPoint`
+
+"""
+
+import argparse
+
+from controllers.base.rate_limiter import RateLimitScheduler
+from controllers.base.response_cache import ResponseCache
+from controllers.event_decoder import ProjectingEventDecoder
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from controllers.query_service import EventQueryService, QueryServer
+
+
+class GitHubEventQueryServiceEntryPoint:
+    """
+    `GitHubEventQueryServiceEntryPoint` serves as the entry point of the query service.
+
+    Methods:
+        - `main(host, port, cache_ttl, cache_entries, cache_dir, request_rate, concurrency)`: Serves until interrupted.
+    """
+
+    @staticmethod
+    def main(host="127.0.0.1", port=8080, cache_ttl=60.0, cache_entries=1024, cache_dir=None, request_rate=10.0,
+             concurrency=4):
+        """
+        Serves event queries as JSON until interrupted.
+
+        Args:
+            host (str): The interface to bind.
+            port (int): The port to bind.
+            cache_ttl (float): The number of seconds fetched events and computed results are reused.
+            cache_entries (int): The maximum number of cached events and results.
+            cache_dir (str): The directory of the conditional request cache (optional, in memory by default).
+            request_rate (float): The sustained API requests per second per token; 0 disables pacing.
+            concurrency (int): The number of pages fetched in parallel for all_pages queries.
+
+        Returns:
+            None
+        """
+        analyzer = GitHubEventsAnalyzer(pool_maxsize=max(10, concurrency),
+                                        cache=ResponseCache(max_entries=cache_entries, cache_dir=cache_dir),
+                                        rate_limiter=RateLimitScheduler.from_environment(rate=request_rate))
+        analyzer.event_decoder = ProjectingEventDecoder()
+        service = EventQueryService(analyzer, cache_ttl, cache_entries, concurrency)
+        server = QueryServer(service, host, port)
+        print(f"Serving GitHub event queries on {server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    """
+    Entry point of the GitHub events query service.
+    """
+
+    parser = argparse.ArgumentParser(description="GitHub Events Query Service")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    parser.add_argument("--cache-ttl", type=float, default=60.0,
+                        help="Seconds fetched events and computed results are reused")
+    parser.add_argument("--cache-entries", type=int, default=1024, help="Maximum number of cached events and results")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the ETag / conditional request cache")
+    parser.add_argument("--request-rate", type=float, default=10.0,
+                        help="Sustained API requests per second per token (0 disables pacing)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of pages fetched in parallel")
+    args = parser.parse_args()
+
+    GitHubEventQueryServiceEntryPoint.main(args.host, args.port, args.cache_ttl, args.cache_entries, args.cache_dir,
+                                           args.request_rate, args.concurrency)
@@ -0,0 +1,54 @@
+"""
+Shared Test Fixtures
+
+This module contains the pytest fixtures shared by the unit tests.
+
+Fixtures:
+- use_numpy
+- make_events
+- events
+
+"""
+
+import pytest
+
+from benchmarks.stub_server import synthetic_event
+from controllers import event_snapshot, event_store, event_timeline
+
+# The modules with a NumPy code path and a pure Python fallback, selected by their module level `np`.
+NUMPY_MODULES = (event_store, event_timeline, event_snapshot)
+
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def use_numpy(request, monkeypatch):
+    """
+    Fixture running each test with NumPy, and again with every module of `NUMPY_MODULES` on its fallback.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        for module in NUMPY_MODULES:
+            monkeypatch.setattr(module, 'np', None)
+
+
+@pytest.fixture
+def make_events():
+    """
+    Fixture providing a factory of synthetic events, newest first, as returned by the API.
+
+    The factory takes the number of events, the repositories cycled through, the number of actors cycled through and
+    the step between the positions of consecutive events, which spaces them further apart in time.
+    """
+    def make(count=600, repos=('octo/repo',), actors=7, step=1):
+        return [synthetic_event(repos[index % len(repos)], index, actors=actors)
+                for index in range(0, count * step, step)]
+
+    return make
+
+
+@pytest.fixture
+def events(make_events):
+    """
+    Fixture providing 600 synthetic events of one repository, newest first, with ties between 7 actors.
+    """
+    return make_events()
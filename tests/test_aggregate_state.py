@@ -0,0 +1,124 @@
+"""
+Aggregate State Unit Tests
+
+This module contains unit tests for the statistics snapshots and checkpointed GH Archive ingestion.
+
+Classes:
+- TestAggregateState
+
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from controllers import gharchive
+from controllers.aggregate_state import AggregateState
+from controllers.event_aggregator import EventAggregator
+from controllers.gharchive import GHArchiveIngestor
+from utils.custom_exception import InvalidInputException
+
+
+def write_archive(path, lines):
+    """
+    Writes lines to a gzip-compressed GH Archive file.
+    """
+    with gzip.open(path, 'wt') as archive_file:
+        archive_file.writelines(line + '\n' for line in lines)
+    return str(path)
+
+
+class TestAggregateState:
+    """
+    Unit tests for the AggregateState class and checkpointed ingestion.
+
+    Methods:
+        events(): Fixture providing synthetic events of several repositories.
+        test_round_trip_and_merge(): Test binary save and load, and merging partial states.
+        test_resume_after_crash(): Test that an interrupted ingestion resumes at its line offset.
+        test_longer_range_only_ingests_new_files(): Test that re-running with more files only ingests the new ones.
+
+    """
+
+    @pytest.fixture
+    def events(self, make_events):
+        """
+        Fixture providing synthetic events of several repositories.
+        """
+        return make_events(3000, ('octo/other', 'octo/repo', 'octo/repo'), actors=40)
+
+    @pytest.mark.parametrize('approximate', [False, True])
+    def test_round_trip_and_merge(self, events, tmp_path, approximate):
+        """
+        Test that saved states load with identical results, are compact, and that partial states merge into the
+        statistics of a single pass, while states covering the same source or with other scopes do not merge.
+        """
+        whole = EventAggregator.default(3, approximate).add(events)
+        first = AggregateState(EventAggregator.default(3, approximate).add(events[:1000]), {'a': {'offset': 1000}})
+        second = AggregateState(EventAggregator.default(3, approximate).add(events[1000:]), {'b': {'offset': 2000}})
+
+        path = str(tmp_path / 'first.state')
+        first.save(path)
+        loaded = AggregateState.load(path)
+        assert loaded.aggregator.results() == first.aggregator.results()
+        assert (loaded.cursor, loaded.top_k, loaded.approximate) == ({'a': {'offset': 1000}}, 3, approximate)
+
+        loaded.merge(AggregateState.from_bytes(second.to_bytes()))
+        assert loaded.aggregator.results() == whole.results()
+        assert loaded.cursor == {'a': {'offset': 1000}, 'b': {'offset': 2000}}
+        if not approximate:
+            assert len(loaded.to_bytes()) < len(json.dumps(loaded.aggregator.results())) / 2
+
+        with pytest.raises(ValueError):
+            loaded.merge(AggregateState(EventAggregator.default(3, approximate), {'a': {'offset': 5}}))
+        with pytest.raises(ValueError):
+            loaded.merge(AggregateState(EventAggregator.default(3, approximate), scope={'repo': 'octo/repo'}))
+        for data in (b'', b'JUNKJUNKJUNK', first.to_bytes()[:-10]):
+            with pytest.raises(InvalidInputException):
+                AggregateState.from_bytes(data)
+
+    def test_resume_after_crash(self, events, tmp_path, monkeypatch):
+        """
+        Test that an ingestion crashing in the middle of a file resumes at the checkpointed line offset and ends with
+        the statistics of an uninterrupted run.
+        """
+        lines = [json.dumps(event) for event in events]
+        lines[2500] = '{"repo": {"name": "octo/repo"'
+        path = write_archive(tmp_path / '2023-06-14-0.json.gz', lines)
+        checkpoint = str(tmp_path / 'run.state')
+        monkeypatch.setattr(gharchive, 'CHECKPOINT_CHECK_EVENTS', 100)
+        ingestor = GHArchiveIngestor(workers=1, top_k=3, checkpoint_interval=0)
+
+        with pytest.raises(json.JSONDecodeError):
+            ingestor.ingest([path], 'octo/repo', checkpoint=checkpoint)
+        position = AggregateState.load(checkpoint).cursor[os.path.abspath(path)]
+        assert not position['done'] and 2000 < position['offset'] <= 2500
+
+        lines[2500] = json.dumps(events[2500])
+        write_archive(tmp_path / '2023-06-14-0.json.gz', lines)
+        result = ingestor.ingest([path], 'octo/repo', checkpoint=checkpoint)
+
+        expected = EventAggregator.default(3).add(event for event in events if event['repo']['name'] == 'octo/repo')
+        assert result.aggregator.results() == expected.results()
+        assert result.scanned == 3000 - position['offset']
+        with pytest.raises(InvalidInputException):
+            ingestor.ingest([path], 'octo/other', checkpoint=checkpoint)
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_longer_range_only_ingests_new_files(self, events, tmp_path, workers):
+        """
+        Test that re-running with more files only ingests the new ones, with one worker or a process pool.
+        """
+        paths = [write_archive(tmp_path / f'2023-06-14-{hour}.json.gz', map(json.dumps, events[hour::3]))
+                 for hour in range(3)]
+        checkpoint = str(tmp_path / 'run.state')
+        ingestor = GHArchiveIngestor(workers=workers, top_k=3)
+
+        ingestor.ingest(paths[:2], checkpoint=checkpoint)
+        result = ingestor.ingest(paths, checkpoint=checkpoint)
+
+        expected = GHArchiveIngestor(workers=1, top_k=3).ingest(paths)
+        assert (result.files, result.skipped, result.scanned) == (1, 2, 1000)
+        assert result.aggregator.results() == expected.aggregator.results()
@@ -0,0 +1,84 @@
+"""
+Async GitHub Events API Analyzer Unit Tests
+
+This module contains unit tests for the AsyncGitHubEventsAnalyzer class.
+
+Classes:
+- TestAsyncGitHubEventsAnalyzer
+
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from benchmarks.stub_server import StubGitHubServer  # noqa: E402
+from controllers.async_github_event_analyzer import AsyncGitHubEventsAnalyzer  # noqa: E402
+from controllers.github_event_analyzer import GitHubEventsAnalyzer  # noqa: E402
+
+
+class TestAsyncGitHubEventsAnalyzer:
+    """
+    Unit tests for the AsyncGitHubEventsAnalyzer class.
+
+    Methods:
+        stub_server(): Fixture running a local stub of the GitHub events API.
+        test_matches_sync_analyzer(): Test that the async and sync analyzers produce identical results.
+        test_fetch_all_events(): Test that all pages are fetched and deduplicated.
+
+    """
+
+    @pytest.fixture
+    def stub_server(self):
+        """
+        Fixture running a local stub of the GitHub events API.
+
+        Returns:
+            A started StubGitHubServer.
+
+        """
+        with StubGitHubServer(events_per_repo=120) as server:
+            yield server
+
+    def test_matches_sync_analyzer(self, stub_server):
+        """
+        Test that the async and sync analyzers produce identical results.
+
+        Args:
+            stub_server: The local stub server.
+
+        """
+        repositories = [('octo', f'repo{index}') for index in range(5)]
+
+        async def run():
+            async with AsyncGitHubEventsAnalyzer(base_url=stub_server.base_url, max_concurrency=3) as analyzer:
+                return await analyzer.analyze_repositories(repositories, event_type='PushEvent')
+
+        results = asyncio.run(run())
+
+        sync_analyzer = GitHubEventsAnalyzer(base_url=stub_server.base_url)
+        for owner, name in repositories:
+            events = sync_analyzer.filter_events(sync_analyzer.fetch_events(owner, name), 'PushEvent')
+            result = results[f'{owner}/{name}']
+            assert result['events'] == events
+            assert result['statistics'] == sync_analyzer.calculate_event_statistics(events)
+            assert result['most_active_user'] == sync_analyzer.identify_most_active_user(events)
+
+    def test_fetch_all_events(self, stub_server):
+        """
+        Test that all pages are fetched and deduplicated.
+
+        Args:
+            stub_server: The local stub server.
+
+        """
+        async def run():
+            async with AsyncGitHubEventsAnalyzer(base_url=stub_server.base_url) as analyzer:
+                return await analyzer.fetch_all_events('octo', 'repo')
+
+        events = asyncio.run(run())
+
+        assert len(events) == 120
+        assert len({event['id'] for event in events}) == 120
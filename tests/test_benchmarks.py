@@ -0,0 +1,104 @@
+"""
+Benchmark Suite Unit Tests
+
+This module contains unit tests for the benchmark stub server and the result comparison.
+
+Classes:
+- TestBenchmarks
+
+"""
+
+from benchmarks.bench_import_time import DEFERRED_MODULES, measure_import, measure_path, parse_importtime, startup_paths
+from benchmarks.run_benchmarks import analysis_benchmarks, compare, decode_benchmarks
+from benchmarks.stub_server import StubGitHubServer
+from controllers.base.response_cache import ResponseCache
+from controllers.base.transport import Transport
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+
+class TestBenchmarks:
+    """
+    Unit tests for the benchmark suite.
+
+    Methods:
+        test_stub_server_etag_and_errors(): Test conditional requests and injected errors against the stub server.
+        test_analysis_benchmarks(): Test that every analysis method is timed at every scale.
+        test_decode_benchmarks(): Test that every decoding path is timed on CPU and its peak memory measured.
+        test_compare_flags_regressions(): Test that slowdowns beyond the threshold are flagged.
+        test_startup_defers_heavy_imports(): Test that importing the CLI entry point loads no network or NumPy code.
+        test_startup_paths_defer_heavy_imports(): Test that a validation error and an offline run load neither.
+
+    """
+
+    def test_stub_server_etag_and_errors(self):
+        """
+        Test conditional requests and retried injected errors against the stub server.
+        """
+        with StubGitHubServer(events_per_repo=5, error_rate=0.5, seed=1) as server:
+            transport = Transport(backoff_factor=0, max_retries=20)
+            analyzer = GitHubEventsAnalyzer(base_url=server.base_url, transport=transport, cache=ResponseCache())
+
+            first = analyzer.fetch_events('octo', 'repo')
+            second = analyzer.fetch_events('octo', 'repo')
+            analyzer.close()
+
+        assert first == second and len(first) == 5
+        assert server.not_modified_count == 1
+        assert server.error_count > 0
+        assert server.request_count == 2 + server.error_count
+
+    def test_analysis_benchmarks(self):
+        """
+        Test that every analysis method is timed at every scale.
+        """
+        results = analysis_benchmarks([10, 20], repeat=1)
+
+        assert sorted(results) == sorted(f"{method}@{scale}" for scale in (10, 20) for method in (
+            'display_events', 'filter_events', 'calculate_event_statistics', 'identify_most_active_user',
+            'calculate_event_timeline'))
+        assert all(entry['count'] in (10, 20) and entry['input'] == 'list' for entry in results.values())
+
+    def test_decode_benchmarks(self):
+        """
+        Test that full, projected and streaming decoding are each timed on CPU and their peak memory measured.
+        """
+        results = decode_benchmarks(pages=2, repeat=1)
+
+        assert sorted(results) == ['decode_page', 'decode_page_projected', 'decode_page_streaming']
+        assert all(entry['count'] == 2 and entry['unit'] == 'pages' and entry['clock'] == 'cpu'
+                   and entry['peak_bytes'] > 0 for entry in results.values())
+
+    def test_compare_flags_regressions(self):
+        """
+        Test that slowdowns beyond the threshold are flagged, per operation.
+        """
+        baseline = {'benchmarks': {'fetch': {'count': 100, 'seconds': 1.0}, 'gone': {'count': 1, 'seconds': 1.0}}}
+        current = {'benchmarks': {'fetch': {'count': 200, 'seconds': 2.5}, 'new': {'count': 1, 'seconds': 1.0}}}
+
+        assert compare(baseline, current, threshold=0.1) == [('fetch', 0.01, 0.0125, 0.25, True)]
+
+    def test_startup_defers_heavy_imports(self):
+        """
+        Test that importing the CLI entry point in a fresh interpreter loads neither the analyzer nor the modules
+        deferred until a fetch, and that the `-X importtime` report is parsed.
+        """
+        timings, modules = measure_import('main', runs=1)
+
+        assert timings[0] > 0 and modules['main'][1] / 1000 == timings[0]
+        assert not [name for name in DEFERRED_MODULES if name in modules]
+        assert 'controllers.github_event_analyzer' not in modules
+        assert parse_importtime('import time: self [us] | cumulative | imported package\n'
+                                'import time:       120 |        450 | json') == {'json': (120, 450)}
+
+    def test_startup_paths_defer_heavy_imports(self, tmp_path):
+        """
+        Test that an invocation rejected by argument validation and an offline GH Archive ingestion load none of the
+        modules deferred until a fetch or a NumPy or SQLite backed command.
+        """
+        paths = startup_paths(str(tmp_path))
+
+        for name in ('validation error', 'offline gharchive'):
+            timings, modules = measure_path(paths[name], runs=1)
+            assert timings[0] > 0 and 'controllers.output_writers' in modules
+            assert not [module for module in DEFERRED_MODULES if module in modules]
+        assert 'controllers.github_event_analyzer' not in measure_path(paths['validation error'], runs=1)[1]
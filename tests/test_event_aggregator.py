@@ -0,0 +1,74 @@
+"""
+Event Aggregator Unit Tests
+
+This module contains unit tests for the EventAggregator class and its metrics.
+
+Classes:
+- TestEventAggregator
+
+"""
+
+from controllers.event_aggregator import EventAggregator, Metric
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+
+class TestEventAggregator:
+    """
+    Unit tests for the EventAggregator class.
+
+    Methods:
+        test_default_metrics(): Test every built-in metric in a single pass.
+        test_empty_input(): Test that empty input yields empty results instead of raising.
+        test_custom_metric(): Test that a custom metric plugs into the same pass.
+
+    """
+
+    events = [{'type': 'PushEvent', 'actor': {'login': 'user1'}, 'repo': {'name': 'o/a'},
+               'created_at': '2023-06-14T10:30:00Z'},
+              {'type': 'PullRequestEvent', 'actor': {'login': 'user2'}, 'repo': {'name': 'o/b'},
+               'created_at': '2023-06-14T11:30:00Z'},
+              {'type': 'PushEvent', 'actor': {'login': 'user1'}, 'repo': {'name': 'o/a'},
+               'created_at': '2023-06-14T09:30:00Z'}]
+
+    def test_default_metrics(self):
+        """
+        Test every built-in metric in a single pass.
+        """
+        results = EventAggregator.default(top_k=2).add(self.events).results()
+
+        assert results['event_types'] == {'PushEvent': 2, 'PullRequestEvent': 1}
+        assert results['actors'] == {'user1': 2, 'user2': 1}
+        assert results['top_actors'] == [('user1', 2), ('user2', 1)]
+        assert results['repos'] == {'o/a': 2, 'o/b': 1}
+        assert results['time_bounds'] == ('2023-06-14T09:30:00Z', '2023-06-14T11:30:00Z')
+
+    def test_empty_input(self):
+        """
+        Test that empty input yields empty results instead of raising.
+        """
+        analyzer = GitHubEventsAnalyzer()
+
+        assert analyzer.calculate_event_statistics([]) == {}
+        assert analyzer.identify_most_active_user([]) is None
+        assert EventAggregator.default().add([]).results()['top_actors'] == []
+
+    def test_custom_metric(self):
+        """
+        Test that a custom metric plugs into the same pass.
+        """
+        class PushCount(Metric):
+            name = 'pushes'
+
+            def __init__(self):
+                self.count = 0
+
+            def update(self, event):
+                self.count += event['type'] == 'PushEvent'
+
+            def result(self):
+                return self.count
+
+        aggregator = EventAggregator.default().register(PushCount()).add(self.events)
+
+        assert aggregator.results()['pushes'] == 2
+        assert aggregator.most_active_user == 'user1'
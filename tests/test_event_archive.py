@@ -0,0 +1,69 @@
+"""
+Event Archive Unit Tests
+
+This module contains unit tests for the EventArchive and ArchivedEvents classes.
+
+Classes:
+- TestEventArchive
+
+"""
+
+from benchmarks.stub_server import synthetic_event
+from controllers.event_archive import EventArchive
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from tests.test_github_event_analyzer import PagedEventsBackend
+
+
+class TestEventArchive:
+    """
+    Unit tests for the EventArchive class.
+
+    Methods:
+        test_incremental_sync(): Test that syncing stops at the first archived event.
+        test_queries_match_list_analysis(): Test that SQL queries match the list based methods.
+
+    """
+
+    def test_incremental_sync(self, tmp_path):
+        """
+        Test that syncing stops at the first archived event.
+
+        Args:
+            tmp_path: Fixture providing a temporary directory.
+        """
+        events = [synthetic_event('octo/repo', index) for index in range(6)]
+        archive = EventArchive(str(tmp_path / 'events.db'))
+        archive.upsert(events[2:])
+
+        backend = PagedEventsBackend([events[0:2], events[2:4], events[4:6]])
+        new_events = archive.sync(GitHubEventsAnalyzer(backend=backend), 'octo', 'repo')
+
+        assert new_events == 2
+        assert len(backend.requested_urls) == 2
+        assert len(archive.events('octo/repo')) == 6
+        archive.close()
+
+    def test_queries_match_list_analysis(self, tmp_path):
+        """
+        Test that SQL queries match the list based methods.
+
+        Args:
+            tmp_path: Fixture providing a temporary directory.
+        """
+        events = [synthetic_event('octo/repo', index, actors=7) for index in range(100)]
+        events += [synthetic_event('octo/other', index + 1000) for index in range(10)]
+        analyzer = GitHubEventsAnalyzer()
+
+        with EventArchive(str(tmp_path / 'events.db')) as archive:
+            archive.upsert(events)
+            repo_events = [event for event in events if event['repo']['name'] == 'octo/repo']
+            archived = archive.events('octo/repo')
+
+            pushes = analyzer.filter_events(repo_events, 'PushEvent')
+            archived_pushes = analyzer.filter_events(archived, 'PushEvent')
+
+            assert [event['id'] for event in archived_pushes] == [event['id'] for event in pushes]
+            assert analyzer.calculate_event_statistics(archived) == analyzer.calculate_event_statistics(repo_events)
+            assert analyzer.identify_most_active_user(archived_pushes) == analyzer.identify_most_active_user(pushes)
+            assert [event['id'] for event in archived.order_by_time()] == \
+                [event['id'] for event in sorted(repo_events, key=lambda event: event['created_at'])]
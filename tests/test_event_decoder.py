@@ -0,0 +1,82 @@
+"""
+Event Decoder Unit Tests
+
+This module contains unit tests for the field-projecting JSON decoding of event pages.
+
+Classes:
+- TestProjectingEventDecoder
+
+"""
+
+import json
+
+import pytest
+
+from benchmarks.stub_server import synthetic_event
+from controllers.base.response_cache import ResponseCache
+from controllers.event_decoder import ProjectingEventDecoder, iter_json_array
+from controllers.event_pipeline import project_stage
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from tests.test_github_event_analyzer import PagedEventsBackend
+
+
+class TestProjectingEventDecoder:
+    """
+    Unit tests for the ProjectingEventDecoder class.
+
+    Methods:
+        test_decode_matches_projection(): Test that every decoding path matches `json.loads` followed by projection.
+        test_iter_json_array(): Test element by element decoding, including whitespace, empty and malformed arrays.
+        test_analysis_is_unchanged(): Test that analysis results are identical with projected decoding.
+
+    """
+
+    @pytest.mark.parametrize("use_orjson, streaming", [(True, False), (False, False), (False, True)])
+    def test_decode_matches_projection(self, use_orjson, streaming):
+        """
+        Test that every decoding path matches `json.loads` followed by projection, and leaves non-array documents
+        alone.
+        """
+        page = [synthetic_event("owner/repo", index) for index in range(20)]
+        page[3]['actor']['login'] = "ünïcode \"quoted\""
+        del page[5]['repo']
+        content = json.dumps(page, indent=1).encode()
+        decoder = ProjectingEventDecoder(use_orjson=use_orjson, streaming=streaming)
+
+        assert decoder.decode(content) == list(project_stage(json.loads(content)))
+        assert decoder.decode(b'{"message": "Not Found"}') == {'message': "Not Found"}
+        assert ProjectingEventDecoder(("type",), use_orjson, streaming).decode(content)[0] == {'type': page[0]['type']}
+
+    def test_iter_json_array(self):
+        """
+        Test element by element decoding, including whitespace, empty and malformed arrays.
+        """
+        assert list(iter_json_array('[ 1 ,{"a": [2, 3]} ,"x" ]\n')) == [1, {'a': [2, 3]}, "x"]
+        assert list(iter_json_array(' [ ] ', 1)) == []
+
+        for malformed in ('[1 2]', '[1,', '[1] 2', '{"a": 1}'):
+            with pytest.raises(ValueError):
+                list(iter_json_array(malformed))
+
+    def test_analysis_is_unchanged(self):
+        """
+        Test that analysis results are identical with projected decoding, and that projected responses are cached
+        apart from full ones.
+        """
+        pages = [[synthetic_event("owner/repo", index) for index in range(start, start + 100)] for start in (0, 100)]
+        cache = ResponseCache()
+        full = GitHubEventsAnalyzer(backend=PagedEventsBackend(pages), cache=cache)
+        projected = GitHubEventsAnalyzer(backend=PagedEventsBackend(pages), cache=cache)
+        projected.event_decoder = ProjectingEventDecoder()
+
+        full_events = full.fetch_all_events("owner", "repo")
+        projected_events = projected.fetch_all_events("owner", "repo")
+
+        assert projected_events == list(project_stage(full_events))
+        assert 'payload' in full.fetch_events("owner", "repo", 1, 100)[0]
+        for analyzer, events in ((full, full_events), (projected, projected_events)):
+            pushes = analyzer.filter_events(events, "PushEvent")
+            assert analyzer.calculate_event_statistics(pushes) == full.calculate_event_statistics(
+                full.filter_events(full_events, "PushEvent"))
+            assert analyzer.identify_most_active_user(events) == full.identify_most_active_user(full_events)
+        assert len(cache) == 4
@@ -0,0 +1,107 @@
+"""
+Event Index Unit Tests
+
+This module contains unit tests for the in-memory event indexes and the interactive query shell.
+
+Classes:
+- TestEventIndex
+
+"""
+
+import io
+from collections import Counter
+
+from controllers.event_index import EventIndex
+from controllers.github_event_analyzer import GitHubEventsAnalyzer, GitHubEventsAnalyzerCLI
+from tests.test_github_event_analyzer import PagedEventsBackend
+from utils.timestamps import parse_timestamp
+
+
+class TestEventIndex:
+    """
+    Unit tests for the EventIndex and EventShell classes.
+
+    Methods:
+        test_queries_match_scans(): Test every query against a scan of the events.
+        test_refresh_fetches_only_new_events(): Test that a refresh stops at the first indexed event.
+        test_shell_commands(): Test the shell commands, errors and refresh through `explore_events`.
+
+    """
+
+    def test_queries_match_scans(self, events):
+        """
+        Test that filtered, ordered and limited queries, counts, statistics and top actors match a scan of the
+        events, including after older events force a rebuild.
+        """
+        index = EventIndex()
+        assert index.add(events[:400]) == 400
+        assert index.add(events[300:]) == 200
+        assert len(index) == 600
+
+        chronological = sorted(events, key=lambda event: event['created_at'])
+        times = sorted(parse_timestamp(event['created_at']) for event in events)
+        for event_type in (None, 'PushEvent', 'WatchEvent', 'GollumEvent'):
+            for actor in (None, 'user3', 'nobody'):
+                for since, until in ((None, None), (times[100], times[250]), (times[599] + 1, None)):
+                    expected = [event['id'] for event in chronological
+                                if (event_type is None or event['type'] == event_type)
+                                and (actor is None or event['actor']['login'] == actor)
+                                and (since is None or parse_timestamp(event['created_at']) >= since)
+                                and (until is None or parse_timestamp(event['created_at']) < until)]
+                    query = (event_type, actor, since, until)
+                    assert [event['id'] for event in index.events(*query)] == expected
+                    assert [event['id'] for event in index.events(*query, reverse=True, limit=5)] == \
+                        expected[::-1][:5]
+                    assert index.count(*query) == len(expected)
+
+        analyzer = GitHubEventsAnalyzer()
+        assert index.statistics() == analyzer.calculate_event_statistics(events)
+        assert index.statistics('user3') == analyzer.calculate_event_statistics(
+            [event for event in events if event['actor']['login'] == 'user3'])
+        pushes = Counter(event['actor']['login'] for event in events if event['type'] == 'PushEvent')
+        assert index.top_actors(3, 'PushEvent') == pushes.most_common(3)
+        assert index.top_actors(1)[0][0] == analyzer.identify_most_active_user(events)
+
+    def test_refresh_fetches_only_new_events(self, events):
+        """
+        Test that a refresh indexes the new events, stops at the first indexed event without fetching further pages,
+        and appends to the indexes without a rebuild.
+        """
+        backend = PagedEventsBackend([events[100:200], events[200:300]])
+        analyzer = GitHubEventsAnalyzer(backend=backend)
+        index = EventIndex()
+        index.add(analyzer.iter_events('octo', 'repo', 1, 2, 100))
+        order = index._order
+
+        backend.pages = [events[50:150], events[150:250]]
+        backend.requested_urls.clear()
+        assert index.refresh(analyzer, 'octo', 'repo', max_pages=2) == 50
+        assert len(backend.requested_urls) == 1 and index._order is order
+        assert index.events(reverse=True, limit=1)[0]['id'] == events[50]['id']
+        assert index.refresh(analyzer, 'octo', 'repo') == 0
+
+    def test_shell_commands(self, events):
+        """
+        Test that shell commands answer from the index, report invalid arguments without leaving, and refresh.
+        """
+        backend = PagedEventsBackend([events[10:110]])
+        commands = ['events type=PushEvent actor=user0 limit=2 sort=reverse-chronological', 'count type=WatchEvent',
+                    'stats', 'stats actor=user1', 'top 2 type=PushEvent', 'events since=yesterday', 'top x',
+                    'count since=2023-13-45', 'count until=2023-02-30T25:00:00Z', 'refresh', 'count', 'quit', 'count']
+        stdout = io.StringIO()
+        GitHubEventsAnalyzerCLI(backend=backend).explore_events(
+            'octo', 'repo', stdin=io.StringIO('\n'.join(commands) + '\n'), stdout=stdout)
+        output = stdout.getvalue()
+
+        pushes = [event for event in events[10:110] if event['type'] == 'PushEvent' and
+                  event['actor']['login'] == 'user0']
+        assert output.startswith('Indexed 100 events.')
+        assert output.count('Event: PushEvent\nUser: user0\n') == 2
+        assert f"Timestamp: {pushes[0]['created_at']}" in output
+        assert f"({sum(event['type'] == 'WatchEvent' for event in events[10:110])} events in" in output
+        assert 'Event Statistics:\n' in output and 'Most Active User: ' in output
+        assert 'Event Statistics of user1:\n' in output and '> 1. user' in output and '\n2. user' in output
+        assert "Error: Invalid since 'yesterday'" in output and "Error: Invalid number of users 'x'" in output
+        assert "Error: Invalid since '2023-13-45'" in output and "Error: Invalid until '2023-02-30T25:00:00Z'" in output
+        assert 'Indexed 0 new events (100 in total)' in output
+        assert output.count('(100 events in') == 1
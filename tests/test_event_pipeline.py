@@ -0,0 +1,156 @@
+"""
+Event Pipeline Unit Tests
+
+This module contains unit tests for the streaming event pipeline stages.
+
+Classes:
+- TestEventPipeline
+
+"""
+
+import itertools
+import json
+import random
+
+from controllers.event_aggregator import EventAggregator
+from controllers.event_pipeline import filter_stage, latest_stage, merge_stage, order_stage, project_stage
+from controllers.github_event_analyzer import GitHubEventsAnalyzer, GitHubEventsAnalyzerCLI
+from tests.test_github_event_analyzer import PagedEventsBackend
+
+
+class TestEventPipeline:
+    """
+    Unit tests for the streaming event pipeline.
+
+    Methods:
+        test_accumulator_matches_analysis_methods(): Test that incremental statistics match the batch methods.
+        test_project_stage(): Test that projection keeps nesting and drops everything else.
+        test_iter_events_is_lazy(): Test that pages are only fetched when the stream reaches them.
+        test_order_stage_matches_sorted(): Test that ordering matches `sorted` on sorted, reversed and shuffled input.
+        test_merge_and_latest_stages(): Test k-way merging of sorted runs and the bounded latest N selection.
+        test_cli_merges_pages(): Test that the pages of a multi-page fetch are merged into one ordered stream.
+        test_cli_statistics_follow_display_order(): Test that CLI statistics and ties follow the displayed order.
+
+    """
+
+    def test_accumulator_matches_analysis_methods(self):
+        """
+        Test that incremental statistics match the batch methods, including tie-breaking.
+        """
+        events = [{'type': 'PushEvent', 'actor': {'login': 'user2'}},
+                  {'type': 'PullRequestEvent', 'actor': {'login': 'user1'}},
+                  {'type': 'PushEvent', 'actor': {'login': 'user1'}},
+                  {'type': 'IssuesEvent', 'actor': {'login': 'user2'}}]
+        analyzer = GitHubEventsAnalyzer()
+        statistics = EventAggregator.default()
+
+        streamed = list(statistics.accumulate(filter_stage(events, 'PushEvent')))
+
+        assert statistics.event_statistics == analyzer.calculate_event_statistics(streamed)
+        assert statistics.most_active_user == analyzer.identify_most_active_user(streamed)
+
+        statistics = EventAggregator.default()
+        list(statistics.accumulate(events))
+
+        assert statistics.most_active_user == analyzer.identify_most_active_user(events) == 'user2'
+
+    def test_project_stage(self):
+        """
+        Test that projection keeps nesting and drops everything else.
+        """
+        event = {'id': '1', 'type': 'PushEvent', 'actor': {'login': 'user1', 'avatar_url': 'x'},
+                 'created_at': '2023-06-14T10:30:00Z', 'payload': {'commits': []}}
+
+        projected = next(project_stage([event]))
+
+        assert projected == {'id': '1', 'type': 'PushEvent', 'actor': {'login': 'user1'},
+                             'created_at': '2023-06-14T10:30:00Z'}
+
+    def test_iter_events_is_lazy(self):
+        """
+        Test that pages are only fetched when the stream reaches them.
+        """
+        backend = PagedEventsBackend([[{'id': '3'}, {'id': '2'}], [{'id': '2'}, {'id': '1'}]])
+        analyzer = GitHubEventsAnalyzer(backend=backend)
+
+        events = analyzer.iter_events('user1', 'repo1', max_pages=10)
+        first_two = list(itertools.islice(events, 2))
+
+        assert [event['id'] for event in first_two] == ['3', '2']
+        assert len(backend.requested_urls) == 1
+        assert [event['id'] for event in events] == ['1']
+        assert len(backend.requested_urls) == 2
+
+    @staticmethod
+    def timed_events(count):
+        """
+        Builds events with many equal timestamps, newest first, identified by their position.
+        """
+        return [{'id': str(index), 'created_at': f'2023-06-14T10:{59 - index // 3:02d}:00Z'} for index in range(count)]
+
+    def test_order_stage_matches_sorted(self):
+        """
+        Test that ordering matches `sorted` on sorted, reversed and shuffled input, including the order of ties.
+        """
+        newest_first = self.timed_events(30)
+        shuffled = random.Random(7).sample(newest_first, len(newest_first))
+
+        for events in (newest_first, newest_first[::-1], shuffled):
+            for reverse in (False, True):
+                expected = sorted(events, key=lambda event: event['created_at'], reverse=reverse)
+                assert list(order_stage(iter(events), reverse)) == expected
+
+    def test_merge_and_latest_stages(self):
+        """
+        Test k-way merging of sorted runs, lazily and with ties in run order, and the bounded latest N selection in
+        both orders.
+        """
+        events = self.timed_events(30)
+        runs = [events[0::3], events[1::3], events[2::3]]
+
+        merged = merge_stage(*(iter(run) for run in runs), reverse=True)
+
+        assert next(merged) == events[0]
+        assert [events[0]] + list(merged) == sorted(events, key=lambda event: event['created_at'], reverse=True)
+        chronological_runs = [run[::-1] for run in runs]
+        assert list(merge_stage(*chronological_runs)) == sorted(itertools.chain(*chronological_runs),
+                                                                 key=lambda event: event['created_at'])
+
+        shuffled = random.Random(7).sample(events, len(events))
+        by_time = sorted(shuffled, key=lambda event: event['created_at'], reverse=True)
+        assert list(latest_stage(shuffled, 6)) == by_time[:6]
+        chronological = sorted(by_time[:6], key=lambda event: event['created_at'])
+        assert list(latest_stage(shuffled, 6, reverse=False)) == chronological
+
+    def test_cli_statistics_follow_display_order(self, capsys):
+        """
+        Test that the CLI counts statistics in display order, like sorting then analyzing, so that the order of the
+        statistics and the most active user among tied users follow the sort order.
+        """
+        events = [{'id': '2', 'type': 'PushEvent', 'actor': {'login': 'bob'}, 'created_at': '2023-06-14T10:01:00Z'},
+                  {'id': '1', 'type': 'WatchEvent', 'actor': {'login': 'alice'}, 'created_at': '2023-06-14T10:00:00Z'}]
+        cli = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend([events]))
+
+        cli.fetch_and_display_events('octo', 'repo')
+        assert capsys.readouterr().out.endswith('Event Statistics:\nWatchEvent: 1\nPushEvent: 1\n'
+                                                'Most Active User: alice\n')
+
+        cli.fetch_and_display_events('octo', 'repo', sort_order='reverse-chronological')
+        assert capsys.readouterr().out.endswith('Event Statistics:\nPushEvent: 1\nWatchEvent: 1\n'
+                                                'Most Active User: bob\n')
+
+    def test_cli_merges_pages(self, capsys):
+        """
+        Test that the pages of a multi-page fetch are ordered and merged even when they overlap in time, as when new
+        events shift the pages between requests.
+        """
+        events = [{'id': str(index), 'type': 'PushEvent', 'actor': {'login': f'user{index % 3}'},
+                   'created_at': f'2023-06-14T10:{59 - index:02d}:00Z'} for index in range(8)]
+        pages = [events[0:2] + events[4:6], events[2:4] + events[6:8]]
+        cli = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend(pages))
+
+        for sort_order, expected in (('chronological', events[::-1]), ('reverse-chronological', events)):
+            cli.fetch_and_display_events('octo', 'repo', sort_order=sort_order, all_pages=True, max_pages=2,
+                                         output_format='jsonl')
+            lines = capsys.readouterr().out.splitlines()
+            assert [json.loads(line)['id'] for line in lines] == [event['id'] for event in expected]
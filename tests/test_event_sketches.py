@@ -0,0 +1,172 @@
+"""
+Event Sketches Unit Tests
+
+This module contains unit tests for the probabilistic sketches and the approximate aggregation mode, checked against
+the exact counts.
+
+Classes:
+- TestEventSketches
+
+"""
+
+import gzip
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from controllers.aggregate_state import AggregateState
+from controllers.event_aggregator import EventAggregator, SketchedActorCounts
+from controllers.event_sketches import CountMinSketch, HyperLogLog
+from controllers.gharchive import GHArchiveIngestor
+from utils.custom_exception import InvalidInputException
+
+
+class TestEventSketches:
+    """
+    Unit tests for the HyperLogLog and CountMinSketch classes and the approximate `EventAggregator`.
+
+    Methods:
+        events(): Fixture providing events whose actors follow a skewed distribution.
+        test_hyperloglog_accuracy(): Test distinct counts against exact counts, and merging shards.
+        test_count_min_bounds(): Test that estimates never undercount and stay within the error bound.
+        test_approximate_matches_exact(): Test the approximate aggregator and its merge against the exact path.
+        test_approximate_archive_ingestion(): Test approximate GH Archive ingestion on a process pool.
+        test_configurable_error_bounds(): Test that sketch settings size the sketches and are kept by checkpoints.
+
+    """
+
+    @pytest.fixture
+    def events(self):
+        """
+        Fixture providing events whose actors follow a skewed distribution, with a long tail of one-off actors.
+        """
+        rng = random.Random(7)
+        logins = [f"user{int(rng.paretovariate(1.2))}" for _ in range(40000)]
+        logins += [f"tail{index}" for index in range(20000)]
+        rng.shuffle(logins)
+        return [{'type': rng.choice(('PushEvent', 'IssuesEvent', 'WatchEvent')), 'actor': {'login': login},
+                 'repo': {'name': f"org/{login[-1]}"}, 'created_at': '2023-06-14T10:00:00Z'} for login in logins]
+
+    def test_hyperloglog_accuracy(self):
+        """
+        Test that distinct counts are within three standard errors, nearly exact for small inputs, unaffected by
+        repeats, and that merging shards gives the sketch of the whole stream.
+        """
+        for distinct in (10, 1000, 200000):
+            sketch = HyperLogLog(error=0.01)
+            for index in range(distinct):
+                sketch.add(f"user{index}")
+                sketch.add(f"user{index}")
+            assert abs(sketch.count() - distinct) <= 3 * sketch.error * distinct + 1
+
+        whole, first, second = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for index in range(50000):
+            whole.add(f"user{index}")
+            (first if index % 3 else second).add(f"user{index}")
+        first.merge(second)
+        assert first.registers == whole.registers
+        with pytest.raises(ValueError):
+            first.merge(HyperLogLog(precision=10))
+
+    def test_count_min_bounds(self, events):
+        """
+        Test that estimates never undercount, stay within the error bound, and that merging shards gives the sketch
+        of the whole stream.
+        """
+        exact = Counter(event['actor']['login'] for event in events)
+        whole, first, second = CountMinSketch(error=0.001), CountMinSketch(error=0.001), CountMinSketch(error=0.001)
+        for index, event in enumerate(events):
+            whole.add(event['actor']['login'])
+            (first if index % 2 else second).add(event['actor']['login'])
+
+        overcounts = [whole.estimate(login) - count for login, count in exact.items()]
+        assert min(overcounts) >= 0
+        assert sum(overcount > whole.error_bound for overcount in overcounts) <= 0.01 * len(exact)
+
+        first.merge(second)
+        assert first.counters == whole.counters and first.total == whole.total == len(events)
+
+    def test_approximate_matches_exact(self, events):
+        """
+        Test that the approximate aggregator finds the exact top actors and event statistics, estimates the distinct
+        actors closely in bounded memory, and merges shards into the same answer.
+        """
+        exact = EventAggregator.default(top_k=5).add(events)
+        approximate = EventAggregator.default(top_k=5, approximate=True).add(events)
+        shards = [EventAggregator.default(top_k=5, approximate=True).add(events[index::4]) for index in range(4)]
+        merged = EventAggregator.default(top_k=5, approximate=True)
+        for shard in shards:
+            merged.merge(shard)
+
+        exact_results = exact.results()
+        exact_top = [login for login, _ in exact_results['top_actors']]
+        error_bound = approximate.metric('actors').sketch.error_bound
+        for aggregator in (approximate, merged):
+            results = aggregator.results()
+            assert results['event_types'] == exact_results['event_types']
+            assert [login for login, _ in results['top_actors']] == exact_top
+            for login, estimate in results['top_actors']:
+                assert 0 <= estimate - exact_results['actors'][login] <= error_bound
+            assert abs(results['distinct_actors'] - len(exact_results['actors'])) <= 0.03 * len(
+                exact_results['actors'])
+            assert len(results['actors']) <= aggregator.metric('actors').capacity
+            assert aggregator.most_active_user == exact.most_active_user
+
+        small = SketchedActorCounts(capacity=3)
+        for event in events:
+            small.update(event)
+        assert list(sorted(small.counts, key=small.counts.get, reverse=True)) == exact_top[:3]
+
+    def test_approximate_archive_ingestion(self, events, tmp_path):
+        """
+        Test that approximate GH Archive ingestion merges worker sketches into the same answer as the exact path.
+        """
+        paths = []
+        for index in range(2):
+            path = tmp_path / f'2023-06-14-{index}.json.gz'
+            with gzip.open(path, 'wt') as archive_file:
+                archive_file.writelines(json.dumps(event) + '\n' for event in events[index::2])
+            paths.append(str(path))
+
+        exact = GHArchiveIngestor(workers=1).ingest(paths).aggregator
+        approximate = GHArchiveIngestor(workers=2, approximate=True).ingest(paths).aggregator
+
+        assert approximate.event_statistics == exact.event_statistics
+        assert approximate.most_active_user == exact.most_active_user
+        assert abs(approximate.results()['distinct_actors'] - len(exact.results()['actors'])) <= 0.03 * len(
+            exact.results()['actors'])
+
+    def test_configurable_error_bounds(self, events, tmp_path):
+        """
+        Test that the sketch settings size the actor and repository sketches and bound their estimates, that only
+        aggregators with the same settings merge, and that checkpoints keep the settings and reject others.
+        """
+        settings = (0.01, 0.9, 0.05)
+        exact = EventAggregator.default(top_k=5).add(events)
+        coarse = EventAggregator.default(5, True, *settings).add(events)
+
+        for name in ('actors', 'repos'):
+            metric = coarse.metric(name)
+            assert (metric.sketch.width, metric.sketch.depth) == (272, 3)
+            assert metric.distinct.precision == 9
+            assert metric.sketch.error_bound == int(0.01 * len(events))
+        sketch = coarse.metric('actors').sketch
+        for login, count in exact.results()['top_actors']:
+            assert 0 <= sketch.estimate(login) - count <= sketch.error_bound
+        assert coarse.most_active_user == exact.most_active_user
+        with pytest.raises(ValueError):
+            EventAggregator.default(5, True).merge(coarse)
+
+        loaded = AggregateState.from_bytes(AggregateState(coarse).to_bytes())
+        assert loaded.sketch_settings == settings and loaded.aggregator.results() == coarse.results()
+
+        path = tmp_path / '2023-06-14-0.json.gz'
+        with gzip.open(path, 'wt') as archive_file:
+            archive_file.writelines(json.dumps(event) + '\n' for event in events[:1000])
+        checkpoint = str(tmp_path / 'run.state')
+        GHArchiveIngestor(workers=1, approximate=True, sketch_error=0.01).ingest([str(path)], checkpoint=checkpoint)
+        assert AggregateState.load(checkpoint).sketch_settings == (0.01, 0.99, 0.01)
+        with pytest.raises(InvalidInputException):
+            GHArchiveIngestor(workers=1, approximate=True).ingest([str(path)], checkpoint=checkpoint)
@@ -0,0 +1,122 @@
+"""
+Event Snapshot Unit Tests
+
+This module contains unit tests for the memory-mapped event snapshots, with and without NumPy.
+
+Classes:
+- TestEventSnapshot
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from controllers.event_snapshot import load_snapshot, save_snapshot
+from controllers.event_store import EventStore
+from controllers.github_event_analyzer import GitHubEventsAnalyzer, GitHubEventsAnalyzerCLI
+from tests.test_github_event_analyzer import PagedEventsBackend
+from utils.custom_exception import InvalidInputException
+
+
+def snapshot_statistics(path):
+    """
+    Returns the statistics and most active user of a snapshot, in a worker process.
+    """
+    store = load_snapshot(path)
+    return store.event_statistics(), store.most_active_user()
+
+
+class TestEventSnapshot:
+    """
+    Unit tests for the save_snapshot and load_snapshot functions.
+
+    Methods:
+        events(): Fixture providing synthetic events, newest first.
+        test_mapped_store_matches_list_analysis(): Test analysis over a loaded snapshot against the list methods.
+        test_invalid_snapshots(): Test that truncated or foreign files are rejected.
+        test_processes_share_a_snapshot(): Test that worker processes analyze the same snapshot file.
+        test_cli_round_trip(): Test saving fetched events and displaying them from the snapshot.
+
+    """
+
+    @pytest.fixture
+    def events(self, make_events):
+        """
+        Fixture providing synthetic events, newest first, with non-ASCII repository names.
+        """
+        return make_events(300, ('octo/repo', 'octo/répo'))
+
+    def test_mapped_store_matches_list_analysis(self, use_numpy, events, tmp_path):
+        """
+        Test that a loaded snapshot is a view of the file, rebuilds every event and gives the results of the list
+        based analysis methods.
+        """
+        path = str(tmp_path / 'events.snapshot')
+        assert save_snapshot(EventStore.from_events(events), path) < 30 * len(events) + 1024
+        store = load_snapshot(path)
+        analyzer = GitHubEventsAnalyzer()
+
+        assert isinstance(store.columns['ids'], memoryview) and len(store) == len(events)
+        assert list(store) == list(EventStore.from_events(events))
+        assert analyzer.calculate_event_statistics(store) == analyzer.calculate_event_statistics(events)
+        for event_type in ('PushEvent', 'UnknownEvent'):
+            filtered = analyzer.filter_events(events, event_type)
+            filtered_store = analyzer.filter_events(store, event_type)
+            assert [event['id'] for event in filtered_store] == [event['id'] for event in filtered]
+            assert analyzer.identify_most_active_user(filtered_store) == analyzer.identify_most_active_user(filtered)
+        assert [event['id'] for event in store.order_by_time()] == [event['id'] for event in reversed(events)]
+        assert analyzer.calculate_event_timeline(store, '1h').buckets() == \
+            analyzer.calculate_event_timeline(events, '1h').buckets()
+
+        copy_path = str(tmp_path / 'copy.snapshot')
+        save_snapshot(store, copy_path)
+        with open(path, 'rb') as original, open(copy_path, 'rb') as copy:
+            assert original.read() == copy.read()
+
+    def test_invalid_snapshots(self, events, tmp_path):
+        """
+        Test that empty, foreign and truncated files are rejected with InvalidInputException.
+        """
+        path = str(tmp_path / 'events.snapshot')
+        save_snapshot(EventStore.from_events(events), path)
+        with open(path, 'rb') as snapshot_file:
+            data = snapshot_file.read()
+
+        for corrupt in (b'', b'{"id": "1"}' * 100, data[:len(data) // 2]):
+            with open(path, 'wb') as snapshot_file:
+                snapshot_file.write(corrupt)
+            with pytest.raises(InvalidInputException):
+                load_snapshot(path)
+
+        empty_path = str(tmp_path / 'empty.snapshot')
+        save_snapshot(EventStore(), empty_path)
+        assert len(load_snapshot(empty_path)) == 0 and load_snapshot(empty_path).most_active_user() is None
+
+    def test_processes_share_a_snapshot(self, events, tmp_path):
+        """
+        Test that worker processes map the same snapshot file and compute the statistics of the events.
+        """
+        path = str(tmp_path / 'events.snapshot')
+        save_snapshot(EventStore.from_events(events), path)
+        analyzer = GitHubEventsAnalyzer()
+        expected = (analyzer.calculate_event_statistics(events), analyzer.identify_most_active_user(events))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(snapshot_statistics, [path, path])) == [expected, expected]
+
+    def test_cli_round_trip(self, events, tmp_path, capsys):
+        """
+        Test that fetched events saved to a snapshot display like a direct fetch, with filters and `latest`.
+        """
+        path = str(tmp_path / 'events.snapshot')
+        cli = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend([events[:100], events[100:200]]))
+        cli.save_events_snapshot(path, 'octo', 'repo', all_pages=True, max_pages=2)
+        assert capsys.readouterr().out.startswith(f'Saved 200 events to {path}')
+
+        for options in ({}, {'event_type': 'PushEvent', 'sort_order': 'reverse-chronological', 'latest': 5},
+                        {'latest': 3}):
+            cli.fetch_and_display_events('octo', 'repo', all_pages=True, max_pages=2, **options)
+            expected = capsys.readouterr().out
+            cli.snapshot_and_display_events(path, **options)
+            assert capsys.readouterr().out == expected
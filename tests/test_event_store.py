@@ -0,0 +1,61 @@
+"""
+Event Store Unit Tests
+
+This module contains unit tests for the EventStore class, with and without NumPy.
+
+Classes:
+- TestEventStore
+
+"""
+
+from controllers.event_store import EventStore
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+
+class TestEventStore:
+    """
+    Unit tests for the EventStore class.
+
+    Methods:
+        test_matches_list_analysis(): Test that columnar analysis matches the list based methods.
+        test_order_by_time(): Test that ordering matches a stable sort on created_at.
+        test_round_trip(): Test that stored events are rebuilt in the API schema.
+
+    """
+
+    def test_matches_list_analysis(self, use_numpy, events):
+        """
+        Test that columnar analysis matches the list based methods.
+        """
+        analyzer = GitHubEventsAnalyzer()
+        store = EventStore.from_events(events)
+
+        assert len(store) == len(events)
+        for event_type in ('PushEvent', 'WatchEvent', 'UnknownEvent'):
+            filtered = analyzer.filter_events(events, event_type)
+            filtered_store = analyzer.filter_events(store, event_type)
+            assert [event['id'] for event in filtered_store] == [event['id'] for event in filtered]
+            assert analyzer.identify_most_active_user(filtered_store) == analyzer.identify_most_active_user(filtered)
+        assert list(analyzer.calculate_event_statistics(store).items()) == \
+            list(analyzer.calculate_event_statistics(events).items())
+        assert analyzer.identify_most_active_user(store) == analyzer.identify_most_active_user(events)
+
+    def test_order_by_time(self, use_numpy, events):
+        """
+        Test that ordering matches a stable sort on created_at.
+        """
+        store = EventStore.from_events(events)
+        for reverse in (False, True):
+            expected = sorted(events, key=lambda event: event['created_at'], reverse=reverse)
+            assert [event['id'] for event in store.order_by_time(reverse)] == [event['id'] for event in expected]
+
+    def test_round_trip(self, use_numpy):
+        """
+        Test that stored events are rebuilt in the API schema.
+        """
+        event = {'id': '42', 'type': 'PushEvent', 'actor': {'login': 'user1'}, 'created_at': '2023-06-14T10:30:00Z',
+                 'repo': {'name': 'octo/repo'}, 'payload': {'size': 1}}
+
+        assert list(EventStore.from_events([event])) == [
+            {'id': '42', 'type': 'PushEvent', 'actor': {'login': 'user1'}, 'created_at': '2023-06-14T10:30:00Z',
+             'repo': {'name': 'octo/repo'}}]
@@ -0,0 +1,105 @@
+"""
+Event Timeline Unit Tests
+
+This module contains unit tests for the time-bucketed activity histograms, with and without NumPy.
+
+Classes:
+- TestEventTimeline
+
+"""
+
+from collections import Counter
+
+import pytest
+
+from controllers.event_archive import EventArchive
+from controllers.event_pipeline import project_stage
+from controllers.event_store import EventStore
+from controllers.github_event_analyzer import GitHubEventsAnalyzer, GitHubEventsAnalyzerCLI
+from tests.test_github_event_analyzer import PagedEventsBackend
+from utils.custom_exception import InvalidInputException
+from utils.timestamps import format_bucket, parse_bucket, parse_timestamp
+
+
+class TestEventTimeline:
+    """
+    Unit tests for `calculate_event_timeline` and the `EventTimeline` class.
+
+    Methods:
+        events(): Fixture providing projected synthetic events spanning several days.
+        test_matches_per_event_counts(): Test that every input kind matches counting event by event.
+        test_bucket_widths(): Test parsing and formatting of bucket widths and rejection of invalid ones.
+        test_cli_output(): Test the text and CSV timeline output of the CLI.
+
+    """
+
+    @pytest.fixture
+    def events(self, make_events):
+        """
+        Fixture providing projected synthetic events spanning several days, newest first.
+        """
+        return list(project_stage(make_events(6667, ("owner/repo",), step=3)))
+
+    @pytest.mark.parametrize("bucket, by", [("1h", "type"), ("15m", "actor"), ("1d", "type")])
+    def test_matches_per_event_counts(self, use_numpy, events, tmp_path, bucket, by):
+        """
+        Test that lists, event stores and archives all match counting event by event.
+        """
+        seconds = parse_bucket(bucket)
+        key = (lambda event: event['type']) if by == "type" else (lambda event: event['actor']['login'])
+        expected = Counter((parse_timestamp(event['created_at']) // seconds * seconds, key(event)) for event in events)
+        analyzer = GitHubEventsAnalyzer()
+
+        with EventArchive(str(tmp_path / "events.db")) as archive:
+            archive.upsert(events)
+            timelines = [analyzer.calculate_event_timeline(source, bucket, by)
+                         for source in (events, EventStore.from_events(events), archive.events("owner/repo"))]
+
+        for timeline in timelines:
+            assert {(start, timeline.keys[code]): count for start, code, count in timeline.rows} == expected
+            assert [start for start, _, _ in timeline.rows] == sorted(start for start, _, _ in timeline.rows)
+            assert list(timeline.buckets()) == sorted({start for start, _ in expected})
+            assert sum(timeline.totals().values()) == len(events)
+        assert timelines[0].keys == timelines[1].keys == timelines[2].keys == list(dict.fromkeys(map(key, events)))
+        assert timelines[0].rows == timelines[1].rows == timelines[2].rows
+        assert analyzer.calculate_event_timeline([], bucket, by).rows == []
+
+    def test_bucket_widths(self):
+        """
+        Test parsing and formatting of bucket widths and rejection of invalid ones.
+        """
+        assert [parse_bucket(bucket) for bucket in ("30s", "15m", "1h", "2d", 90)] == [30, 900, 3600, 172800, 90]
+        assert [format_bucket(seconds) for seconds in (30, 900, 3600, 172800, 90)] == ["30s", "15m", "1h", "2d", "90s"]
+
+        for bucket in ("1", "h", "1w", "-1h", "0m", 0):
+            with pytest.raises(InvalidInputException):
+                parse_bucket(bucket)
+        with pytest.raises(InvalidInputException):
+            GitHubEventsAnalyzer().calculate_event_timeline([], "1h", by="repo")
+
+    def test_cli_output(self, capsys):
+        """
+        Test the text and CSV timeline output of the CLI.
+        """
+        events = [{'id': str(index), 'type': event_type, 'actor': {'login': actor}, 'created_at': created_at}
+                  for index, (event_type, actor, created_at) in enumerate([
+                      ('PushEvent', 'user1', '2023-06-14T11:59:59Z'),
+                      ('IssuesEvent', 'user2', '2023-06-14T11:00:00Z'),
+                      ('PushEvent', 'user1', '2023-06-14T10:30:00Z'),
+                      ('PushEvent', 'user2', '2023-06-14T10:29:00Z')])]
+        analyzer = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend([events]))
+
+        analyzer.timeline_and_display_events('user1', 'repo1', bucket='1h')
+        assert capsys.readouterr().out.splitlines() == [
+            "Event Timeline (1h buckets by type):",
+            f"2023-06-14T10:00:00Z        2 {'#' * 40} PushEvent: 2",
+            f"2023-06-14T11:00:00Z        2 {'#' * 40} PushEvent: 1, IssuesEvent: 1",
+        ]
+
+        analyzer.timeline_and_display_events('user1', 'repo1', bucket='1d', by='actor', event_type='PushEvent',
+                                             output_format='csv')
+        assert capsys.readouterr().out.splitlines() == [
+            "bucket,actor,count",
+            "2023-06-14T00:00:00Z,user1,2",
+            "2023-06-14T00:00:00Z,user2,1",
+        ]
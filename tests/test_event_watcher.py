@@ -0,0 +1,148 @@
+"""
+Event Watcher Unit Tests
+
+This module contains unit tests for the watch mode and its bounded data structures.
+
+Classes:
+- LiveEventsBackend
+- TestEventWatcher
+
+"""
+
+import hashlib
+import json
+import random
+from urllib.parse import parse_qs, urlparse
+
+from controllers.base import response_cache
+from controllers.base.transport import HTTPBackend, HTTPResponse
+from controllers.event_aggregator import ActorCounts, BoundedActorCounts
+from controllers.event_watcher import EventWatcher, RecentIds
+from controllers.github_event_analyzer import GitHubEventsAnalyzer, GitHubEventsAnalyzerCLI
+
+
+class LiveEventsBackend(HTTPBackend):
+    """
+    An HTTP backend serving a growing, newest-first event stream with ETags and an `X-Poll-Interval`.
+    """
+
+    def __init__(self, poll_interval=5):
+        self.events = []
+        self.poll_interval = poll_interval
+        self.statuses = []
+        self.fail_next = False
+
+    def publish(self, count, event_type='PushEvent', actor='user1'):
+        """
+        Adds new events in front of the stream.
+        """
+        start = len(self.events)
+        self.events[:0] = [{'id': str(start + index), 'type': event_type, 'actor': {'login': actor},
+                            'created_at': f"2023-06-14T{(start + index) // 60 % 24:02}:{(start + index) % 60:02}:00Z"}
+                           for index in reversed(range(count))]
+
+    def request(self, method, url, headers=None, timeout=None):
+        query = parse_qs(urlparse(url).query)
+        page, per_page = int(query['page'][0]), int(query['per_page'][0])
+        if self.fail_next and page == 2:
+            self.fail_next = False
+            self.statuses.append(502)
+            return HTTPResponse(502, {}, b'{"message": "Bad Gateway"}', url)
+        body = json.dumps(self.events[(page - 1) * per_page:page * per_page]).encode()
+        last_page = max(1, -(-len(self.events) // per_page))
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        response_headers = {'ETag': etag, 'X-Poll-Interval': str(self.poll_interval),
+                            'Link': f'<http://stub/events?page={last_page}&per_page={per_page}>; rel="last"'}
+        status = 304 if (headers or {}).get('If-None-Match') == etag else 200
+        self.statuses.append(status)
+        return HTTPResponse(status, response_headers, body if status == 200 else b"", url)
+
+
+class TestEventWatcher:
+    """
+    Unit tests for the EventWatcher, RecentIds and BoundedActorCounts classes.
+
+    Methods:
+        test_recent_ids_are_bounded(): Test LRU eviction of seen ids.
+        test_bounded_actor_counts(): Test that Space-Saving counts stay bounded and find the most active actor.
+        test_polls_emit_only_new_events(): Test deltas, conditional polling, bursts and failed polls.
+        test_cli_watch(): Test the watch output of the CLI.
+
+    """
+
+    def test_recent_ids_are_bounded(self):
+        """
+        Test that the least recently seen id is evicted first and that seeing an id again refreshes it.
+        """
+        ids = RecentIds(capacity=3)
+        assert [ids.add(event_id) for event_id in ('1', '2', '3', '1', '4')] == [True, True, True, False, True]
+        assert len(ids) == 3
+        assert '2' not in ids and '1' in ids and '4' in ids
+
+    def test_bounded_actor_counts(self):
+        """
+        Test that Space-Saving counts are exact within capacity, stay bounded beyond it and keep the heavy hitter.
+        """
+        rng = random.Random(1)
+        logins = [f"user{rng.randrange(5000)}" for _ in range(20000)] + ["heavy"] * 2000
+        rng.shuffle(logins)
+        events = [{'actor': {'login': login}} for login in logins]
+        exact, small, large = ActorCounts(), BoundedActorCounts(capacity=50), BoundedActorCounts(capacity=10000)
+        for event in events:
+            exact.update(event)
+            small.update(event)
+            large.update(event)
+
+        assert large.counts == exact.counts and not large.errors
+        assert len(small.counts) == 50 and len(small._heap) <= 4 * small.capacity
+        assert max(small.counts, key=small.counts.get) == "heavy"
+        assert small.counts["heavy"] - small.errors.get("heavy", 0) <= 2000 <= small.counts["heavy"]
+
+    def test_polls_emit_only_new_events(self, monkeypatch):
+        """
+        Test that polls emit only unseen events oldest first, revalidate unchanged pages, follow bursts onto later
+        pages, re-emit nothing after a failed poll, and update statistics incrementally.
+        """
+        backend = LiveEventsBackend(poll_interval=5)
+        now = [1686700000.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        monkeypatch.setattr(response_cache.time, 'time', lambda: now[0])
+        analyzer = GitHubEventsAnalyzer(backend=backend, max_retries=0)
+        watcher = EventWatcher(analyzer, 'octo', 'repo', sleep=sleep, seen_capacity=500)
+        backend.publish(3)
+        polls = watcher.watch(max_polls=5)
+
+        assert [event['id'] for event in next(polls)] == ['0', '1', '2']
+        assert next(polls) == [] and backend.statuses[-1] == 304
+
+        backend.publish(150, 'IssuesEvent', 'user2')
+        assert [event['id'] for event in next(polls)] == [str(index) for index in range(3, 153)]
+
+        backend.publish(120)
+        backend.fail_next = True
+        assert next(polls) == []
+        assert [event['id'] for event in next(polls)] == [str(index) for index in range(153, 273)]
+
+        assert sleeps == [5, 5, 5, 5]
+        assert watcher.aggregator.event_statistics == {'PushEvent': 123, 'IssuesEvent': 150}
+        assert watcher.aggregator.most_active_user == 'user2'
+        assert len(watcher.seen_ids) <= 500
+
+    def test_cli_watch(self, capsys):
+        """
+        Test that the CLI prints only new events and the running statistics after each poll with new events.
+        """
+        backend = LiveEventsBackend()
+        backend.publish(2)
+        analyzer = GitHubEventsAnalyzerCLI(backend=backend)
+
+        analyzer.watch_and_display_events('octo', 'repo', output_format='jsonl', max_polls=1)
+        captured = capsys.readouterr()
+
+        assert [json.loads(line)['id'] for line in captured.out.splitlines()] == ['0', '1']
+        assert "PushEvent: 2" in captured.err and "Most Active User: user1" in captured.err
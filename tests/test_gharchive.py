@@ -0,0 +1,77 @@
+"""
+GH Archive Ingestion Unit Tests
+
+This module contains unit tests for the GH Archive reader and the GHArchiveIngestor class.
+
+Classes:
+- TestGHArchiveIngestor
+
+"""
+
+import gzip
+import json
+
+import pytest
+
+from benchmarks.stub_server import synthetic_event
+from controllers.gharchive import GHArchiveIngestor, iter_archive_events
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+
+
+class TestGHArchiveIngestor:
+    """
+    Unit tests for the GHArchiveIngestor class.
+
+    Methods:
+        archive_files(): Fixture writing small GH Archive files.
+        test_iter_archive_events_filters(): Test that repository and type filters are exact.
+        test_parallel_matches_sequential(): Test that merged worker results match a single pass over all events.
+
+    """
+
+    @pytest.fixture
+    def archive_files(self, tmp_path):
+        """
+        Fixture writing small GH Archive files.
+
+        Returns:
+            tuple: The file paths and every event written, in file order.
+        """
+        paths, events = [], []
+        for hour in range(3):
+            path = tmp_path / f'2023-06-14-{hour}.json.gz'
+            hour_events = [synthetic_event('octo/repo' if index % 2 else 'octo/other', hour * 1000 + index, actors=9)
+                           for index in range(200)]
+            with gzip.open(path, 'wt') as archive_file:
+                archive_file.writelines(json.dumps(event) + '\n' for event in hour_events)
+            paths.append(str(path))
+            events.extend(hour_events)
+        return paths, events
+
+    def test_iter_archive_events_filters(self, archive_files):
+        """
+        Test that repository and type filters are exact.
+        """
+        paths, events = archive_files
+        counter = {}
+
+        matched = list(iter_archive_events(paths[0], 'octo/repo', 'PushEvent', counter))
+
+        assert matched == [event for event in events[:200]
+                           if event['repo']['name'] == 'octo/repo' and event['type'] == 'PushEvent']
+        assert counter['scanned'] == 200
+
+    def test_parallel_matches_sequential(self, archive_files):
+        """
+        Test that merged worker results match a single pass over all events.
+        """
+        paths, events = archive_files
+        analyzer = GitHubEventsAnalyzer()
+        expected = [event for event in events if event['repo']['name'] == 'octo/repo']
+
+        for workers in (1, 2):
+            result = GHArchiveIngestor(workers=workers).ingest(paths, repo='octo/repo')
+            assert result.scanned == len(events)
+            assert result.matched == len(expected)
+            assert result.aggregator.event_statistics == analyzer.calculate_event_statistics(expected)
+            assert result.aggregator.most_active_user == analyzer.identify_most_active_user(expected)
@@ -8,12 +8,39 @@ Classes:
 
 """
 
+import json
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 from unittest.mock import patch
 
+from controllers.base.transport import HTTPBackend, HTTPResponse
 from controllers.github_event_analyzer import GitHubEventsAnalyzer
 
 
+class PagedEventsBackend(HTTPBackend):
+    """
+    An HTTP backend serving fixed event pages keyed by page number.
+    """
+
+    def __init__(self, pages):
+        """
+        Args:
+            pages (list): The pages of events, the first one being page 1.
+        """
+        self.pages = pages
+        self.requested_urls = []
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Serves the requested page with a `Link` header pointing at the last page.
+        """
+        self.requested_urls.append(url)
+        page = int(parse_qs(urlparse(url).query)['page'][0])
+        link = f'<http://stub/events?page={len(self.pages)}&per_page=100>; rel="last"'
+        return HTTPResponse(200, {'Link': link}, json.dumps(self.pages[page - 1]).encode(), url)
+
+
 class TestEventAnalyzerController:
     """
     Unit tests for the EventAnalyzer controller class.
@@ -21,6 +48,7 @@ class TestEventAnalyzerController:
     Methods:
         event_controller(): Fixture to create an instance of GitHubEventsAnalyzer for testing.
         test_fetch_events_success(): Test the fetch_events method for successful API response.
+        test_fetch_all_events(): Test the fetch_all_events method across paginated responses.
         test_display_events(): Test the display_events method.
         test_filter_events(): Test the filter_events method.
         test_calculate_event_statistics(): Test the calculate_event_statistics method.
@@ -39,19 +67,20 @@ class TestEventAnalyzerController:
         """
         return GitHubEventsAnalyzer()
 
-    @patch('requests.get')
-    def test_fetch_events_success(self, mock_get, event_controller):
+    @patch('requests.Session.request')
+    def test_fetch_events_success(self, mock_request, event_controller):
         """
         Test the fetch_events method for successful API response.
 
         Args:
-            mock_get: Mock object for the requests.get function.
+            mock_request: Mock object for the requests.Session.request method.
             event_controller: Instance of GitHubEventsAnalyzer.
 
         """
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = [
-            {'type': 'PushEvent', 'actor': {'login': 'user1'}, 'created_at': '2023-06-14T10:30:00Z'}]
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.headers = {}
+        mock_request.return_value.content = json.dumps([
+            {'type': 'PushEvent', 'actor': {'login': 'user1'}, 'created_at': '2023-06-14T10:30:00Z'}]).encode()
 
         events = event_controller.fetch_events('user1', 'repo1')
 
@@ -60,6 +89,22 @@ class TestEventAnalyzerController:
         assert events[0]['actor']['login'] == 'user1'
         assert events[0]['created_at'] == '2023-06-14T10:30:00Z'
 
+    def test_fetch_all_events(self):
+        """
+        Test the fetch_all_events method across paginated responses.
+
+        Events shifting between pages must be deduplicated and the API order kept.
+
+        """
+        backend = PagedEventsBackend([[{'id': '5'}, {'id': '4'}], [{'id': '4'}, {'id': '3'}], [{'id': '2'}]])
+        event_controller = GitHubEventsAnalyzer(backend=backend)
+
+        events = event_controller.fetch_all_events('user1', 'repo1', max_pages=10, concurrency=2)
+
+        assert [event['id'] for event in events] == ['5', '4', '3', '2']
+        assert len(backend.requested_urls) == 3
+        assert all('per_page=100' in url for url in backend.requested_urls)
+
     def test_display_events(self, event_controller, capsys):
         """
         Test the display_events method.
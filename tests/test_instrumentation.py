@@ -0,0 +1,75 @@
+"""
+Instrumentation Unit Tests
+
+This module contains unit tests for the request and pipeline hooks and the Instrumentation class.
+
+Classes:
+- TestInstrumentation
+
+"""
+
+import json
+
+from controllers.github_event_analyzer import GitHubEventsAnalyzerCLI
+from controllers.instrumentation import Hook, Instrumentation
+from tests.test_github_event_analyzer import PagedEventsBackend
+
+
+class TestInstrumentation:
+    """
+    Unit tests for the Instrumentation class.
+
+    Methods:
+        test_profiles_fetch_and_display_events(): Test the counters and phases of an instrumented CLI run.
+        test_exports(): Test the JSON and Prometheus exports.
+
+    """
+
+    pages = [[{'id': str(index), 'type': 'PushEvent' if index % 2 else 'IssuesEvent', 'actor': {'login': 'user1'},
+               'created_at': f'2023-06-14T10:{59 - index:02d}:00Z'} for index in range(page * 4, page * 4 + 4)]
+             for page in range(2)]
+
+    def run(self, hooks, capsys):
+        cli = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend(self.pages), hooks=hooks)
+        cli.fetch_and_display_events('octo', 'repo', 'PushEvent', all_pages=True, max_pages=2, concurrency=1)
+        return capsys.readouterr().out
+
+    def test_profiles_fetch_and_display_events(self, capsys):
+        """
+        Test the counters and phases of an instrumented CLI run, and that hooks do not change the output.
+
+        Args:
+            capsys: Fixture to capture stdout.
+        """
+        instrumentation = Instrumentation()
+
+        with instrumentation:
+            output = self.run([instrumentation], capsys)
+
+        assert output == self.run([Hook()], capsys) == self.run(None, capsys)
+        assert list(instrumentation.phases) == ['network', 'decode', 'fetch', 'filter', 'order', 'merge', 'aggregate',
+                                                'write']
+        assert instrumentation.stage_events == {'fetch': 8, 'filter': 4, 'order': 4, 'merge': 4, 'aggregate': 4}
+        assert instrumentation.counters['requests'] == 2
+        assert instrumentation.counters['bytes_downloaded'] > 0
+        assert instrumentation.peak_memory > 0
+        assert sum(instrumentation.phases.values()) <= instrumentation.wall_time
+
+    def test_exports(self, capsys):
+        """
+        Test the JSON and Prometheus exports.
+
+        Args:
+            capsys: Fixture to capture stdout.
+        """
+        instrumentation = Instrumentation(trace_memory=False)
+        with instrumentation:
+            self.run([instrumentation], capsys)
+
+        exported = json.loads(instrumentation.to_json())
+        prometheus = instrumentation.to_prometheus().splitlines()
+
+        assert exported['stage_events']['filter'] == 4 and exported['peak_memory'] is None
+        assert 'github_events_requests_total 2' in prometheus
+        assert 'github_events_stage_events_total{stage="fetch"} 8' in prometheus
+        assert "Profile:" in instrumentation.summary()
@@ -0,0 +1,84 @@
+"""
+Output Writers Unit Tests
+
+This module contains unit tests for the streaming event writers.
+
+Classes:
+- TestOutputWriters
+
+"""
+
+import csv
+import io
+import json
+
+from controllers.github_event_analyzer import GitHubEventsAnalyzerCLI
+from controllers.output_writers import CSVEventWriter, JSONLEventWriter, TextEventWriter
+from tests.test_github_event_analyzer import PagedEventsBackend
+
+
+class TestOutputWriters:
+    """
+    Unit tests for the event writers.
+
+    Methods:
+        test_batches_cover_every_event(): Test that events spanning several batches are all written in order.
+        test_csv_writer(): Test the CSV header and rows, and the header of an empty result.
+        test_cli_jsonl_output(): Test the CLI writing JSONL to a file with the summary on standard output.
+
+    """
+
+    events = [{'id': str(index), 'type': 'PushEvent', 'actor': {'login': f'user{index % 2}'},
+               'created_at': f'2023-06-14T10:{index:02d}:00Z', 'repo': {'name': 'octo/repo'}} for index in range(5)]
+
+    def test_batches_cover_every_event(self):
+        """
+        Test that events spanning several batches are all written in order.
+        """
+        stream = io.StringIO()
+
+        written = JSONLEventWriter(stream, batch_size=2).write_events(iter(self.events))
+
+        assert written == 5
+        assert [json.loads(line) for line in stream.getvalue().splitlines()] == self.events
+
+        stream = io.StringIO()
+        TextEventWriter(stream, batch_size=2).write_events(self.events[:1])
+        assert stream.getvalue() == ('Event: PushEvent\nUser: user0\nTimestamp: 2023-06-14T10:00:00Z\n'
+                                     '-------------------------------------------\n')
+
+    def test_csv_writer(self):
+        """
+        Test the CSV header and rows, and that an empty result still gets its header.
+        """
+        stream = io.StringIO()
+
+        CSVEventWriter(stream, batch_size=3).write_events(self.events)
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        assert rows[0] == ['id', 'type', 'actor', 'created_at', 'repo']
+        assert rows[1:] == [[event['id'], 'PushEvent', event['actor']['login'], event['created_at'], 'octo/repo']
+                            for event in self.events]
+
+        for events in ([], None):
+            stream = io.StringIO()
+            with CSVEventWriter(stream) as writer:
+                if events is not None:
+                    writer.write_events(events)
+            assert stream.getvalue() == 'id,type,actor,created_at,repo\n'
+
+    def test_cli_jsonl_output(self, tmp_path, capsys):
+        """
+        Test the CLI writing JSONL to a file with the summary on standard output.
+
+        Args:
+            tmp_path: Fixture providing a temporary directory.
+            capsys: Fixture to capture stdout.
+        """
+        output = tmp_path / 'events.jsonl'
+        cli = GitHubEventsAnalyzerCLI(backend=PagedEventsBackend([self.events[::-1]]))
+
+        cli.fetch_and_display_events('octo', 'repo', output_format='jsonl', output=str(output))
+
+        assert [json.loads(line)['id'] for line in output.read_text().splitlines()] == ['0', '1', '2', '3', '4']
+        assert capsys.readouterr().out == 'Event Statistics:\nPushEvent: 5\nMost Active User: user0\n'
@@ -0,0 +1,165 @@
+"""
+Query Service Unit Tests
+
+This module contains unit tests for the local HTTP/JSON query service and its caches.
+
+Classes:
+- SlowEventsBackend
+- TestQueryService
+
+"""
+
+import json
+import threading
+import time
+from urllib.request import urlopen
+from urllib.error import HTTPError
+
+import pytest
+
+from controllers.base.transport import HTTPBackend, HTTPResponse
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from controllers.query_service import EventQueryService, QueryServer, RequestCoalescer, TTLCache
+from utils.custom_exception import InvalidInputException
+
+EVENTS = [{'id': str(index), 'type': event_type, 'actor': {'login': actor}, 'created_at': created_at}
+          for index, (event_type, actor, created_at) in enumerate([
+              ('PushEvent', 'user1', '2023-06-14T12:00:00Z'),
+              ('IssuesEvent', 'user2', '2023-06-14T11:00:00Z'),
+              ('PushEvent', 'user1', '2023-06-14T10:00:00Z')])]
+
+
+class SlowEventsBackend(HTTPBackend):
+    """
+    An HTTP backend serving one page of events after a delay and counting its requests.
+    """
+
+    def __init__(self, events, delay=0.0, status=200):
+        self.events = events
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, timeout=None):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.delay)
+        if self.status != 200:
+            return HTTPResponse(self.status, {}, b'{"message": "Not Found"}', url)
+        return HTTPResponse(200, {}, json.dumps(self.events).encode(), url)
+
+
+class TestQueryService:
+    """
+    Unit tests for the TTLCache, RequestCoalescer, EventQueryService and QueryServer classes.
+
+    Methods:
+        test_ttl_cache(): Test expiry and least recently used eviction.
+        test_concurrent_queries_are_coalesced(): Test that concurrent queries for a repository fetch it once.
+        test_service_answers_and_caches(): Test the answers of every operation and that they are reused.
+        test_http_endpoints(): Test the JSON endpoints and their error statuses.
+
+    """
+
+    def test_ttl_cache(self):
+        """
+        Test that entries expire after their time to live and that the least recently used entry is evicted first.
+        """
+        now = [0.0]
+        cache = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+
+        now[0] = 10
+        assert cache.get('a', 'expired') == 'expired' and len(cache) == 1
+        assert (cache.hits, cache.misses) == (3, 2)
+
+    def test_concurrent_queries_are_coalesced(self):
+        """
+        Test that concurrent queries for the same repository cause a single upstream fetch, and that a failure is
+        shared by every waiting caller without being cached.
+        """
+        backend = SlowEventsBackend(EVENTS, delay=0.2)
+        service = EventQueryService(GitHubEventsAnalyzer(backend=backend))
+        results, errors = [], []
+
+        def query(operation):
+            try:
+                results.append(service.query(operation, 'octo', 'repo', {}))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=query, args=(operation,))
+                   for operation in ('events', 'statistics', 'most-active-user') * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors and len(results) == 12
+        assert backend.requests == 1 and service.upstream_fetches == 1
+        assert service.status()['coalesced'] >= 1
+
+        coalescer = RequestCoalescer()
+        with pytest.raises(ValueError):
+            coalescer.call('key', lambda: int('x'))
+        assert coalescer.call('key', lambda: 1) == 1
+
+    def test_service_answers_and_caches(self):
+        """
+        Test the answers of every operation and that repeated queries are answered from the cache.
+        """
+        backend = SlowEventsBackend(EVENTS)
+        now = [0.0]
+        service = EventQueryService(GitHubEventsAnalyzer(backend=backend), ttl=30, clock=lambda: now[0])
+
+        events = service.query('events', 'octo', 'repo', {'sort': 'reverse-chronological', 'latest': '2'})
+        assert [event['id'] for event in events['events']] == ['0', '1'] and events['count'] == 2
+        assert service.query('statistics', 'octo', 'repo', {'type': 'PushEvent'})['event_statistics'] == {
+            'PushEvent': 2}
+        assert service.query('most-active-user', 'octo', 'repo', {})['most_active_user'] == 'user1'
+        assert service.query('timeline', 'octo', 'repo', {'bucket': '1d'})['rows'] == [
+            {'bucket': '2023-06-14T00:00:00Z', 'type': 'PushEvent', 'count': 2},
+            {'bucket': '2023-06-14T00:00:00Z', 'type': 'IssuesEvent', 'count': 1}]
+        service.query('statistics', 'octo', 'repo', {'type': 'PushEvent'})
+        assert backend.requests == 1
+
+        now[0] = 30
+        service.query('statistics', 'octo', 'repo', {'type': 'PushEvent'})
+        assert backend.requests == 2
+
+        for operation, params in (('repos', {}), ('events', {'sort': 'random'}), ('events', {'page': 'x'}),
+                                  ('timeline', {'bucket': '1w'})):
+            with pytest.raises(InvalidInputException):
+                service.query(operation, 'octo', 'repo', params)
+
+    def test_http_endpoints(self):
+        """
+        Test the JSON endpoints, the status counters, and the 400, 404 and 502 error statuses.
+        """
+        backend = SlowEventsBackend(EVENTS)
+        service = EventQueryService(GitHubEventsAnalyzer(backend=backend, max_retries=0))
+
+        with QueryServer(service, port=0) as server:
+            def get(path):
+                try:
+                    with urlopen(server.base_url + path) as response:
+                        return response.status, json.loads(response.read())
+                except HTTPError as error:
+                    return error.code, json.loads(error.read())
+
+            assert get('/repos/octo/repo/statistics') == (200, {'repository': 'octo/repo', 'event_statistics': {
+                'PushEvent': 2, 'IssuesEvent': 1}})
+            status, body = get('/repos/octo/repo/events?type=IssuesEvent')
+            assert status == 200 and [event['id'] for event in body['events']] == ['1']
+            assert get('/status')[1]['upstream_fetches'] == 1
+            assert get('/repos/octo/repo/events?sort=random')[0] == 400
+            assert get('/repos/octo')[0] == 404
+
+            backend.status = 404
+            status, body = get('/repos/octo/missing/events')
+            assert status == 502 and body['upstream_status'] == 404
@@ -0,0 +1,141 @@
+"""
+Rate Limit Scheduler Unit Tests
+
+This module contains unit tests for the RateLimitScheduler class, against a local stub server emitting rate limit
+headers and against canned responses.
+
+Classes:
+- FakeClock
+- TestRateLimitScheduler
+
+"""
+
+import pytest
+
+from benchmarks.stub_server import StubGitHubServer
+from controllers.base.github_api import GitHubAPI
+from controllers.base.rate_limiter import RateLimitScheduler, TokenBucket
+from controllers.base.transport import HTTPResponse, Transport
+from controllers.github_event_analyzer import GitHubEventsAnalyzer
+from tests.test_transport import StubBackend
+from utils.custom_exception import RateLimitException
+
+
+class FakeClock:
+    """
+    A clock that only advances when slept on.
+    """
+
+    def __init__(self, now=1700000000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimitScheduler:
+    """
+    Unit tests for the RateLimitScheduler class.
+
+    Methods:
+        test_rotates_tokens_within_limits(): Test that tokens are rotated and never used past their limit.
+        test_waits_for_reset_instead_of_failing(): Test that exhausted tokens are waited for, reported, then used again.
+        test_max_wait_fails_long_waits(): Test that a reset further away than max_wait raises RateLimitException.
+        test_retries_secondary_rate_limit(): Test that a 403 with Retry-After is sent again after the delay.
+        test_token_bucket_paces_requests(): Test that the bucket allows a burst and then a steady rate.
+        test_from_environment(): Test reading tokens from the environment.
+
+    """
+
+    def test_rotates_tokens_within_limits(self):
+        """
+        Test that tokens are rotated and never used past their limit, against the stub server.
+        """
+        with StubGitHubServer(events_per_repo=10, rate_limit=2) as server:
+            scheduler = RateLimitScheduler(["token-a", "token-b"], max_wait=0)
+            analyzer = GitHubEventsAnalyzer(base_url=server.base_url, rate_limiter=scheduler)
+
+            for _ in range(4):
+                assert len(analyzer.fetch_events('octo', 'repo')) == 10
+            with pytest.raises(RateLimitException):
+                analyzer.fetch_events('octo', 'repo')
+            analyzer.close()
+
+        assert server.request_count == 4
+        assert server.rate_limited_count == 0
+        assert [budget.remaining for budget in scheduler.budgets] == [0, 0]
+
+    def test_waits_for_reset_instead_of_failing(self):
+        """
+        Test that exhausted tokens are waited for until their reset, then used again.
+        """
+        clock = FakeClock()
+        reset = clock.now + 30
+        exhausted = {'X-RateLimit-Limit': '1', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}
+        backend = StubBackend([HTTPResponse(200, exhausted, b'[]'), HTTPResponse(200, {}, b'[{"id": "1"}]')])
+        waits = []
+        scheduler = RateLimitScheduler(rate=0, on_wait=lambda *wait: waits.append(wait), clock=clock,
+                                       sleep=clock.sleep)
+        api = GitHubAPI(transport=Transport(backend=backend), rate_limiter=scheduler)
+
+        assert api.fetch('events') == []
+        assert api.fetch('events') == [{'id': '1'}]
+        assert clock.sleeps == [30]
+        assert waits == [(30, reset)]
+
+    def test_max_wait_fails_long_waits(self):
+        """
+        Test that a reset further away than max_wait raises RateLimitException without sleeping, as the CLI does
+        once an unauthenticated run used up its hourly requests.
+        """
+        clock = FakeClock()
+        reset = clock.now + 3600
+        exhausted = {'X-RateLimit-Limit': '60', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}
+        backend = StubBackend([HTTPResponse(200, exhausted, b'[]')])
+        scheduler = RateLimitScheduler(rate=0, max_wait=60, clock=clock, sleep=clock.sleep)
+        api = GitHubAPI(transport=Transport(backend=backend), rate_limiter=scheduler)
+
+        assert api.fetch('events') == []
+        with pytest.raises(RateLimitException) as error:
+            api.fetch('events')
+        assert error.value.retry_at == reset and clock.sleeps == []
+
+    def test_retries_secondary_rate_limit(self):
+        """
+        Test that a 403 with Retry-After is sent again after the delay, with the same token.
+        """
+        clock = FakeClock()
+        backend = StubBackend([HTTPResponse(403, {'Retry-After': '5'}, b'{"message": "secondary rate limit"}'),
+                               HTTPResponse(200, {}, b'[{"id": "1"}]')])
+        scheduler = RateLimitScheduler(["token-a"], rate=0, clock=clock, sleep=clock.sleep)
+        api = GitHubAPI(transport=Transport(backend=backend), rate_limiter=scheduler)
+
+        assert api.fetch('events') == [{'id': '1'}]
+        assert clock.sleeps == [5]
+        assert all(headers['Authorization'] == 'Bearer token-a' for _, _, headers, _ in backend.requests)
+
+    def test_token_bucket_paces_requests(self):
+        """
+        Test that the bucket allows a burst and then a steady rate.
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        delays = [bucket.acquire() for _ in range(5)]
+
+        assert delays == [0, 0, 0, 0.5, 0.5]
+
+    def test_from_environment(self):
+        """
+        Test reading tokens from the environment.
+        """
+        scheduler = RateLimitScheduler.from_environment({'GITHUB_TOKENS': 'a, b', 'GITHUB_TOKEN': 'c'})
+        assert [budget.token for budget in scheduler.budgets] == ['a', 'b']
+
+        scheduler = RateLimitScheduler.from_environment({})
+        assert [(budget.token, budget.headers, budget.limit) for budget in scheduler.budgets] == [(None, {}, 60)]
@@ -0,0 +1,90 @@
+"""
+Repository Batch Analysis Unit Tests
+
+This module contains unit tests for analyzing many repositories in one process.
+
+Classes:
+- TestRepositoryBatch
+
+"""
+
+import json
+from urllib.parse import urlparse
+
+import pytest
+
+from controllers.base.transport import HTTPBackend, HTTPResponse
+from controllers.github_event_analyzer import GitHubEventsAnalyzerCLI
+from utils.custom_exception import GitHubAPIException, InvalidInputException
+
+
+class RepositoriesBackend(HTTPBackend):
+    """
+    An HTTP backend serving one page of events per repository, and 404 for unknown repositories.
+    """
+
+    def __init__(self, events_by_repository):
+        """
+        Args:
+            events_by_repository (dict): The events keyed by "owner/name".
+        """
+        self.events_by_repository = events_by_repository
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Serves the events of the repository named in the URL path.
+        """
+        repository = urlparse(url).path.split('/repos/', 1)[1].rsplit('/events', 1)[0]
+        if repository not in self.events_by_repository:
+            return HTTPResponse(404, {}, b'{"message": "Not Found"}', url)
+        return HTTPResponse(200, {}, json.dumps(self.events_by_repository[repository]).encode(), url)
+
+
+class TestRepositoryBatch:
+    """
+    Unit tests for multi-repository batch analysis.
+
+    Methods:
+        test_parse_repositories(): Test parsing of a repositories file.
+        test_failing_repository_does_not_abort_batch(): Test per-repository and combined results with a failure.
+
+    """
+
+    def test_parse_repositories(self):
+        """
+        Test parsing of a repositories file.
+        """
+        lines = ["# team repositories\n", "octo/one\n", "\n", "octo/two  # flaky\n"]
+
+        assert GitHubEventsAnalyzerCLI.parse_repositories(lines) == [('octo', 'one'), ('octo', 'two')]
+        with pytest.raises(InvalidInputException):
+            GitHubEventsAnalyzerCLI.parse_repositories(["octo"])
+
+    def test_failing_repository_does_not_abort_batch(self, capsys):
+        """
+        Test per-repository and combined results when one repository fails.
+
+        Args:
+            capsys: Fixture to capture stdout.
+        """
+        backend = RepositoriesBackend({
+            'octo/one': [{'id': '2', 'type': 'PushEvent', 'actor': {'login': 'user1'}},
+                         {'id': '1', 'type': 'IssuesEvent', 'actor': {'login': 'user2'}}],
+            'octo/two': [{'id': '4', 'type': 'PushEvent', 'actor': {'login': 'user2'}},
+                         {'id': '3', 'type': 'PushEvent', 'actor': {'login': 'user2'}}],
+        })
+        cli = GitHubEventsAnalyzerCLI(backend=backend, max_retries=0)
+        repositories = [('octo', 'one'), ('octo', 'missing'), ('octo', 'two')]
+
+        results = cli.analyze_repositories(repositories, concurrency=3)
+
+        assert list(results) == ['octo/one', 'octo/missing', 'octo/two']
+        assert isinstance(results['octo/missing'], GitHubAPIException)
+        assert results['octo/two'].event_statistics == {'PushEvent': 2}
+
+        cli.analyze_and_display_repositories(repositories, concurrency=3)
+
+        output = capsys.readouterr().out
+        assert output.endswith("Combined (2 of 3 repositories, 1 failed)\n"
+                               "Event Statistics:\nPushEvent: 3\nIssuesEvent: 1\nMost Active User: user2\n")
+        assert "Repository: octo/missing\nFailed:" in output
@@ -0,0 +1,79 @@
+"""
+GitHub API Response Cache Unit Tests
+
+This module contains unit tests for the ResponseCache class and its use by GitHubAPI.
+
+Classes:
+- TestResponseCache
+
+"""
+
+from controllers.base.github_api import GitHubAPI
+from controllers.base.response_cache import ResponseCache
+from controllers.base.transport import HTTPResponse, Transport
+from tests.test_transport import StubBackend
+
+
+class TestResponseCache:
+    """
+    Unit tests for the ResponseCache class.
+
+    Methods:
+        test_not_modified_is_served_from_cache(): Test that a 304 response returns the cached body.
+        test_poll_interval_skips_request(): Test that no request is sent before X-Poll-Interval elapses.
+        test_disk_persistence(): Test that entries survive in a new cache instance sharing the directory.
+        test_lru_eviction(): Test that the least recently used entry is evicted first.
+
+    """
+
+    def test_not_modified_is_served_from_cache(self):
+        """
+        Test that a 304 response returns the cached body.
+        """
+        backend = StubBackend([HTTPResponse(200, {'ETag': '"abc"'}, b'[{"id": "1"}]'),
+                               HTTPResponse(304, {}, b'')])
+        api = GitHubAPI(transport=Transport(backend=backend), cache=ResponseCache())
+
+        assert api.fetch('events') == [{'id': '1'}]
+        assert api.fetch('events') == [{'id': '1'}]
+        assert backend.requests[1][2]['If-None-Match'] == '"abc"'
+
+    def test_poll_interval_skips_request(self):
+        """
+        Test that no request is sent before X-Poll-Interval elapses.
+        """
+        backend = StubBackend([HTTPResponse(200, {'ETag': '"abc"', 'X-Poll-Interval': '60'}, b'[]')])
+        api = GitHubAPI(transport=Transport(backend=backend), cache=ResponseCache())
+
+        api.fetch('events')
+        api.fetch('events')
+
+        assert len(backend.requests) == 1
+
+    def test_disk_persistence(self, tmp_path):
+        """
+        Test that entries survive in a new cache instance sharing the directory.
+
+        Args:
+            tmp_path: Fixture providing a temporary directory.
+        """
+        ResponseCache(cache_dir=str(tmp_path)).store('http://stub/events', [{'id': '1'}], {'ETag': '"abc"'})
+
+        entry = ResponseCache(cache_dir=str(tmp_path)).get('http://stub/events')
+
+        assert entry.body == [{'id': '1'}]
+        assert entry.conditional_headers() == {'If-None-Match': '"abc"'}
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted first.
+        """
+        cache = ResponseCache(max_entries=2)
+        cache.store('a', [], {})
+        cache.store('b', [], {})
+        cache.get('a')
+        cache.store('c', [], {})
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
@@ -0,0 +1,128 @@
+"""
+GitHub API Transport Unit Tests
+
+This module contains unit tests for the Transport class and its pluggable backends.
+
+Classes:
+- StubBackend
+- TestTransport
+
+"""
+
+import socket
+
+import pytest
+
+from benchmarks.stub_server import StubGitHubServer
+from controllers.base.github_api import GitHubAPI
+from controllers.base.transport import HTTPBackend, HTTPClientBackend, HTTPResponse, Transport
+from utils.custom_exception import GitHubAPIException
+
+
+class StubBackend(HTTPBackend):
+    """
+    An HTTP backend that replays a fixed sequence of responses or exceptions.
+    """
+
+    def __init__(self, outcomes):
+        """
+        Args:
+            outcomes (list): The responses to return or exceptions to raise, in order.
+        """
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def request(self, method, url, headers=None, timeout=None):
+        """
+        Records the request and replays the next outcome.
+        """
+        self.requests.append((method, url, headers, timeout))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestTransport:
+    """
+    Unit tests for the Transport class.
+
+    Methods:
+        test_retries_server_errors(): Test that 5xx responses are retried until a success.
+        test_retries_connection_errors(): Test that connection errors are retried until a success.
+        test_gives_up_after_max_retries(): Test that the last error response is surfaced after all retries.
+        test_sends_default_headers(): Test that keep-alive and compression headers are sent with the timeout.
+        test_http_client_backend(): Test the standard library backend against the stub server.
+
+    """
+
+    def test_retries_server_errors(self):
+        """
+        Test that 5xx responses are retried until a success.
+        """
+        backend = StubBackend([HTTPResponse(502, {}, b'bad gateway'), HTTPResponse(200, {}, b'[{"id": "1"}]')])
+        api = GitHubAPI(transport=Transport(backend=backend, backoff_factor=0))
+
+        assert api.fetch('events') == [{'id': '1'}]
+        assert len(backend.requests) == 2
+
+    def test_retries_connection_errors(self):
+        """
+        Test that connection errors are retried until a success.
+        """
+        backend = StubBackend([ConnectionError('reset'), HTTPResponse(200, {}, b'[]')])
+        transport = Transport(backend=backend, backoff_factor=0)
+
+        assert transport.request('GET', 'http://stub/events').status_code == 200
+
+    def test_gives_up_after_max_retries(self):
+        """
+        Test that the last error response is surfaced after all retries.
+        """
+        backend = StubBackend([HTTPResponse(503, {}, b'unavailable')] * 3)
+        api = GitHubAPI(transport=Transport(backend=backend, max_retries=2, backoff_factor=0))
+
+        with pytest.raises(GitHubAPIException) as exc_info:
+            api.fetch('events')
+
+        assert exc_info.value.status_code == 503
+        assert len(backend.requests) == 3
+
+    def test_sends_default_headers(self):
+        """
+        Test that keep-alive and compression headers are sent with the timeout.
+        """
+        backend = StubBackend([HTTPResponse(200, {}, b'[]')])
+        Transport(backend=backend, timeout=2.5).request('GET', 'http://stub/events')
+
+        _, _, headers, timeout = backend.requests[0]
+        assert headers['Accept-Encoding'] == 'gzip, deflate'
+        assert headers['Connection'] == 'keep-alive'
+        assert timeout == 2.5
+
+    def test_http_client_backend(self):
+        """
+        Test that the standard library backend, created lazily by name, decompresses gzip pages, reuses its
+        keep-alive connection, exposes case-insensitive headers, and reports connection failures for retrying.
+        """
+        with StubGitHubServer(events_per_repo=150, compress=True) as server:
+            api = GitHubAPI(base_url=server.base_url, backend='http.client')
+            assert api.transport._backend is None
+            pages = [api.fetch_with_headers(f'repos/octo/repo/events?page={page}&per_page=100') for page in (1, 2)]
+            reference = GitHubAPI(base_url=server.base_url, backend=HTTPClientBackend())
+            expected = reference.fetch('repos/octo/repo/events?page=1&per_page=100')
+            idle = list(api.transport.backend._idle.values())
+            api.close()
+            reference.close()
+
+        assert isinstance(api.transport.backend, HTTPClientBackend)
+        assert pages[0][0] == expected and len(pages[0][0]) == 100 and len(pages[1][0]) == 50
+        assert pages[0][1].get('etag') and 'rel="last"' in pages[0][1]['LINK']
+        assert len(idle) == 1 and len(idle[0]) == 1
+
+        with socket.socket() as unused:
+            unused.bind(('127.0.0.1', 0))
+            port = unused.getsockname()[1]
+        transport = Transport(backend=HTTPClientBackend(), max_retries=1, backoff_factor=0, timeout=1)
+        with pytest.raises(GitHubAPIException):
+            transport.request('GET', f'http://127.0.0.1:{port}/events')
@@ -9,3 +9,31 @@ class InvalidInputException(Exception):
     def __init__(self, message="Both Repo Owner and Repo Name are required!"):
         self.message = message
         super().__init__(self.message)
+
+
+class GitHubAPIException(Exception):
+    """Exception raised when a request to the GitHub API fails.
+
+    Attributes:
+        message -- explanation of the error
+        status_code -- HTTP status code of the failed response, if any
+    """
+
+    def __init__(self, message="Failed to fetch data from the GitHub API!", status_code=None):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+
+class RateLimitException(GitHubAPIException):
+    """Exception raised when every token stays rate limited for longer than the caller is willing to wait.
+
+    Attributes:
+        message -- explanation of the error
+        status_code -- HTTP status code of the rate limited response, if any
+        retry_at -- epoch time at which a token becomes usable again
+    """
+
+    def __init__(self, message="Every token is rate limited!", status_code=None, retry_at=None):
+        self.retry_at = retry_at
+        super().__init__(message, status_code)
@@ -0,0 +1,90 @@
+"""
+timestamps.py
+
+Helpers converting GitHub `created_at` timestamps ("2023-06-14T10:30:00Z") to and from integer epoch seconds, and
+timeline bucket widths ("15m", "1h") to and from seconds.
+
+"""
+
+import calendar
+import time
+from functools import lru_cache
+
+from utils.custom_exception import InvalidInputException
+
+BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_timestamp(created_at):
+    """
+    Converts an ISO 8601 UTC timestamp as returned by the GitHub API to epoch seconds.
+
+    Args:
+        created_at (str): The timestamp, e.g. "2023-06-14T10:30:00Z".
+
+    Returns:
+        int: The number of seconds since the Unix epoch.
+    """
+    return (_day_start(created_at[:10]) + int(created_at[11:13]) * 3600 + int(created_at[14:16]) * 60
+            + int(created_at[17:19]))
+
+
+@lru_cache(maxsize=4096)
+def _day_start(date):
+    """
+    Returns the epoch seconds of midnight UTC on a "YYYY-MM-DD" date. Cached, as events cluster on few days.
+    """
+    return calendar.timegm((int(date[0:4]), int(date[5:7]), int(date[8:10]), 0, 0, 0))
+
+
+def format_timestamp(epoch_seconds):
+    """
+    Converts epoch seconds back to the GitHub API timestamp format.
+
+    Args:
+        epoch_seconds (int): The number of seconds since the Unix epoch.
+
+    Returns:
+        str: The timestamp, e.g. "2023-06-14T10:30:00Z".
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch_seconds))
+
+
+def parse_bucket(bucket):
+    """
+    Converts a bucket width such as "15m", "1h" or "1d" to seconds.
+
+    Args:
+        bucket (str or int): The width, as a number followed by "s", "m", "h" or "d", or as seconds.
+
+    Returns:
+        int: The width in seconds.
+
+    Raises:
+        InvalidInputException: If the width is malformed or not positive.
+    """
+    if isinstance(bucket, int):
+        seconds = bucket
+    else:
+        unit = BUCKET_UNITS.get(bucket[-1:])
+        if unit is None or not bucket[:-1].isdigit():
+            raise InvalidInputException(f"Invalid bucket {bucket!r}, expected e.g. '30s', '15m', '1h' or '1d'!")
+        seconds = int(bucket[:-1]) * unit
+    if seconds <= 0:
+        raise InvalidInputException("The bucket width must be positive!")
+    return seconds
+
+
+def format_bucket(bucket_seconds):
+    """
+    Converts a bucket width in seconds back to its shortest form, e.g. 3600 to "1h".
+
+    Args:
+        bucket_seconds (int): The width in seconds.
+
+    Returns:
+        str: The width as a number followed by "s", "m", "h" or "d".
+    """
+    for unit, seconds in reversed(BUCKET_UNITS.items()):
+        if bucket_seconds % seconds == 0:
+            return f"{bucket_seconds // seconds}{unit}"